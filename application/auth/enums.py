@@ -8,6 +8,8 @@ class PermissionsEnum(Enum):
     CAN_UPDATE_USERS = "CAN_UPDATE_USERS"
     CAN_DELETE_USERS = "CAN_DELETE_USERS"
     CAN_READ_ALL_USERS = "CAN_READ_ALL_USERS"
+    CAN_IMPORT_USERS = "CAN_IMPORT_USERS"
+    CAN_EXPORT_USERS = "CAN_EXPORT_USERS"
 
     # Post region
     CAN_CREATE_POSTS = "CAN_CREATE_POSTS"
@@ -15,6 +17,8 @@ class PermissionsEnum(Enum):
     CAN_UPDATE_POSTS = "CAN_UPDATE_POSTS"
     CAN_DELETE_POSTS = "CAN_DELETE_POSTS"
     CAN_READ_ALL_POSTS = "CAN_READ_ALL_POSTS"
+    CAN_IMPORT_POSTS = "CAN_IMPORT_POSTS"
+    CAN_EXPORT_POSTS = "CAN_EXPORT_POSTS"
 
     # categories region
     CAN_CREATE_CATEGORIES = "CAN_CREATE_CATEGORIES"
@@ -22,3 +26,4 @@ class PermissionsEnum(Enum):
     CAN_UPDATE_CATEGORIES = "CAN_UPDATE_CATEGORIES"
     CAN_DELETE_CATEGORIES = "CAN_DELETE_CATEGORIES"
     CAN_READ_ALL_CATEGORIES = "CAN_READ_ALL_CATEGORIES"
+    CAN_IMPORT_CATEGORIES = "CAN_IMPORT_CATEGORIES"
@@ -1,2 +1,17 @@
 class InvalidServiceAttrsException(Exception):
     pass
+
+
+class InvalidCursorError(Exception):
+    def __init__(self):
+        super().__init__("Invalid pagination cursor")
+
+
+class PreconditionRequiredError(Exception):
+    def __init__(self):
+        super().__init__("If-Match header is required")
+
+
+class InvalidPreconditionError(Exception):
+    def __init__(self):
+        super().__init__("Invalid If-Match header")
@@ -0,0 +1,7 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ImportConfig:
+    chunk_size: int = 5000
+    max_reported_errors: int = 1000
@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+
+from .enums import ImportTargetEnum
+
+
+@dataclass
+class ImportRowErrorDto:
+    row: int
+    message: str
+
+
+@dataclass
+class ImportChunkResultDto:
+    imported_rows: int
+    errors: list[ImportRowErrorDto]
+
+
+@dataclass
+class ImportReportDto:
+    target: ImportTargetEnum
+    total_rows: int = 0
+    imported_rows: int = 0
+    rejected_rows: int = 0
+    elapsed_seconds: float = 0
+    rows_per_second: float = 0
+    errors: list[ImportRowErrorDto] = field(default_factory=list)
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ImportTargetEnum(Enum):
+    POSTS = "POSTS"
+    CATEGORIES = "CATEGORIES"
+    USERS = "USERS"
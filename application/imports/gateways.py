@@ -0,0 +1,16 @@
+from abc import ABCMeta, abstractmethod
+from typing import Any
+
+from .dtos import ImportChunkResultDto
+from .enums import ImportTargetEnum
+
+
+class ImportGateway(metaclass=ABCMeta):
+    @abstractmethod
+    async def import_chunk(
+        self, target: ImportTargetEnum, rows: list[tuple[int, Any]]
+    ) -> ImportChunkResultDto:
+        """
+        Валидирует и загружает пачку строк (номер строки, сырые данные),
+        возвращает количество загруженных строк и ошибки по каждой отклоненной
+        """
@@ -0,0 +1,83 @@
+import time
+from typing import Any, AsyncIterable
+
+from domain.users.entities import User
+
+from ..auth.enums import PermissionsEnum
+from ..auth.permissions import PermissionBuilder, PermissionProvider
+from ..posts.permissions import CategoriesPermissionProvider, PostsPermissionProvider
+from ..users.permissions import UsersPermissionProvider
+from .config import ImportConfig
+from .dtos import ImportReportDto
+from .enums import ImportTargetEnum
+from .gateways import ImportGateway
+
+
+class ImportService:
+    _permissions: dict[
+        ImportTargetEnum, tuple[type[PermissionProvider], PermissionsEnum]
+    ] = {
+        ImportTargetEnum.POSTS: (
+            PostsPermissionProvider,
+            PermissionsEnum.CAN_IMPORT_POSTS,
+        ),
+        ImportTargetEnum.CATEGORIES: (
+            CategoriesPermissionProvider,
+            PermissionsEnum.CAN_IMPORT_CATEGORIES,
+        ),
+        ImportTargetEnum.USERS: (
+            UsersPermissionProvider,
+            PermissionsEnum.CAN_IMPORT_USERS,
+        ),
+    }
+
+    def __init__(
+        self,
+        gateway: ImportGateway,
+        builder: PermissionBuilder,
+        config: ImportConfig,
+    ):
+        self._gateway = gateway
+        self._builder = builder
+        self._config = config
+
+    async def import_rows(
+        self, target: ImportTargetEnum, rows: AsyncIterable[Any], actor: User
+    ) -> ImportReportDto:
+        provider, permission = self._permissions[target]
+        self._builder.providers(provider(actor=actor, entity=None)).add(
+            permission
+        ).apply()
+
+        report = ImportReportDto(target=target)
+        started_at = time.perf_counter()
+
+        chunk = []
+        async for row in rows:
+            report.total_rows += 1
+            chunk.append((report.total_rows, row))
+            if len(chunk) >= self._config.chunk_size:
+                await self._import_chunk(target, chunk, report)
+                chunk = []
+        if chunk:
+            await self._import_chunk(target, chunk, report)
+
+        report.elapsed_seconds = time.perf_counter() - started_at
+        if report.elapsed_seconds:
+            report.rows_per_second = report.total_rows / report.elapsed_seconds
+        return report
+
+    async def _import_chunk(
+        self,
+        target: ImportTargetEnum,
+        chunk: list[tuple[int, Any]],
+        report: ImportReportDto,
+    ):
+        result = await self._gateway.import_chunk(target, chunk)
+        report.imported_rows += result.imported_rows
+        report.rejected_rows += len(result.errors)
+
+        # в отчет попадает только ограниченное число ошибок, чтобы память
+        # не росла вместе с размером файла, счетчик при этом честный
+        free_slots = self._config.max_reported_errors - len(report.errors)
+        report.errors.extend(result.errors[: max(free_slots, 0)])
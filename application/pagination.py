@@ -0,0 +1,74 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Awaitable, Callable, Generic, TypeVar
+
+Entity = TypeVar("Entity")
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Позиция в выдаче, отсортированной по (created_at, id):
+    следующая страница начинается строго после нее
+    """
+
+    created_at: datetime
+    id: int
+
+
+@dataclass(frozen=True)
+class RankCursor:
+    """
+    Позиция в выдаче поиска, отсортированной по (rank, id) по убыванию
+    """
+
+    rank: float
+    id: int
+
+
+@dataclass
+class Page(Generic[Entity]):
+    items: list[Entity] = field(default_factory=list)
+    next_cursor: Cursor | RankCursor | None = None
+
+
+class CountModeEnum(Enum):
+    EXACT = "EXACT"
+    ESTIMATED = "ESTIMATED"
+    AUTO = "AUTO"
+
+
+@dataclass
+class CountConfig:
+    # до этого размера таблицы точный count(*) дешевле, чем неточность оценки
+    exact_count_threshold: int = 10000
+
+
+@dataclass(frozen=True)
+class TotalCount:
+    value: int
+    is_estimated: bool = False
+
+
+async def count_total(
+    mode: CountModeEnum,
+    config: CountConfig,
+    exact: Callable[[], Awaitable[int]],
+    estimate: Callable[[], Awaitable[int | None]],
+) -> TotalCount:
+    """
+    Считает размер всей выборки. В режиме AUTO берет оценку статистики
+    и пересчитывает точно, только если таблица меньше порога
+    """
+
+    if mode is CountModeEnum.EXACT:
+        return TotalCount(await exact())
+
+    estimated = await estimate()
+    if estimated is None:
+        # по таблице еще не собиралась статистика
+        return TotalCount(await exact())
+    if mode is CountModeEnum.AUTO and estimated < config.exact_count_threshold:
+        return TotalCount(await exact())
+    return TotalCount(estimated, is_estimated=True)
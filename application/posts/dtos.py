@@ -1,17 +1,67 @@
 from dataclasses import dataclass
 
+from ..pagination import Cursor, RankCursor
+
 
 @dataclass
 class CreatePostDto:
     body: str
     title: str
     category_id: int
+    excerpt: str = ""
+    reading_time: int = 0
 
 
 @dataclass
 class ReadAllPostsDto:
-    page: int
-    page_size: int
+    limit: int
+    cursor: Cursor | None = None
+    fields: tuple[str, ...] | None = None
+
+
+@dataclass
+class SearchPostsDto:
+    query: str
+    limit: int
+    cursor: RankCursor | None = None
+
+
+@dataclass
+class PostSearchHit:
+    """Найденный пост: snippet - фрагменты тела с подсвеченными совпадениями."""
+
+    id: int
+    title: str
+    reading_time: int
+    snippet: str
+    rank: float
+
+
+@dataclass
+class TrendingPost:
+    """Популярный пост: views - просмотры за окно популярности."""
+
+    id: int
+    category_id: int
+    title: str
+    excerpt: str
+    reading_time: int
+    views: int
+
+
+@dataclass(frozen=True)
+class ArchiveMonth:
+    """Месяц архива (по UTC) и число постов, созданных в нем."""
+
+    year: int
+    month: int
+    post_count: int
+
+
+@dataclass(frozen=True)
+class TitleSuggestion:
+    id: int
+    title: str
 
 
 @dataclass
@@ -20,6 +70,27 @@ class UpdatePostDto:
     body: str
     title: str
     category_id: int
+    excerpt: str = ""
+    reading_time: int = 0
+
+
+@dataclass
+class PatchPostDto:
+    """Частичное обновление: None - поле не меняется, version=None - без проверки."""
+
+    id: int
+    version: int | None
+    body: str | None = None
+    title: str | None = None
+    category_id: int | None = None
+    excerpt: str | None = None
+    reading_time: int | None = None
+
+
+@dataclass
+class MovePostsDto:
+    category_id: int
+    target_category_id: int
 
 
 @dataclass
@@ -30,8 +101,9 @@ class CreateCategoryDto:
 
 @dataclass
 class ReadAllCategoriesDto:
-    page: int
-    page_size: int
+    limit: int
+    cursor: Cursor | None = None
+    fields: tuple[str, ...] | None = None
 
 
 @dataclass
@@ -39,3 +111,13 @@ class UpdateCategoryDto:
     id: int
     title: str
     description: str
+
+
+@dataclass
+class PatchCategoryDto:
+    """Частичное обновление: None - поле не меняется, version=None - без проверки."""
+
+    id: int
+    version: int | None
+    title: str | None = None
+    description: str | None = None
@@ -1,4 +1,8 @@
-from domain.exceptions import EntityAlreadyExistsError, EntityNotFoundError
+from domain.exceptions import (
+    EntityAlreadyExistsError,
+    EntityNotFoundError,
+    EntityVersionConflictError,
+)
 from domain.posts.entities import Category, Post
 
 
@@ -20,3 +24,13 @@ class CategoryNotFoundError(EntityNotFoundError):
 class CategoryAlreadyExistsError(EntityAlreadyExistsError):
     def __init__(self):
         super().__init__(Category)
+
+
+class PostVersionConflictError(EntityVersionConflictError):
+    def __init__(self):
+        super().__init__(Post)
+
+
+class CategoryVersionConflictError(EntityVersionConflictError):
+    def __init__(self):
+        super().__init__(Category)
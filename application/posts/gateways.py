@@ -0,0 +1,57 @@
+from abc import ABCMeta, abstractmethod
+from datetime import datetime
+from typing import Awaitable
+
+from .dtos import ArchiveMonth, TitleSuggestion
+
+
+class SuggestionsGateway(metaclass=ABCMeta):
+    """Подсказки по заголовкам постов, которые отвечают без обращения к базе."""
+
+    @abstractmethod
+    def suggest(self, prefix: str, limit: int) -> list[TitleSuggestion] | None:
+        """
+        Возвращает посты, в заголовке которых слово начинается с prefix,
+        или None, пока индекс еще не построен
+        """
+
+    @abstractmethod
+    def add(self, post_id: int, title: str):
+        """Добавляет пост в индекс или обновляет его заголовок."""
+
+    @abstractmethod
+    def remove(self, post_id: int):
+        """Убирает пост из индекса."""
+
+
+class ViewsGateway(metaclass=ABCMeta):
+    """Счетчики просмотров постов, копящиеся в памяти до записи в базу."""
+
+    @abstractmethod
+    def record(self, post_id: int):
+        """Учитывает один просмотр поста."""
+
+
+class ArchiveGateway(metaclass=ABCMeta):
+    """
+    Число постов по месяцам, хранящееся между запросами. Сервис постов
+    поправляет его после коммита каждой записи, а не пересчитывает по таблице
+    """
+
+    @abstractmethod
+    def read(self) -> list[ArchiveMonth] | None:
+        """Месяцы от новых к старым или None, если их нужно пересчитать."""
+
+    @abstractmethod
+    async def rebuild(
+        self, months: Awaitable[list[ArchiveMonth]]
+    ) -> list[ArchiveMonth]:
+        """Запоминает пересчитанные месяцы и возвращает их."""
+
+    @abstractmethod
+    def add(self, created_at: datetime, delta: int):
+        """Сдвигает число постов месяца, в котором создан пост."""
+
+    @abstractmethod
+    def invalidate(self):
+        """Сбрасывает сохраненные месяцы: следующее чтение пересчитает их."""
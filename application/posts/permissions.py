@@ -14,6 +14,8 @@ class PostsPermissionProvider(RolePermissionProvider):
             PermissionsEnum.CAN_UPDATE_POSTS,
             PermissionsEnum.CAN_DELETE_POSTS,
             PermissionsEnum.CAN_READ_ALL_POSTS,
+            PermissionsEnum.CAN_IMPORT_POSTS,
+            PermissionsEnum.CAN_EXPORT_POSTS,
         },
         RoleEnum.USER: {
             PermissionsEnum.CAN_READ_POSTS,
@@ -36,6 +38,7 @@ class CategoriesPermissionProvider(RolePermissionProvider):
             PermissionsEnum.CAN_UPDATE_CATEGORIES,
             PermissionsEnum.CAN_DELETE_CATEGORIES,
             PermissionsEnum.CAN_READ_ALL_CATEGORIES,
+            PermissionsEnum.CAN_IMPORT_CATEGORIES,
         },
         RoleEnum.USER: {
             PermissionsEnum.CAN_READ_CATEGORIES,
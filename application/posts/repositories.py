@@ -1,44 +1,133 @@
 from abc import ABCMeta, abstractmethod
-from typing import Generic, TypeVar
+from typing import Any, AsyncIterator, Generic, TypeVar
 
 from domain.posts import entities
 
+from ..pagination import Page
 from . import dtos
 
 Entity = TypeVar("Entity")
 CreateDto = TypeVar("CreateDto")
 ReadAllDto = TypeVar("ReadAllDto")
+UpdateDto = TypeVar("UpdateDto")
 
 
-class CRUDRepository(Generic[Entity, CreateDto, ReadAllDto], metaclass=ABCMeta):
+class CRUDRepository(
+    Generic[Entity, CreateDto, ReadAllDto, UpdateDto], metaclass=ABCMeta
+):
     @abstractmethod
     async def create(self, dto: CreateDto) -> Entity: ...
 
+    @abstractmethod
+    async def create_many(self, dtos: list[CreateDto]) -> list[Entity]: ...
+
     @abstractmethod
     async def read(self, entity_id: int) -> Entity: ...
 
     @abstractmethod
     async def update(self, entity: Entity) -> Entity: ...
 
+    @abstractmethod
+    async def update_from_dto(self, dto: UpdateDto) -> Entity: ...
+
+    @abstractmethod
+    async def patch(self, dto: Any) -> Entity: ...
+
     @abstractmethod
     async def delete(self, entity: Entity) -> Entity: ...
 
     @abstractmethod
-    async def read_all(self, dto: ReadAllDto) -> list[Entity]: ...
+    async def delete_by_id(self, entity_id: int) -> Entity: ...
+
+    @abstractmethod
+    async def read_all(self, dto: ReadAllDto) -> Page[Entity]: ...
+
+    @abstractmethod
+    async def read_all_projection(self, dto: ReadAllDto) -> Page[dict[str, Any]]: ...
+
+    @abstractmethod
+    def stream_all(self) -> AsyncIterator[Entity]: ...
+
+    @abstractmethod
+    async def count_all(self) -> int: ...
+
+    @abstractmethod
+    async def estimate_count_all(self) -> int | None: ...
 
 
 class PostsRepository(
-    CRUDRepository[entities.Post, dtos.CreatePostDto, dtos.ReadAllPostsDto],
+    CRUDRepository[
+        entities.Post, dtos.CreatePostDto, dtos.ReadAllPostsDto, dtos.UpdatePostDto
+    ],
     metaclass=ABCMeta,
 ):
     @abstractmethod
-    async def read_by_category(self, category_id: int) -> list[entities.Post]: ...
+    async def read_by_category(
+        self, category_id: int, dto: dtos.ReadAllPostsDto
+    ) -> Page[entities.Post]: ...
+
+    @abstractmethod
+    async def read_by_category_projection(
+        self, category_id: int, dto: dtos.ReadAllPostsDto
+    ) -> Page[dict[str, Any]]: ...
+
+    @abstractmethod
+    async def count_by_category(self, category_id: int) -> int: ...
+
+    @abstractmethod
+    async def read_by_month_projection(
+        self, year: int, month: int, dto: dtos.ReadAllPostsDto
+    ) -> Page[dict[str, Any]]: ...
+
+    @abstractmethod
+    async def count_by_month(self, year: int, month: int) -> int: ...
+
+    @abstractmethod
+    async def count_months(self) -> list[dtos.ArchiveMonth]: ...
+
+    @abstractmethod
+    async def search(self, dto: dtos.SearchPostsDto) -> Page[dtos.PostSearchHit]: ...
+
+    @abstractmethod
+    async def suggest(self, prefix: str, limit: int) -> list[dtos.TitleSuggestion]: ...
+
+    @abstractmethod
+    def stream_titles(self) -> AsyncIterator[dtos.TitleSuggestion]: ...
+
+    @abstractmethod
+    async def add_views(self, deltas: dict[int, int]): ...
+
+    @abstractmethod
+    async def read_trending(
+        self, limit: int, category_id: int | None = None
+    ) -> list[dtos.TrendingPost]: ...
+
+    @abstractmethod
+    async def refresh_trending(self): ...
+
+    @abstractmethod
+    async def read_category_id(self, post_id: int) -> int: ...
+
+    @abstractmethod
+    async def delete_by_category(self, category_id: int) -> list[int]: ...
+
+    @abstractmethod
+    async def move_to_category(
+        self, category_id: int, target_category_id: int
+    ) -> list[int]: ...
 
 
 class CategoriesRepository(
     CRUDRepository[
-        entities.Category, dtos.CreateCategoryDto, dtos.ReadAllCategoriesDto
+        entities.Category,
+        dtos.CreateCategoryDto,
+        dtos.ReadAllCategoriesDto,
+        dtos.UpdateCategoryDto,
     ],
     metaclass=ABCMeta,
 ):
-    pass
+    @abstractmethod
+    async def adjust_post_counts(self, deltas: dict[int, int]): ...
+
+    @abstractmethod
+    async def repair_post_counts(self) -> list[int]: ...
@@ -1,13 +1,33 @@
+from collections import Counter
+from dataclasses import replace
+from functools import partial
+from typing import Any, AsyncIterator, TypeVar
+
 from application.transactions import TransactionsGateway
 from domain.posts import entities
+from domain.posts.excerpts import estimate_reading_time, make_excerpt
 from domain.users.entities import User
 
 from ..auth.enums import PermissionsEnum
 from ..auth.permissions import PermissionBuilder
+from ..pagination import CountConfig, CountModeEnum, Page, TotalCount, count_total
 from . import dtos
+from .gateways import ArchiveGateway, SuggestionsGateway, ViewsGateway
 from .permissions import CategoriesPermissionProvider, PostsPermissionProvider
 from .repositories import CategoriesRepository, PostsRepository
 
+PostDto = TypeVar("PostDto", dtos.CreatePostDto, dtos.UpdatePostDto, dtos.PatchPostDto)
+
+
+def with_excerpt(dto: PostDto) -> PostDto:
+    """Пересчитывает производные от тела поля, хранящиеся рядом с ним."""
+
+    return replace(
+        dto,
+        excerpt=make_excerpt(dto.body),
+        reading_time=estimate_reading_time(dto.body),
+    )
+
 
 class PostsService:
     def __init__(
@@ -15,39 +35,207 @@ class PostsService:
         repository: PostsRepository,
         tx: TransactionsGateway,
         builder: PermissionBuilder,
+        count_config: CountConfig,
+        suggestions: SuggestionsGateway,
+        categories: CategoriesRepository,
+        views: ViewsGateway,
+        archive: ArchiveGateway,
     ):
         self._builder = builder
         self._repository = repository
         self._transaction = tx
+        self._count_config = count_config
+        self._suggestions = suggestions
+        self._categories = categories
+        self._views = views
+        self._archive = archive
 
     async def create(self, dto: dtos.CreatePostDto, actor: User) -> entities.Post:
         self._builder.providers(PostsPermissionProvider(actor=actor, entity=None)).add(
             PermissionsEnum.CAN_CREATE_POSTS
         ).apply()
 
-        return await self._repository.create(dto)
+        async with self._transaction:
+            # счетчик сдвигается до вставки, чтобы ответ отдал его новое значение
+            await self._categories.adjust_post_counts({dto.category_id: 1})
+            post = await self._repository.create(with_excerpt(dto))
+            self._transaction.on_commit(
+                partial(self._suggestions.add, post.id, post.title)
+            )
+            self._transaction.on_commit(partial(self._archive.add, post.created_at, 1))
+        return post
+
+    async def create_many(
+        self, batch: list[dtos.CreatePostDto], actor: User
+    ) -> list[entities.Post]:
+        self._builder.providers(PostsPermissionProvider(actor=actor, entity=None)).add(
+            PermissionsEnum.CAN_CREATE_POSTS
+        ).apply()
+
+        async with self._transaction:
+            await self._categories.adjust_post_counts(
+                Counter(dto.category_id for dto in batch)
+            )
+            posts = await self._repository.create_many(list(map(with_excerpt, batch)))
+            for post in posts:
+                self._transaction.on_commit(
+                    partial(self._suggestions.add, post.id, post.title)
+                )
+                self._transaction.on_commit(
+                    partial(self._archive.add, post.created_at, 1)
+                )
+        return posts
 
     async def read(self, post_id: int) -> entities.Post:
-        return await self._repository.read(post_id)
+        post = await self._repository.read(post_id)
+        # в базу просмотры попадают пачкой из фоновой задачи
+        self._views.record(post.id)
+        return post
 
-    async def read_by_category(self, category_id: int) -> list[entities.Post]:
-        return await self._repository.read_by_category(category_id)
+    async def read_by_category(
+        self, category_id: int, dto: dtos.ReadAllPostsDto
+    ) -> Page[entities.Post]:
+        return await self._repository.read_by_category(category_id, dto)
 
-    async def read_all(self, dto: dtos.ReadAllPostsDto | None) -> list[entities.Post]:
+    async def read_all(self, dto: dtos.ReadAllPostsDto) -> Page[entities.Post]:
         return await self._repository.read_all(dto)
 
+    async def read_all_projection(
+        self, dto: dtos.ReadAllPostsDto
+    ) -> Page[dict[str, Any]]:
+        """Страница постов для списка в виде готовых к сериализации строк."""
+
+        return await self._repository.read_all_projection(dto)
+
+    async def read_by_category_projection(
+        self, category_id: int, dto: dtos.ReadAllPostsDto
+    ) -> Page[dict[str, Any]]:
+        return await self._repository.read_by_category_projection(category_id, dto)
+
+    async def read_archive(self) -> list[dtos.ArchiveMonth]:
+        if (months := self._archive.read()) is not None:
+            return months
+        return await self._archive.rebuild(self._repository.count_months())
+
+    async def read_by_month_projection(
+        self, year: int, month: int, dto: dtos.ReadAllPostsDto
+    ) -> Page[dict[str, Any]]:
+        return await self._repository.read_by_month_projection(year, month, dto)
+
+    async def count_by_month(self, year: int, month: int) -> TotalCount:
+        return TotalCount(await self._repository.count_by_month(year, month))
+
+    async def search(self, dto: dtos.SearchPostsDto) -> Page[dtos.PostSearchHit]:
+        return await self._repository.search(dto)
+
+    async def suggest(self, prefix: str, limit: int) -> list[dtos.TitleSuggestion]:
+        if (suggestions := self._suggestions.suggest(prefix, limit)) is not None:
+            return suggestions
+        # индекс еще не построен: холодный старт отвечает из базы
+        return await self._repository.suggest(prefix, limit)
+
+    async def read_trending(self, limit: int) -> list[dtos.TrendingPost]:
+        return await self._repository.read_trending(limit)
+
+    async def read_trending_by_category(
+        self, category_id: int, limit: int
+    ) -> list[dtos.TrendingPost]:
+        return await self._repository.read_trending(limit, category_id)
+
+    async def count_all(self, mode: CountModeEnum) -> TotalCount:
+        return await count_total(
+            mode,
+            self._count_config,
+            exact=self._repository.count_all,
+            estimate=self._repository.estimate_count_all,
+        )
+
+    async def count_by_category(self, category_id: int) -> TotalCount:
+        # статистика по таблице ничего не знает о размере одной категории
+        return TotalCount(await self._repository.count_by_category(category_id))
+
+    def export(self, actor: User) -> AsyncIterator[entities.Post]:
+        self._builder.providers(PostsPermissionProvider(actor=actor, entity=None)).add(
+            PermissionsEnum.CAN_EXPORT_POSTS
+        ).apply()
+
+        return self._repository.stream_all()
+
     async def update(self, dto: dtos.UpdatePostDto, actor: User) -> entities.Post:
         self._builder.providers(PostsPermissionProvider(actor=actor, entity=None)).add(
             PermissionsEnum.CAN_UPDATE_POSTS
         ).apply()
 
         async with self._transaction:
-            post = await self.read(dto.id)
-            post.title = dto.title
-            post.body = dto.body
-            post.category_id = dto.category_id
+            await self._move_post_count(dto.id, dto.category_id)
+            post = await self._repository.update_from_dto(with_excerpt(dto))
+            self._transaction.on_commit(
+                partial(self._suggestions.add, post.id, post.title)
+            )
+        return post
+
+    async def patch(self, dto: dtos.PatchPostDto, actor: User) -> entities.Post:
+        self._builder.providers(PostsPermissionProvider(actor=actor, entity=None)).add(
+            PermissionsEnum.CAN_UPDATE_POSTS
+        ).apply()
+
+        # превью пересчитывается, только если меняется само тело
+        if dto.body is not None:
+            dto = with_excerpt(dto)
+        async with self._transaction:
+            if dto.category_id is not None:
+                await self._move_post_count(dto.id, dto.category_id)
+            post = await self._repository.patch(dto)
+            self._transaction.on_commit(
+                partial(self._suggestions.add, post.id, post.title)
+            )
+        return post
+
+    async def _move_post_count(self, post_id: int, category_id: int):
+        """Переносит пост в счетчиках категорий, если категория меняется."""
+
+        previous_category_id = await self._repository.read_category_id(post_id)
+        if previous_category_id != category_id:
+            await self._categories.adjust_post_counts(
+                {previous_category_id: -1, category_id: 1}
+            )
+
+    async def move_to_category(self, dto: dtos.MovePostsDto, actor: User) -> list[int]:
+        """Переносит все посты категории в другую, возвращает id перенесенных."""
+
+        self._builder.providers(PostsPermissionProvider(actor=actor, entity=None)).add(
+            PermissionsEnum.CAN_UPDATE_POSTS
+        ).apply()
 
-            return await self._repository.update(post)
+        async with self._transaction:
+            post_ids = await self._repository.move_to_category(
+                dto.category_id, dto.target_category_id
+            )
+            if dto.category_id != dto.target_category_id:
+                await self._categories.adjust_post_counts(
+                    {
+                        dto.category_id: -len(post_ids),
+                        dto.target_category_id: len(post_ids),
+                    }
+                )
+        return post_ids
+
+    async def delete_by_category(self, category_id: int, actor: User) -> list[int]:
+        """Удаляет все посты категории, возвращает id удаленных."""
+
+        self._builder.providers(PostsPermissionProvider(actor=actor, entity=None)).add(
+            PermissionsEnum.CAN_DELETE_POSTS
+        ).apply()
+
+        async with self._transaction:
+            post_ids = await self._repository.delete_by_category(category_id)
+            await self._categories.adjust_post_counts({category_id: -len(post_ids)})
+            for post_id in post_ids:
+                self._transaction.on_commit(partial(self._suggestions.remove, post_id))
+            # месяцы удаленных постов неизвестны, архив пересчитается при чтении
+            if post_ids:
+                self._transaction.on_commit(self._archive.invalidate)
+        return post_ids
 
     async def delete(self, post_id: int, actor: User) -> entities.Post:
         self._builder.providers(PostsPermissionProvider(actor=actor, entity=None)).add(
@@ -55,8 +243,11 @@ class PostsService:
         ).apply()
 
         async with self._transaction:
-            post = await self.read(post_id)
-            return await self._repository.delete(post)
+            post = await self._repository.delete_by_id(post_id)
+            await self._categories.adjust_post_counts({post.category_id: -1})
+            self._transaction.on_commit(partial(self._suggestions.remove, post.id))
+            self._transaction.on_commit(partial(self._archive.add, post.created_at, -1))
+        return post
 
 
 class CategoriesService:
@@ -65,10 +256,12 @@ class CategoriesService:
         repository: CategoriesRepository,
         tx: TransactionsGateway,
         builder: PermissionBuilder,
+        count_config: CountConfig,
     ):
         self._builder = builder
         self._repository = repository
         self._transaction = tx
+        self._count_config = count_config
 
     async def create(
         self, dto: dtos.CreateCategoryDto, actor: User
@@ -79,14 +272,35 @@ class CategoriesService:
 
         return await self._repository.create(dto)
 
+    async def create_many(
+        self, batch: list[dtos.CreateCategoryDto], actor: User
+    ) -> list[entities.Category]:
+        self._builder.providers(
+            CategoriesPermissionProvider(actor=actor, entity=None)
+        ).add(PermissionsEnum.CAN_CREATE_CATEGORIES).apply()
+
+        async with self._transaction:
+            return await self._repository.create_many(batch)
+
     async def read(self, category_id: int) -> entities.Category:
         return await self._repository.read(category_id)
 
-    async def read_all(
-        self, dto: dtos.ReadAllCategoriesDto | None
-    ) -> list[entities.Category]:
+    async def read_all(self, dto: dtos.ReadAllCategoriesDto) -> Page[entities.Category]:
         return await self._repository.read_all(dto)
 
+    async def count_all(self, mode: CountModeEnum) -> TotalCount:
+        return await count_total(
+            mode,
+            self._count_config,
+            exact=self._repository.count_all,
+            estimate=self._repository.estimate_count_all,
+        )
+
+    async def read_all_projection(
+        self, dto: dtos.ReadAllCategoriesDto
+    ) -> Page[dict[str, Any]]:
+        return await self._repository.read_all_projection(dto)
+
     async def update(
         self, dto: dtos.UpdateCategoryDto, actor: User
     ) -> entities.Category:
@@ -94,18 +308,18 @@ class CategoriesService:
             CategoriesPermissionProvider(actor=actor, entity=None)
         ).add(PermissionsEnum.CAN_UPDATE_CATEGORIES).apply()
 
-        async with self._transaction:
-            category = await self.read(dto.id)
-            category.title = dto.title
-            category.description = dto.description
+        return await self._repository.update_from_dto(dto)
+
+    async def patch(self, dto: dtos.PatchCategoryDto, actor: User) -> entities.Category:
+        self._builder.providers(
+            CategoriesPermissionProvider(actor=actor, entity=None)
+        ).add(PermissionsEnum.CAN_UPDATE_CATEGORIES).apply()
 
-            return await self._repository.update(category)
+        return await self._repository.patch(dto)
 
     async def delete(self, category_id: int, actor: User) -> entities.Category:
         self._builder.providers(
             CategoriesPermissionProvider(actor=actor, entity=None)
         ).add(PermissionsEnum.CAN_DELETE_CATEGORIES).apply()
 
-        async with self._transaction:
-            category = await self.read(category_id)
-            return await self._repository.delete(category)
+        return await self._repository.delete_by_id(category_id)
@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from typing import Callable
 
 
 class Transaction(metaclass=ABCMeta):
@@ -22,5 +23,12 @@ class TransactionsGateway(metaclass=ABCMeta):
     @abstractmethod
     def nested(self) -> "TransactionsGateway": ...
 
+    @abstractmethod
+    def on_commit(self, callback: Callable[[], None]):
+        """
+        Откладывает callback до коммита транзакции. После отката он не
+        вызывается: так кеши в памяти не расходятся с базой
+        """
+
     @abstractmethod
     async def __aexit__(self, exc_type, exc_val, exc_tb): ...
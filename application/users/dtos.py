@@ -2,11 +2,13 @@ from dataclasses import dataclass
 
 from domain.users.enums import RoleEnum
 
+from ..pagination import Cursor
+
 
 @dataclass
 class ReadAllUsersDto:
-    page: int
-    page_size: int
+    limit: int
+    cursor: Cursor | None = None
 
 
 @dataclass
@@ -15,6 +17,12 @@ class UpdateUserDto:
     role: RoleEnum
 
 
+@dataclass
+class UpdateUsersRoleDto:
+    user_ids: list[int]
+    role: RoleEnum
+
+
 @dataclass
 class CreateUserDto:
     email: str
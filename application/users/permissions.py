@@ -19,6 +19,8 @@ class UsersPermissionProvider(PermissionProvider):
             PermissionsEnum.CAN_READ_ALL_USERS,
             PermissionsEnum.CAN_UPDATE_USERS,
             PermissionsEnum.CAN_DELETE_USERS,
+            PermissionsEnum.CAN_IMPORT_USERS,
+            PermissionsEnum.CAN_EXPORT_USERS,
         },
         RoleEnum.USER: {
             # по идее тут надо еще разрешения на чтение и удаление,
@@ -1,7 +1,10 @@
 from abc import ABCMeta, abstractmethod
+from typing import AsyncIterator
 
 from domain.users import entities
+from domain.users.enums import RoleEnum
 
+from ..pagination import Page
 from . import dtos
 
 
@@ -16,7 +19,16 @@ class UsersRepository(metaclass=ABCMeta):
     async def read_by_email(self, email: str) -> entities.User: ...
 
     @abstractmethod
-    async def read_all(self, dto: dtos.ReadAllUsersDto) -> list[entities.User]: ...
+    async def read_all(self, dto: dtos.ReadAllUsersDto) -> Page[entities.User]: ...
+
+    @abstractmethod
+    async def count_all(self) -> int: ...
+
+    @abstractmethod
+    async def estimate_count_all(self) -> int | None: ...
+
+    @abstractmethod
+    def stream_all(self) -> AsyncIterator[entities.User]: ...
 
     @abstractmethod
     async def read_by_ids(self, user_ids: list[int]) -> list[entities.User]: ...
@@ -24,5 +36,8 @@ class UsersRepository(metaclass=ABCMeta):
     @abstractmethod
     async def update(self, user: entities.User) -> entities.User: ...
 
+    @abstractmethod
+    async def update_role(self, user_ids: list[int], role: RoleEnum) -> list[int]: ...
+
     @abstractmethod
     async def delete(self, user: entities.User) -> entities.User: ...
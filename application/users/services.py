@@ -1,9 +1,12 @@
+from typing import AsyncIterator
+
 from application.transactions import TransactionsGateway
 from domain.users.entities import User
 
 from ..auth.enums import PermissionsEnum
 from ..auth.permissions import PermissionBuilder
-from .dtos import CreateUserDto, ReadAllUsersDto, UpdateUserDto
+from ..pagination import CountConfig, CountModeEnum, Page, TotalCount, count_total
+from .dtos import CreateUserDto, ReadAllUsersDto, UpdateUserDto, UpdateUsersRoleDto
 from .permissions import UsersPermissionProvider
 from .repositories import UsersRepository
 
@@ -14,10 +17,12 @@ class UsersService:
         repository: UsersRepository,
         tx: TransactionsGateway,
         builder: PermissionBuilder,
+        count_config: CountConfig,
     ):
         self._builder = builder
         self._repository = repository
         self._transaction = tx
+        self._count_config = count_config
 
     async def create(self, dto: CreateUserDto) -> User:
         return await self._repository.create(dto)
@@ -29,12 +34,31 @@ class UsersService:
         ).apply()
         return user
 
-    async def read_all(self, dto: ReadAllUsersDto, actor: User) -> list[User]:
+    async def read_all(self, dto: ReadAllUsersDto, actor: User) -> Page[User]:
         users = await self._repository.read_all(dto)
-        self._builder.providers(UsersPermissionProvider(actor=actor, entity=users)).add(
+        self._builder.providers(
+            UsersPermissionProvider(actor=actor, entity=users.items)
+        ).add(PermissionsEnum.CAN_READ_ALL_USERS).apply()
+        return users
+
+    async def count_all(self, mode: CountModeEnum, actor: User) -> TotalCount:
+        self._builder.providers(UsersPermissionProvider(actor=actor, entity=None)).add(
             PermissionsEnum.CAN_READ_ALL_USERS
         ).apply()
-        return users
+
+        return await count_total(
+            mode,
+            self._count_config,
+            exact=self._repository.count_all,
+            estimate=self._repository.estimate_count_all,
+        )
+
+    def export(self, actor: User) -> AsyncIterator[User]:
+        self._builder.providers(UsersPermissionProvider(actor=actor, entity=None)).add(
+            PermissionsEnum.CAN_EXPORT_USERS
+        ).apply()
+
+        return self._repository.stream_all()
 
     async def read_by_email(self, email: str) -> User:
         return await self._repository.read_by_email(email)
@@ -56,6 +80,15 @@ class UsersService:
 
             return await self._repository.update(user)
 
+    async def update_role(self, dto: UpdateUsersRoleDto, actor: User) -> list[int]:
+        """Меняет роль списку пользователей, возвращает id измененных."""
+
+        self._builder.providers(UsersPermissionProvider(actor=actor, entity=None)).add(
+            PermissionsEnum.CAN_UPDATE_USERS
+        ).apply()
+
+        return await self._repository.update_role(dto.user_ids, dto.role)
+
     async def delete(self, user_id: int, actor: User) -> User:
         async with self._transaction:
             user = await self.read(user_id, actor=actor)
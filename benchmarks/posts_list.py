@@ -0,0 +1,126 @@
+"""
+Сравнение ORM-пути и Core-проекции на списках постов.
+
+    python -m benchmarks.posts_list --posts 10000 --requests 300 --limit 100
+
+Создает временную категорию с постами, гоняет запросы к /posts/ и
+/categories/{id}/posts через ASGI-транспорт в обоих режимах и удаляет
+тестовые данные.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.posts.excerpts import estimate_reading_time, make_excerpt
+from infrastructure.config import get_config
+from infrastructure.posts.models import CategoryDatabaseModel, PostDatabaseModel
+from infrastructure.server import app, container
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--limit", type=int, default=100)
+    return parser.parse_args()
+
+
+async def _seed(posts: int) -> int:
+    body = "<p>" + "Текст поста. " * 400 + "</p>"
+    async with container() as nested:
+        session = await nested.get(AsyncSession)
+        category_id = await session.scalar(
+            insert(CategoryDatabaseModel)
+            .values(title="benchmark", description="benchmark")
+            .returning(CategoryDatabaseModel.id)
+        )
+        await session.execute(
+            insert(PostDatabaseModel),
+            [
+                {
+                    "title": f"Пост {i}",
+                    "body": body,
+                    "excerpt": make_excerpt(body),
+                    "reading_time": estimate_reading_time(body),
+                    "category_id": category_id,
+                }
+                for i in range(posts)
+            ],
+        )
+    return category_id
+
+
+async def _cleanup(category_id: int):
+    async with container() as nested:
+        session = await nested.get(AsyncSession)
+        await session.execute(
+            delete(PostDatabaseModel).where(
+                PostDatabaseModel.category_id == category_id
+            )
+        )
+        await session.execute(
+            delete(CategoryDatabaseModel).where(CategoryDatabaseModel.id == category_id)
+        )
+
+
+async def _measure(
+    client: httpx.AsyncClient, url: str, params: dict, requests: int
+) -> tuple[list[float], bytes]:
+    timings, body = [], b""
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(url, params=params)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+        body = response.content
+    return timings, body
+
+
+def _report(name: str, timings: list[float]):
+    timings = sorted(timings)
+    print(
+        f"  {name:<10} mean {statistics.mean(timings) * 1000:7.2f} ms"
+        f"  p50 {timings[len(timings) // 2] * 1000:7.2f} ms"
+        f"  p95 {timings[int(len(timings) * 0.95)] * 1000:7.2f} ms"
+        f"  {len(timings) / sum(timings):8.1f} req/s"
+    )
+
+
+async def main():
+    args = _parse_args()
+    config = get_config()
+    category_id = await _seed(args.posts)
+
+    routes = {
+        "/api/v1/posts/": "posts_list_projection",
+        f"/api/v1/categories/{category_id}/posts": "category_posts_list_projection",
+    }
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+        ) as client:
+            for url, switch in routes.items():
+                print(url)
+                bodies = {}
+                for name, enabled in (("orm", False), ("projection", True)):
+                    setattr(config, switch, enabled)
+                    # прогрев пула соединений и кешей запросов
+                    await _measure(client, url, {"limit": args.limit}, 10)
+                    timings, bodies[name] = await _measure(
+                        client, url, {"limit": args.limit}, args.requests
+                    )
+                    _report(name, timings)
+                print(f"  same response: {bodies['orm'] == bodies['projection']}")
+    finally:
+        await _cleanup(category_id)
+        await container.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
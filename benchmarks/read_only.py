@@ -0,0 +1,89 @@
+"""
+Сравнение читающих GET-запросов в обычной транзакции и в режиме только для чтения.
+
+    python -m benchmarks.read_only --requests 500
+
+Считает обращения к серверу (каждая отправка в сокет asyncpg — один
+round trip) и время ответа для публичных списков и карточек в обоих режимах.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.round_trips import RoundTripCounter
+from infrastructure.config import get_config
+from infrastructure.posts.models import CategoryDatabaseModel, PostDatabaseModel
+from infrastructure.server import app, container
+
+ROUND_TRIPS = RoundTripCounter()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    return parser.parse_args()
+
+
+async def _routes() -> list[str]:
+    async with container() as nested:
+        session = await nested.get(AsyncSession)
+        post_id = await session.scalar(select(PostDatabaseModel.id).limit(1))
+        category_id = await session.scalar(select(CategoryDatabaseModel.id).limit(1))
+
+    routes = ["/api/v1/posts/?limit=20", "/api/v1/posts/?limit=20&count=EXACT"]
+    if post_id is not None:
+        routes.append(f"/api/v1/posts/{post_id}")
+    if category_id is not None:
+        routes.append(f"/api/v1/categories/{category_id}/posts?limit=20")
+    return routes
+
+
+async def _measure(
+    client: httpx.AsyncClient, url: str, requests: int
+) -> tuple[list[float], float]:
+    ROUND_TRIPS.reset()
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(url)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return timings, ROUND_TRIPS.reset() / requests
+
+
+def _report(name: str, timings: list[float], round_trips: float):
+    timings = sorted(timings)
+    print(
+        f"  {name:<10} {round_trips:5.2f} round trips"
+        f"  mean {statistics.mean(timings) * 1000:7.2f} ms"
+        f"  p95 {timings[int(len(timings) * 0.95)] * 1000:7.2f} ms"
+        f"  {len(timings) / sum(timings):8.1f} req/s"
+    )
+
+
+async def main():
+    args = _parse_args()
+    config = get_config()
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+        ) as client:
+            for url in await _routes():
+                print(url)
+                for name, enabled in (("read-write", False), ("read-only", True)):
+                    config.read_only_requests = enabled
+                    # прогрев пулов соединений и кешей подготовленных запросов
+                    await _measure(client, url, 10)
+                    _report(name, *await _measure(client, url, args.requests))
+    finally:
+        await container.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
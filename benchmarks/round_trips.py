@@ -0,0 +1,32 @@
+"""Подсчет обращений к серверу Postgres для бенчмарков."""
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RoundTripCounter:
+    """
+    Считает обращения к серверу во всех соединениях, открытых после установки.
+
+    asyncpg отправляет каждое сообщение (или пачку Parse/Bind/Execute/Sync)
+    одним вызовом write в сокет и ждёт ответа, так что число записей в
+    транспорт равно числу round trip.
+    """
+
+    def __init__(self):
+        self.value = 0
+        event.listen(Engine, "connect", self._instrument)
+
+    def _instrument(self, dbapi_connection, _):
+        transport = dbapi_connection._connection._transport  # noqa
+        write = transport.write
+
+        def _write(data):
+            self.value += 1
+            return write(data)
+
+        transport.write = _write
+
+    def reset(self) -> int:
+        value, self.value = self.value, 0
+        return value
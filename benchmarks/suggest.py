@@ -0,0 +1,75 @@
+"""
+Скорость индекса подсказок по заголовкам на синтетических данных.
+
+    python -m benchmarks.suggest --titles 100000 --lookups 10000
+
+Строит PrefixIndex из случайных заголовков и меряет поиск по префиксам
+разной длины, а также добавление и удаление одного заголовка.
+"""
+
+import argparse
+import random
+import statistics
+import string
+import time
+
+from infrastructure.posts.suggestions import PrefixIndex
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    return parser.parse_args()
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+
+def _report(name: str, timings: list[float]):
+    timings.sort()
+    print(
+        f"{name:<10} mean {statistics.mean(timings) * 1e6:8.2f} us"
+        f"  p95 {timings[int(len(timings) * 0.95)] * 1e6:8.2f} us"
+    )
+
+
+def main():
+    args = _parse_args()
+    rng = random.Random(0)
+    titles = {
+        post_id: " ".join(_word(rng) for _ in range(rng.randint(2, 8)))
+        for post_id in range(args.titles)
+    }
+
+    started = time.perf_counter()
+    index = PrefixIndex(dict(titles))
+    print(f"build      {time.perf_counter() - started:8.2f} s for {len(index)} titles")
+
+    for length in (1, 2, 4):
+        timings = []
+        for _ in range(args.lookups):
+            prefix = _word(rng)[:length]
+            started = time.perf_counter()
+            index.search(prefix, 10)
+            timings.append(time.perf_counter() - started)
+        _report(f"prefix {length}", timings)
+
+    timings = []
+    for post_id in range(args.titles, args.titles + 1000):
+        started = time.perf_counter()
+        index.add(post_id, titles[post_id - args.titles])
+        timings.append(time.perf_counter() - started)
+    _report("add", timings)
+
+    timings = []
+    for post_id in range(args.titles, args.titles + 1000):
+        started = time.perf_counter()
+        index.remove(post_id)
+        timings.append(time.perf_counter() - started)
+    _report("remove", timings)
+
+
+if __name__ == "__main__":
+    main()
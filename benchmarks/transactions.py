@@ -0,0 +1,97 @@
+"""
+Стоимость единицы работы TransactionsGateway на запись.
+
+    python -m benchmarks.transactions --writes 500
+
+Меняет роль временного пользователя через UsersService.update, открывая
+единицу работы как внешнюю (транзакция запроса) и как вложенную
+(SAVEPOINT/RELEASE SAVEPOINT, прежнее поведение шлюза для каждой записи).
+Каждая запись — отдельный «запрос» со своей сессией, как в обработчиках.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.auth.permissions import PermissionBuilder
+from application.pagination import CountConfig
+from application.users.dtos import CreateUserDto, UpdateUserDto
+from application.users.repositories import UsersRepository
+from application.users.services import UsersService
+from benchmarks.round_trips import RoundTripCounter
+from domain.users.enums import RoleEnum
+from infrastructure.config import get_config
+from infrastructure.server import container
+from infrastructure.transactions import TransactionsDatabaseGateway
+
+ROUND_TRIPS = RoundTripCounter()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writes", type=int, default=500)
+    return parser.parse_args()
+
+
+async def _update(user_id: int, role: RoleEnum, savepoint: bool):
+    async with container() as nested:
+        session = await nested.get(AsyncSession)
+        gateway = TransactionsDatabaseGateway(session)
+        service = UsersService(
+            await nested.get(UsersRepository),
+            gateway.nested() if savepoint else gateway,
+            await nested.get(PermissionBuilder),
+            await nested.get(CountConfig),
+        )
+        repository = await nested.get(UsersRepository)
+        actor = await repository.read_by_email(get_config().admin_username)
+        await service.update(UpdateUserDto(user_id=user_id, role=role), actor=actor)
+
+
+async def main():
+    args = _parse_args()
+
+    async with container() as nested:
+        repository = await nested.get(UsersRepository)
+        user = await repository.create(
+            CreateUserDto(
+                email=f"benchmark-{uuid.uuid4().hex}@example.com",
+                salt="",
+                hashed_password="",
+                role=RoleEnum.USER,
+            )
+        )
+
+    roles = [RoleEnum.USER, RoleEnum.PUBLIC]
+    try:
+        for name, savepoint in (("savepoint", True), ("outer", False)):
+            # прогрев пула соединений и кешей подготовленных запросов
+            for i in range(10):
+                await _update(user.id, roles[i % 2], savepoint)
+
+            ROUND_TRIPS.reset()
+            timings = []
+            for i in range(args.writes):
+                started = time.perf_counter()
+                await _update(user.id, roles[i % 2], savepoint)
+                timings.append(time.perf_counter() - started)
+
+            timings.sort()
+            print(
+                f"{name:<10} {ROUND_TRIPS.reset() / args.writes:5.2f} round trips"
+                f"  mean {statistics.mean(timings) * 1000:7.2f} ms"
+                f"  p95 {timings[int(len(timings) * 0.95)] * 1000:7.2f} ms"
+            )
+    finally:
+        async with container() as nested:
+            repository = await nested.get(UsersRepository)
+            await repository.delete(await repository.read(user.id))
+        await container.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -29,6 +29,15 @@ class EntityAlreadyExistsError(EntityException):
         super().__init__(f"{entity.__name__} already exists")
 
 
+class EntityVersionConflictError(EntityException):
+    """
+    Стандартная ошибка VersionConflict от которой все ошибки VersionConflict наследуются
+    """
+
+    def __init__(self, entity: type[Entity] | None = None):
+        super().__init__(f"{entity.__name__} was modified by another request")
+
+
 class EntityAccessDenied(EntityException):
     """
     Стандартная ошибка AccessDenied от которой все ошибки AccessDenied наследуются
@@ -7,6 +7,8 @@ class Category:
     id: int
     title: str
     description: str
+    version: int
+    post_count: int
     created_at: datetime
     updated_at: datetime
 
@@ -17,6 +19,10 @@ class Post:
     body: str
     title: str
     category_id: int
+    excerpt: str
+    reading_time: int
+    views: int
+    version: int
     created_at: datetime
     updated_at: datetime
-    category: Category
+    category: Category | None = None
@@ -0,0 +1,34 @@
+import html
+import math
+import re
+
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def to_plain_text(body: str) -> str:
+    """Текст поста без HTML-разметки и лишних пробелов."""
+
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", body))).strip()
+
+
+def make_excerpt(body: str, length: int = EXCERPT_LENGTH) -> str:
+    """Начало текста поста для списков, обрезанное по границе слова."""
+
+    text = to_plain_text(body)
+    if len(text) <= length:
+        return text
+
+    cut = text[:length]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" ,.;:-") + "…"
+
+
+def estimate_reading_time(body: str) -> int:
+    """Время чтения в минутах, не меньше одной."""
+
+    return max(1, math.ceil(len(to_plain_text(body).split()) / WORDS_PER_MINUTE))
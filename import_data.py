@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+from dishka import AsyncContainer
+
+from application.imports.enums import ImportTargetEnum
+from application.imports.services import ImportService
+from application.users.repositories import UsersRepository
+from infrastructure.config import Config
+from infrastructure.imports.readers import (
+    ImportFormatEnum,
+    detect_format,
+    iter_file_chunks,
+    read_rows,
+)
+from infrastructure.providers.container import create_container
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Массовый импорт из NDJSON/CSV")
+    parser.add_argument("target", type=ImportTargetEnum)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", type=ImportFormatEnum, dest="file_format")
+    return parser.parse_args()
+
+
+async def import_data(
+    container: AsyncContainer,
+    target: ImportTargetEnum,
+    path: Path,
+    file_format: ImportFormatEnum | None = None,
+):
+    async with container() as nested:
+        config = await nested.get(Config)
+        imports = await nested.get(ImportService)
+
+        users_repository = await nested.get(UsersRepository)
+        admin = await users_repository.read_by_email(config.admin_username)
+
+        rows = read_rows(
+            iter_file_chunks(path), file_format or detect_format(path.name)
+        )
+        report = await imports.import_rows(target, rows, admin)
+
+    print(
+        f"{report.target.value}: {report.imported_rows}/{report.total_rows} rows "
+        f"imported in {report.elapsed_seconds:.2f}s "
+        f"({report.rows_per_second:.0f} rows/s), rejected: {report.rejected_rows}"
+    )
+    for error in report.errors:
+        print(f"  row {error.row}: {error.message}")
+    await container.close()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    asyncio.run(
+        import_data(create_container(), args.target, args.path, args.file_format)
+    )
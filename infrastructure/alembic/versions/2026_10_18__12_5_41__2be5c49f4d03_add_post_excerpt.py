@@ -0,0 +1,113 @@
+"""add Post excerpt and reading_time
+
+Revision ID: 2be5c49f4d03
+Revises: 589e8c2d1d01
+Create Date: 2026-10-18 12:05:41.318274
+
+"""
+
+import html
+import math
+import re
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2be5c49f4d03"
+down_revision: Union[str, None] = "589e8c2d1d01"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# замороженная копия domain/posts/excerpts.py на момент миграции: правки
+# доменного кода не должны менять уже выпущенную миграцию
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def to_plain_text(body: str) -> str:
+    return _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", body))).strip()
+
+
+def make_excerpt(body: str) -> str:
+    text = to_plain_text(body)
+    if len(text) <= EXCERPT_LENGTH:
+        return text
+
+    cut = text[:EXCERPT_LENGTH]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip(" ,.;:-") + "…"
+
+
+def estimate_reading_time(body: str) -> int:
+    return max(1, math.ceil(len(to_plain_text(body).split()) / WORDS_PER_MINUTE))
+
+
+posts = sa.table(
+    "posts",
+    sa.column("id", sa.Integer),
+    sa.column("body", sa.String),
+    sa.column("excerpt", sa.String),
+    sa.column("reading_time", sa.Integer),
+)
+
+
+def backfill() -> None:
+    """
+    Заполняет excerpt у существующих постов пачками по id. Запускается
+    в autocommit, поэтому каждая пачка фиксируется отдельно и блокировки
+    не держатся на всю таблицу
+    """
+
+    connection = op.get_bind()
+    last_id = 0
+    while rows := connection.execute(
+        sa.select(posts.c.id, posts.c.body)
+        .where(posts.c.id > last_id)
+        .order_by(posts.c.id)
+        .limit(BACKFILL_BATCH_SIZE)
+    ).all():
+        connection.execute(
+            sa.update(posts)
+            .where(posts.c.id == sa.bindparam("post_id"))
+            .values(
+                excerpt=sa.bindparam("post_excerpt"),
+                reading_time=sa.bindparam("post_reading_time"),
+            ),
+            [
+                {
+                    "post_id": post_id,
+                    "post_excerpt": make_excerpt(body),
+                    "post_reading_time": estimate_reading_time(body),
+                }
+                for post_id, body in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "posts",
+        sa.Column("excerpt", sa.String(), server_default="", nullable=False),
+    )
+    op.add_column(
+        "posts",
+        sa.Column("reading_time", sa.Integer(), server_default="0", nullable=False),
+    )
+    with op.get_context().autocommit_block():
+        backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("posts", "reading_time")
+    op.drop_column("posts", "excerpt")
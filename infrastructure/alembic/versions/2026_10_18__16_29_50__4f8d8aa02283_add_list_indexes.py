@@ -0,0 +1,72 @@
+"""add list indexes
+
+Revision ID: 4f8d8aa02283
+Revises: 2be5c49f4d03
+Create Date: 2026-10-18 16:29:50.394151
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f8d8aa02283"
+down_revision: Union[str, None] = "2be5c49f4d03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # индексы строятся CONCURRENTLY, чтобы не блокировать запись в большие таблицы
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_categories_created_at_id",
+            "categories",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_posts_category_id_created_at_id",
+            "posts",
+            ["category_id", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_posts_created_at_id",
+            "posts",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_created_at_id",
+            "users",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_created_at_id", table_name="users", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_posts_created_at_id", table_name="posts", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_posts_category_id_created_at_id",
+            table_name="posts",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_categories_created_at_id",
+            table_name="categories",
+            postgresql_concurrently=True,
+        )
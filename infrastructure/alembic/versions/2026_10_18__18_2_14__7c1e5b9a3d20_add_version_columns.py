@@ -0,0 +1,36 @@
+"""add version columns to posts and categories
+
+Revision ID: 7c1e5b9a3d20
+Revises: 4f8d8aa02283
+Create Date: 2026-10-18 18:02:14.512305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1e5b9a3d20"
+down_revision: Union[str, None] = "4f8d8aa02283"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # константный default: колонка добавляется без перезаписи таблицы
+    op.add_column(
+        "posts", sa.Column("version", sa.Integer(), server_default="1", nullable=False)
+    )
+    op.add_column(
+        "categories",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("categories", "version")
+    op.drop_column("posts", "version")
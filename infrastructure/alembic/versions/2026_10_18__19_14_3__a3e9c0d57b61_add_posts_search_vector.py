@@ -0,0 +1,55 @@
+"""add posts search vector
+
+Revision ID: a3e9c0d57b61
+Revises: 7c1e5b9a3d20
+Create Date: 2026-10-18 19:14:03.208114
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a3e9c0d57b61"
+down_revision: Union[str, None] = "7c1e5b9a3d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # вычисляемая колонка заполняется для всех строк сразу (перезапись таблицы)
+    op.add_column(
+        "posts",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('russian', title), 'A') || "
+                "setweight(to_tsvector('russian', body), 'B')",
+                persisted=True,
+            ),
+            nullable=False,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_posts_search_vector",
+            "posts",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_posts_search_vector", table_name="posts", postgresql_concurrently=True
+        )
+    op.drop_column("posts", "search_vector")
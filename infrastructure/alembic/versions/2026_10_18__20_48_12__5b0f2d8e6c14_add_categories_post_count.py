@@ -0,0 +1,41 @@
+"""add categories post count
+
+Revision ID: 5b0f2d8e6c14
+Revises: d41b7e2c9a58
+Create Date: 2026-10-18 20:48:12.730914
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0f2d8e6c14"
+down_revision: Union[str, None] = "d41b7e2c9a58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "categories",
+        sa.Column("post_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE categories
+        SET post_count = counted.post_count
+        FROM (
+            SELECT category_id, count(*) AS post_count FROM posts GROUP BY category_id
+        ) AS counted
+        WHERE categories.id = counted.category_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("categories", "post_count")
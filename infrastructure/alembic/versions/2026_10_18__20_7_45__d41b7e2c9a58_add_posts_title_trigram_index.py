@@ -0,0 +1,57 @@
+"""add posts title trigram index
+
+Revision ID: d41b7e2c9a58
+Revises: a3e9c0d57b61
+Create Date: 2026-10-18 20:07:45.118302
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41b7e2c9a58"
+down_revision: Union[str, None] = "a3e9c0d57b61"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _pg_trgm_available() -> bool:
+    return bool(
+        op.get_bind().scalar(
+            sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        )
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm входит в contrib; без него подсказки на холодном старте
+    # работают и так, только ILIKE по заголовкам читает всю таблицу
+    if not _pg_trgm_available():
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_posts_title_trgm",
+            "posts",
+            ["title"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_posts_title_trgm",
+            table_name="posts",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,32 @@
+"""add posts views
+
+Revision ID: e8c3a1f04b97
+Revises: 5b0f2d8e6c14
+Create Date: 2026-10-18 21:26:38.402761
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8c3a1f04b97"
+down_revision: Union[str, None] = "5b0f2d8e6c14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # константный default: колонка добавляется без перезаписи таблицы
+    op.add_column(
+        "posts",
+        sa.Column("views", sa.BigInteger(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("posts", "views")
@@ -0,0 +1,78 @@
+"""add trending posts
+
+Revision ID: 7f4d2a9c1e35
+Revises: e8c3a1f04b97
+Create Date: 2026-10-18 21:58:04.118305
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7f4d2a9c1e35"
+down_revision: Union[str, None] = "e8c3a1f04b97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "post_daily_views",
+        sa.Column("post_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("views", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("post_id", "day"),
+    )
+    # до 50 лучших постов каждой категории по просмотрам за 7 дней;
+    # глобальный топ до 50 постов целиком лежит среди них
+    op.execute(
+        """
+        CREATE MATERIALIZED VIEW trending_posts AS
+        SELECT post_id, category_id, title, excerpt, reading_time, views, position
+        FROM (
+            SELECT
+                posts.id AS post_id,
+                posts.category_id,
+                posts.title,
+                posts.excerpt,
+                posts.reading_time,
+                recent.views,
+                row_number() OVER (
+                    PARTITION BY posts.category_id
+                    ORDER BY recent.views DESC, posts.id DESC
+                ) AS position
+            FROM (
+                SELECT post_id, sum(views) AS views
+                FROM post_daily_views
+                WHERE day > current_date - 7
+                GROUP BY post_id
+            ) AS recent
+            JOIN posts ON posts.id = recent.post_id
+        ) AS ranked
+        WHERE position <= 50
+        """
+    )
+    # уникальный индекс нужен для REFRESH ... CONCURRENTLY
+    op.create_index(
+        "ix_trending_posts_post_id", "trending_posts", ["post_id"], unique=True
+    )
+    op.create_index(
+        "ix_trending_posts_category_id_position",
+        "trending_posts",
+        ["category_id", "position"],
+    )
+    op.create_index(
+        "ix_trending_posts_views_post_id",
+        "trending_posts",
+        [sa.text("views DESC"), sa.text("post_id DESC")],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW trending_posts")
+    op.drop_table("post_daily_views")
@@ -0,0 +1,195 @@
+"""partition posts by month
+
+Revision ID: c2e6f1a8b3d0
+Revises: 7f4d2a9c1e35
+Create Date: 2026-10-18 22:31:17.504216
+
+"""
+
+from datetime import date
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2e6f1a8b3d0"
+down_revision: Union[str, None] = "7f4d2a9c1e35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# секции на месяцы вперед; дальше их заводит фоновая задача
+PARTITIONS_AHEAD = 3
+
+POSTS_COLUMNS = (
+    "id, body, title, created_at, updated_at, category_id,"
+    " excerpt, reading_time, version, views"
+)
+
+POSTS_TABLE = """
+    CREATE TABLE {name} (
+        id integer NOT NULL DEFAULT nextval('posts_id_seq'::regclass),
+        body varchar NOT NULL,
+        title varchar NOT NULL,
+        created_at timestamptz NOT NULL DEFAULT now(),
+        updated_at timestamptz NOT NULL DEFAULT now(),
+        category_id integer NOT NULL,
+        excerpt varchar NOT NULL DEFAULT '',
+        reading_time integer NOT NULL DEFAULT 0,
+        version integer NOT NULL DEFAULT 1,
+        search_vector tsvector NOT NULL GENERATED ALWAYS AS (
+            setweight(to_tsvector('russian', title), 'A') ||
+            setweight(to_tsvector('russian', body), 'B')
+        ) STORED,
+        views bigint NOT NULL DEFAULT 0
+    ) {partition_by}
+"""
+
+TRENDING_POSTS = """
+    CREATE MATERIALIZED VIEW trending_posts AS
+    SELECT post_id, category_id, title, excerpt, reading_time, views, position
+    FROM (
+        SELECT
+            posts.id AS post_id,
+            posts.category_id,
+            posts.title,
+            posts.excerpt,
+            posts.reading_time,
+            recent.views,
+            row_number() OVER (
+                PARTITION BY posts.category_id
+                ORDER BY recent.views DESC, posts.id DESC
+            ) AS position
+        FROM (
+            SELECT post_id, sum(views) AS views
+            FROM post_daily_views
+            WHERE day > current_date - 7
+            GROUP BY post_id
+        ) AS recent
+        JOIN posts ON posts.id = recent.post_id
+    ) AS ranked
+    WHERE position <= 50
+"""
+
+
+def _add_months(month: date, months: int) -> date:
+    month_index = month.year * 12 + month.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _create_partition(month: date):
+    upper = _add_months(month, 1)
+    op.execute(
+        f"CREATE TABLE posts_{month:%Y_%m} PARTITION OF posts_partitioned"
+        f" FOR VALUES FROM ('{month} 00:00:00+00') TO ('{upper} 00:00:00+00')"
+    )
+
+
+def _pg_trgm_installed() -> bool:
+    return bool(
+        op.get_bind().scalar(
+            sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        )
+    )
+
+
+def _create_posts_indexes():
+    # на партиционированной таблице индексы строятся без CONCURRENTLY,
+    # у каждой секции появляется своя копия
+    op.create_index("ix_posts_created_at_id", "posts", ["created_at", "id"])
+    op.create_index(
+        "ix_posts_category_id_created_at_id",
+        "posts",
+        ["category_id", "created_at", "id"],
+    )
+    op.create_index(
+        "ix_posts_search_vector", "posts", ["search_vector"], postgresql_using="gin"
+    )
+    if _pg_trgm_installed():
+        op.create_index(
+            "ix_posts_title_trgm",
+            "posts",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        )
+    op.create_foreign_key(
+        "fk_posts_category_id_categories",
+        "posts",
+        "categories",
+        ["category_id"],
+        ["id"],
+    )
+
+
+def _create_trending_posts():
+    op.execute(TRENDING_POSTS)
+    op.create_index(
+        "ix_trending_posts_post_id", "trending_posts", ["post_id"], unique=True
+    )
+    op.create_index(
+        "ix_trending_posts_category_id_position",
+        "trending_posts",
+        ["category_id", "position"],
+    )
+    op.create_index(
+        "ix_trending_posts_views_post_id",
+        "trending_posts",
+        [sa.text("views DESC"), sa.text("post_id DESC")],
+    )
+
+
+def _replace_posts(partition_by: str, create_partitions=None):
+    """
+    Переливает посты в новую таблицу и подменяет ею posts. Таблица
+    пишется целиком под блокировкой, поэтому на больших базах миграцию
+    запускают в окно обслуживания.
+    """
+
+    op.execute("LOCK TABLE posts IN ACCESS EXCLUSIVE MODE")
+    op.execute("DROP MATERIALIZED VIEW trending_posts")
+    op.execute(POSTS_TABLE.format(name="posts_partitioned", partition_by=partition_by))
+    if create_partitions is not None:
+        create_partitions()
+    op.execute(
+        f"INSERT INTO posts_partitioned ({POSTS_COLUMNS})"
+        f" SELECT {POSTS_COLUMNS} FROM posts"
+    )
+    op.execute("ALTER SEQUENCE posts_id_seq OWNED BY posts_partitioned.id")
+    op.execute("DROP TABLE posts")
+    op.execute("ALTER TABLE posts_partitioned RENAME TO posts")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+
+    def create_partitions():
+        first, current = (
+            op.get_bind()
+            .execute(
+                sa.text(
+                    "SELECT date_trunc('month', min(created_at) AT TIME ZONE 'UTC')::date,"
+                    " date_trunc('month', now() AT TIME ZONE 'UTC')::date FROM posts"
+                )
+            )
+            .one()
+        )
+        month = first or current
+        while month <= _add_months(current, PARTITIONS_AHEAD):
+            _create_partition(month)
+            month = _add_months(month, 1)
+
+    _replace_posts("PARTITION BY RANGE (created_at)", create_partitions)
+    # уникальность на секционированной таблице включает ключ секционирования
+    op.create_primary_key("pk_posts", "posts", ["id", "created_at"])
+    _create_posts_indexes()
+    _create_trending_posts()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # секции, уже отсоединенные в схему archive, остаются там как есть
+    _replace_posts("")
+    op.create_primary_key("pk_posts", "posts", ["id"])
+    _create_posts_indexes()
+    _create_trending_posts()
@@ -0,0 +1,121 @@
+"""add post ids
+
+Revision ID: b7d2e9f4a1c8
+Revises: c2e6f1a8b3d0
+Create Date: 2026-10-18 23:47:36.281907
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e9f4a1c8"
+down_revision: Union[str, None] = "c2e6f1a8b3d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# AFTER-триггер на секционированной таблице копируется во все секции,
+# в том числе заведенные позже. Вставка с уже занятым id падает на
+# первичном ключе post_ids; created_at постов не правится, но перенос
+# строки между секциями все равно не оставит post_ids устаревшим
+TRACK_POST_IDS = """
+    CREATE FUNCTION track_post_ids() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO post_ids (id, created_at) VALUES (NEW.id, NEW.created_at);
+        ELSIF TG_OP = 'DELETE' THEN
+            DELETE FROM post_ids WHERE id = OLD.id;
+        ELSE
+            DELETE FROM post_ids WHERE id = OLD.id;
+            INSERT INTO post_ids (id, created_at) VALUES (NEW.id, NEW.created_at)
+            ON CONFLICT (id) DO UPDATE SET created_at = excluded.created_at;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+TRENDING_POSTS = """
+    CREATE MATERIALIZED VIEW trending_posts AS
+    SELECT post_id, category_id, title, excerpt, reading_time, views, position
+    FROM (
+        SELECT
+            posts.id AS post_id,
+            posts.category_id,
+            posts.title,
+            posts.excerpt,
+            posts.reading_time,
+            recent.views,
+            row_number() OVER (
+                PARTITION BY posts.category_id
+                ORDER BY recent.views DESC, posts.id DESC
+            ) AS position
+        FROM (
+            SELECT post_id, sum(views) AS views
+            FROM post_daily_views
+            WHERE day > current_date - 7
+            GROUP BY post_id
+        ) AS recent
+        {join}
+    ) AS ranked
+    WHERE position <= 50
+"""
+
+# дата из post_ids превращает поиск по id в поиск по ключу одной секции
+JOIN_BY_POST_IDS = """
+        JOIN post_ids ON post_ids.id = recent.post_id
+        JOIN posts ON posts.id = post_ids.id
+            AND posts.created_at = post_ids.created_at
+"""
+JOIN_BY_ID = "JOIN posts ON posts.id = recent.post_id"
+
+
+def _create_trending_posts(join: str):
+    op.execute("DROP MATERIALIZED VIEW trending_posts")
+    op.execute(TRENDING_POSTS.format(join=join))
+    op.create_index(
+        "ix_trending_posts_post_id", "trending_posts", ["post_id"], unique=True
+    )
+    op.create_index(
+        "ix_trending_posts_category_id_position",
+        "trending_posts",
+        ["category_id", "position"],
+    )
+    op.create_index(
+        "ix_trending_posts_views_post_id",
+        "trending_posts",
+        [sa.text("views DESC"), sa.text("post_id DESC")],
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "post_ids",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_post_ids")),
+    )
+    # без записей в posts до конца миграции: иначе пост, вставленный между
+    # переливкой и триггером, в post_ids не попадет
+    op.execute("LOCK TABLE posts IN SHARE MODE")
+    # повтор id среди уже существующих постов остановит миграцию здесь
+    op.execute("INSERT INTO post_ids (id, created_at) SELECT id, created_at FROM posts")
+    op.execute(TRACK_POST_IDS)
+    op.execute(
+        "CREATE TRIGGER track_post_ids AFTER INSERT OR DELETE"
+        " OR UPDATE OF id, created_at ON posts"
+        " FOR EACH ROW EXECUTE FUNCTION track_post_ids()"
+    )
+    _create_trending_posts(JOIN_BY_POST_IDS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _create_trending_posts(JOIN_BY_ID)
+    op.execute("DROP TRIGGER track_post_ids ON posts")
+    op.execute("DROP FUNCTION track_post_ids()")
+    op.drop_table("post_ids")
@@ -10,7 +10,14 @@ from starlette.staticfiles import StaticFiles
 
 from .background_tasks import BackgroundTaskRunner
 from .config import STATIC_PATH, Config
+from .deadlines import DeadlineMiddleware
 from .exceptions import get_exception_handlers
+from .pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_ESTIMATED_HEADER,
+    TOTAL_COUNT_HEADER,
+)
+from .posts.views import flush_views
 from .router import v1_router
 
 
@@ -28,7 +35,8 @@ def create_app(container: AsyncContainer, config: Config) -> FastAPI:
         Контекстный менеджер для управления жизненным циклом приложения.
 
         Запускает фоновые задачи,
-        а также корректно завершает работу при остановке.
+        а также корректно завершает работу при остановке:
+        накопленные в памяти просмотры постов записываются в базу.
         """
 
         runner = BackgroundTaskRunner(container)
@@ -37,14 +45,21 @@ def create_app(container: AsyncContainer, config: Config) -> FastAPI:
             yield
         finally:
             await runner.cancel_background_task()
+            await flush_views(container)
 
     app = FastAPI(lifespan=lifespan)
+    app.add_middleware(DeadlineMiddleware, config=config)  # noqa
     app.add_middleware(
         CORSMiddleware,  # noqa
         allow_origins=config.cors_origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[
+            NEXT_CURSOR_HEADER,
+            TOTAL_COUNT_HEADER,
+            TOTAL_COUNT_ESTIMATED_HEADER,
+        ],
     )
 
     for exc_type, handler in get_exception_handlers():
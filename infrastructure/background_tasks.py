@@ -45,6 +45,24 @@ class BackgroundTaskRunner(metaclass=Singleton):
         Возвращает список созданных задач для последующего управления их жизненным циклом.
         """
 
+        from .posts.archive import rebuild_archive
+        from .posts.counters import repair_post_counts
+        from .posts.partitions import maintain_posts_partitions
+        from .posts.suggestions import rebuild_suggestions
+        from .posts.trending import refresh_trending_posts
+        from .posts.views import flush_post_views
+        from .replicas import check_replicas
+
+        self.tasks.append(asyncio.create_task(check_replicas(self.container)))
+        self.tasks.append(asyncio.create_task(rebuild_suggestions(self.container)))
+        self.tasks.append(asyncio.create_task(repair_post_counts(self.container)))
+        self.tasks.append(asyncio.create_task(flush_post_views(self.container)))
+        self.tasks.append(asyncio.create_task(refresh_trending_posts(self.container)))
+        self.tasks.append(
+            asyncio.create_task(maintain_posts_partitions(self.container))
+        )
+        self.tasks.append(asyncio.create_task(rebuild_archive(self.container)))
+
         return self.tasks
 
     async def cancel_background_task(self):
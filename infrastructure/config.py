@@ -38,8 +38,57 @@ class Config(BaseSettings):
     postgres_port: int
     postgres_db: str
 
+    # срок ответа на запрос по умолчанию и допустимое ожидание блокировок, сек
+    request_timeout: float = 30.0
+    postgres_lock_timeout: float = 5.0
+
+    # профиль пулов соединений (мастер, пул только для чтения и реплики)
+    postgres_pool_size: int = 32
+    postgres_max_overflow: int = 10
+    postgres_pool_timeout: float = 30.0
+    postgres_pool_recycle: int = -1
+    postgres_pool_pre_ping: bool = False
+    postgres_statement_cache_size: int = 100
+    # pgbouncer в режиме transaction pooling перед базой
+    postgres_pgbouncer: bool = False
+
+    # GET-обработчики читают без BEGIN/COMMIT, выгрузки — одним снимком
+    read_only_requests: bool = True
+    # DSN реплик (postgresql+asyncpg://...) для чтения из GET-обработчиков
+    postgres_replica_urls: list[str] = []
+    replica_max_lag: float = 5.0
+    replica_check_interval: float = 5.0
+
     secret_key: str
 
+    bulk_insert_chunk_size: int = 1000
+    stream_fetch_size: int = 1000
+    exact_count_threshold: int = 10000
+
+    # списки постов читаются Core-проекцией мимо ORM и маперов
+    posts_list_projection: bool = True
+    category_posts_list_projection: bool = True
+    # интервал сверки счетчиков постов категорий с таблицей постов, сек
+    post_counts_repair_interval: float = 3600.0
+    # интервал пересборки индекса подсказок по заголовкам, сек
+    suggestions_rebuild_interval: float = 300.0
+    # интервал записи накопленных просмотров постов в базу, сек
+    views_flush_interval: float = 10.0
+    # сколько разных постов буфер просмотров держит до досрочной записи
+    views_buffer_size: int = 10000
+    # интервал пересчета популярных постов (trending_posts), сек
+    trending_refresh_interval: float = 300.0
+    # интервал пересчета гистограммы постов по месяцам, сек
+    archive_rebuild_interval: float = 300.0
+    # помесячные секции постов: интервал проверки, сек, и запас вперед, мес
+    posts_partitions_interval: float = 3600.0
+    posts_partitions_ahead: int = 3
+    # секции старше стольких месяцев отсоединяются в схему archive;
+    # None - посты не архивируются
+    posts_archive_after_months: int | None = None
+    import_chunk_size: int = 5000
+    import_max_reported_errors: int = 1000
+
     @computed_field
     @property
     def postgres_url(self) -> PostgresDsn:
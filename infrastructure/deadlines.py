@@ -0,0 +1,93 @@
+import dataclasses
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import Config
+
+
+class DeadlineExceededError(Exception):
+    def __init__(self):
+        super().__init__("Request deadline exceeded")
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Крайний срок запроса (по time.monotonic) и допустимое ожидание блокировок."""
+
+    expires_at: float
+    lock_timeout: float
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+
+# срок выгрузок и импортов, которые честно читают или пишут всю таблицу
+BULK_TIMEOUT = timedelta(minutes=10)
+
+_deadline: ContextVar[Deadline | None] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    """Возвращает крайний срок текущего запроса или None вне HTTP-запроса."""
+
+    return _deadline.get()
+
+
+class DeadlineMiddleware:
+    """
+    Назначает каждому HTTP-запросу крайний срок от момента его поступления.
+
+    Сессия базы данных превращает остаток срока в statement_timeout, поэтому
+    один патологический запрос не держит соединение из пула дольше, чем
+    клиент готов ждать ответа.
+    """
+
+    def __init__(self, app: ASGIApp, config: Config):
+        self.app = app
+        self.config = config
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = _deadline.set(
+            Deadline(
+                expires_at=time.monotonic() + self.config.request_timeout,
+                lock_timeout=self.config.postgres_lock_timeout,
+            )
+        )
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(token)
+
+
+def deadline(timeout: timedelta) -> Callable[[], Awaitable[None]]:
+    """
+    Зависимость маршрута, заменяющая срок запроса по умолчанию.
+
+    Срок отсчитывается от начала обработки маршрута: долгим выгрузкам
+    его продлевают, быстрым маршрутам — сокращают.
+    """
+
+    async def _set_deadline():
+        expires_at = time.monotonic() + timeout.total_seconds()
+        if (current := _deadline.get()) is not None:
+            _deadline.set(dataclasses.replace(current, expires_at=expires_at))
+
+    return _set_deadline
+
+
+__all__ = [
+    "BULK_TIMEOUT",
+    "Deadline",
+    "DeadlineExceededError",
+    "DeadlineMiddleware",
+    "current_deadline",
+    "deadline",
+]
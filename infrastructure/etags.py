@@ -0,0 +1,43 @@
+from fastapi import Response
+
+from application.exceptions import InvalidPreconditionError, PreconditionRequiredError
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag(response: Response, version: int):
+    """Отдает версию сущности заголовком ETag для последующего If-Match."""
+
+    response.headers[ETAG_HEADER] = make_etag(version)
+
+
+def parse_if_match(value: str | None) -> int | None:
+    """
+    Достает ожидаемую версию из If-Match. Для «*» возвращает None:
+    клиент согласен на любую версию, проверяется только существование.
+    """
+
+    if value is None:
+        raise PreconditionRequiredError()
+    value = value.strip()
+    if value == "*":
+        return None
+    # версия меняется вместе со строкой, поэтому слабый валидатор равен сильному
+    value = value.removeprefix("W/")
+    if len(value) < 2 or value[0] != '"' or value[-1] != '"':
+        raise InvalidPreconditionError()
+    try:
+        return int(value[1:-1])
+    except ValueError:
+        raise InvalidPreconditionError()
+
+
+__all__ = [
+    "make_etag",
+    "parse_if_match",
+    "set_etag",
+]
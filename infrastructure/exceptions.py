@@ -1,17 +1,27 @@
 from typing import Any, Callable, Coroutine, Type
 
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette import status
 from starlette.requests import Request
 from starlette.responses import JSONResponse
 
 from application.auth.exceptions import InvalidCredentialsError
+from application.exceptions import (
+    InvalidCursorError,
+    InvalidPreconditionError,
+    PreconditionRequiredError,
+)
 from domain.exceptions import (
     EntityAccessDenied,
     EntityAlreadyExistsError,
     EntityNotFoundError,
+    EntityVersionConflictError,
     InvalidEntityPeriodError,
 )
 
+from .deadlines import DeadlineExceededError
+
 
 async def entity_not_found_exception_handler(_: Request, exc: EntityNotFoundError):
     """
@@ -72,6 +82,101 @@ async def invalid_entity_period_handler(_: Request, exc: InvalidEntityPeriodErro
     )
 
 
+async def invalid_cursor_handler(_: Request, exc: InvalidCursorError):
+    """
+    Обрабатывает ошибки невалидного курсора пагинации (400 Bad Request).
+    """
+
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"message": str(exc)},
+    )
+
+
+async def entity_version_conflict_handler(_: Request, exc: EntityVersionConflictError):
+    """
+    Обрабатывает изменение сущности другим запросом (412 Precondition Failed).
+    """
+
+    return JSONResponse(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        content={"message": str(exc)},
+    )
+
+
+async def precondition_required_handler(_: Request, exc: PreconditionRequiredError):
+    """
+    Обрабатывает запись без заголовка If-Match (428 Precondition Required).
+    """
+
+    return JSONResponse(
+        status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+        content={"message": str(exc)},
+    )
+
+
+async def invalid_precondition_handler(_: Request, exc: InvalidPreconditionError):
+    """
+    Обрабатывает невалидный заголовок If-Match (400 Bad Request).
+    """
+
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"message": str(exc)},
+    )
+
+
+async def deadline_exceeded_handler(_: Request, exc: DeadlineExceededError):
+    """
+    Обрабатывает истечение срока запроса (504 Gateway Timeout).
+    """
+
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"message": str(exc)},
+    )
+
+
+async def pool_timeout_handler(_: Request, __: PoolTimeoutError):
+    """
+    Обрабатывает исчерпание пула соединений (503 Service Unavailable).
+    """
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"message": "Database is overloaded, try again later"},
+        headers={"Retry-After": "1"},
+    )
+
+
+# query_canceled: сработал statement_timeout, выставленный по сроку запроса
+QUERY_CANCELED = "57014"
+# lock_not_available: сработал lock_timeout
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+async def database_timeout_handler(_: Request, exc: DBAPIError):
+    """
+    Обрабатывает отмену запроса по statement_timeout (504 Gateway Timeout)
+    и по lock_timeout (503 Service Unavailable). Остальные ошибки базы
+    пробрасываются дальше.
+    """
+
+    sqlstate = getattr(exc.orig, "sqlstate", None)
+    if sqlstate == QUERY_CANCELED:
+        return JSONResponse(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            content={"message": "Database query timed out"},
+        )
+    if sqlstate == LOCK_NOT_AVAILABLE:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"message": "Resource is locked, try again later"},
+            headers={"Retry-After": "1"},
+        )
+    raise exc
+
+
 def get_exception_handlers() -> list[
     tuple[Type[Exception], Callable[[Request, Any], Coroutine[Any, Any, JSONResponse]]]
 ]:
@@ -81,4 +186,11 @@ def get_exception_handlers() -> list[
         (EntityAccessDenied, entity_access_denied_handler),
         (InvalidCredentialsError, invalid_credentials_exception_handler),
         (InvalidEntityPeriodError, invalid_entity_period_handler),
+        (InvalidCursorError, invalid_cursor_handler),
+        (EntityVersionConflictError, entity_version_conflict_handler),
+        (PreconditionRequiredError, precondition_required_handler),
+        (InvalidPreconditionError, invalid_precondition_handler),
+        (DeadlineExceededError, deadline_exceeded_handler),
+        (PoolTimeoutError, pool_timeout_handler),
+        (DBAPIError, database_timeout_handler),
     ]
@@ -0,0 +1,39 @@
+from typing import ClassVar
+
+from pydantic import BaseModel, field_validator
+
+
+def parse_fields(value: str | None, model: type[BaseModel]) -> tuple[str, ...] | None:
+    """
+    Разбирает ?fields=id,title в имена полей модели ответа.
+    Поля принимаются как по алиасу, так и по имени
+    """
+
+    if value is None:
+        return None
+
+    known = {}
+    for name, info in model.model_fields.items():
+        known[name] = known[info.alias or name] = name
+
+    requested = [field.strip() for field in value.split(",") if field.strip()]
+    if unknown := [field for field in requested if field not in known]:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if not requested:
+        raise ValueError("At least one field is required")
+
+    return tuple(dict.fromkeys(known[field] for field in requested))
+
+
+class SparseFieldsModel(BaseModel):
+    """Параметр fields: какие поля ответа нужны клиенту."""
+
+    fields_model: ClassVar[type[BaseModel]]
+
+    fields: str | None = None
+
+    @field_validator("fields")
+    @classmethod
+    def validate_fields(cls, value: str | None) -> str | None:
+        parse_fields(value, cls.fields_model)
+        return value
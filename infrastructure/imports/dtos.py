@@ -0,0 +1,19 @@
+from application.imports.enums import ImportTargetEnum
+from infrastructure.models import CamelModel
+
+
+class ImportRowErrorModel(CamelModel):
+    row: int
+    message: str
+
+
+class ImportReportModel(CamelModel):
+    """Итог импорта: сколько строк загружено, сколько отклонено и с какой скоростью."""
+
+    target: ImportTargetEnum
+    total_rows: int
+    imported_rows: int
+    rejected_rows: int
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: list[ImportRowErrorModel]
@@ -0,0 +1,92 @@
+from pydantic import ValidationError
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
+
+from application.imports.dtos import ImportChunkResultDto, ImportRowErrorDto
+from application.imports.enums import ImportTargetEnum
+from application.imports.gateways import ImportGateway
+
+from ..posts.imports import CategoriesImportTarget, PostsImportTarget
+from ..users.imports import UsersImportTarget
+from .targets import ImportTarget
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class CopyImportGateway(ImportGateway):
+    """
+    Импорт через binary COPY asyncpg во временную staging-таблицу
+    с последующим слиянием в основную таблицу одним INSERT ... SELECT.
+    """
+
+    _targets: dict[ImportTargetEnum, ImportTarget] = {
+        ImportTargetEnum.POSTS: PostsImportTarget(),
+        ImportTargetEnum.CATEGORIES: CategoriesImportTarget(),
+        ImportTargetEnum.USERS: UsersImportTarget(),
+    }
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._staging_tables: dict[ImportTargetEnum, Table] = {}
+
+    async def import_chunk(
+        self, target: ImportTargetEnum, rows: list[tuple[int, object]]
+    ) -> ImportChunkResultDto:
+        spec = self._targets[target]
+
+        records, errors = [], []
+        for row_number, raw in rows:
+            try:
+                records.append((row_number, *spec.to_record(raw)))
+            except ValidationError as exc:
+                errors.append(
+                    ImportRowErrorDto(
+                        row=row_number, message=_format_validation_error(exc)
+                    )
+                )
+        if not records:
+            return ImportChunkResultDto(imported_rows=0, errors=errors)
+
+        staging = await self._get_staging_table(target, spec)
+        connection = await self._get_driver_connection()
+        await connection.copy_records_to_table(
+            staging.name,
+            records=records,
+            columns=[column.name for column in staging.columns],
+        )
+
+        rejected = (await self._session.scalars(spec.get_merge_query(staging))).all()
+        await self._session.execute(text(f"TRUNCATE TABLE {staging.name}"))
+
+        errors += [
+            ImportRowErrorDto(row=row_number, message=str(spec.conflict_exception()))
+            for row_number in rejected
+        ]
+        errors.sort(key=lambda error: error.row)
+        return ImportChunkResultDto(
+            imported_rows=len(records) - len(rejected), errors=errors
+        )
+
+    async def _get_staging_table(
+        self, target: ImportTargetEnum, spec: ImportTarget
+    ) -> Table:
+        """Создает staging-таблицу один раз на транзакцию, дальше переиспользует."""
+
+        if target not in self._staging_tables:
+            staging = spec.get_staging_table()
+            await self._session.execute(CreateTable(staging, if_not_exists=True))
+            self._staging_tables[target] = staging
+        return self._staging_tables[target]
+
+    async def _get_driver_connection(self):
+        """Возвращает соединение asyncpg текущей транзакции сессии."""
+
+        connection = await self._session.connection()
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
@@ -0,0 +1,23 @@
+from adaptix.conversion import coercer
+
+from application.imports.dtos import ImportReportDto, ImportRowErrorDto
+from infrastructure.mappers import pydantic_retort
+
+from . import dtos as models
+
+py_retort = pydantic_retort.extend(recipe=[])
+
+import_row_error__map_to_pydantic = py_retort.get_converter(
+    ImportRowErrorDto, models.ImportRowErrorModel
+)
+import_report__map_to_pydantic = py_retort.get_converter(
+    ImportReportDto,
+    models.ImportReportModel,
+    recipe=[
+        coercer(
+            ImportRowErrorDto,
+            models.ImportRowErrorModel,
+            import_row_error__map_to_pydantic,
+        )
+    ],
+)
@@ -0,0 +1,106 @@
+import codecs
+import csv
+import io
+import json
+from enum import Enum
+from pathlib import Path
+from typing import Any, AsyncIterable, AsyncIterator
+
+from fastapi import UploadFile
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ImportFormatEnum(Enum):
+    NDJSON = "NDJSON"
+    CSV = "CSV"
+
+
+def detect_format(filename: str | None) -> ImportFormatEnum:
+    """Определяет формат файла по расширению, по умолчанию NDJSON."""
+
+    if filename and filename.lower().endswith(".csv"):
+        return ImportFormatEnum.CSV
+    return ImportFormatEnum.NDJSON
+
+
+async def iter_upload_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    """Читает загруженный файл кусками фиксированного размера."""
+
+    while chunk := await file.read(READ_CHUNK_SIZE):
+        yield chunk
+
+
+async def iter_file_chunks(path: Path) -> AsyncIterator[bytes]:
+    """Читает файл с диска кусками фиксированного размера."""
+
+    with open(path, "rb") as file:
+        while chunk := file.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], encoding: str = "utf-8"
+) -> AsyncIterator[str]:
+    """
+    Режет поток байт на строки, не держа в памяти больше одного куска,
+    многобайтовые символы на границе кусков декодируются корректно
+    """
+
+    decoder = codecs.getincrementaldecoder(encoding)()
+    tail = ""
+    async for chunk in chunks:
+        *lines, tail = (tail + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line
+    tail += decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def read_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[Any]:
+    """
+    Построчно разбирает NDJSON, битая строка отдается как есть,
+    чтобы попасть в отчет ошибкой валидации, а не уронить весь импорт
+    """
+
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield line
+
+
+async def read_csv(lines: AsyncIterable[str]) -> AsyncIterator[dict[str, str]]:
+    """Разбирает CSV с заголовком, поля в кавычках могут содержать переносы строк."""
+
+    header = None
+    buffer, quotes = [], 0
+    async for line in lines:
+        buffer.append(line.rstrip("\r"))
+        quotes += line.count('"')
+        # нечетное число кавычек - значит перенос строки внутри поля
+        if quotes % 2:
+            continue
+
+        record = "\n".join(buffer)
+        buffer, quotes = [], 0
+        if not record.strip():
+            continue
+
+        values = next(csv.reader(io.StringIO(record)))
+        if header is None:
+            header = values
+            continue
+        yield dict(zip(header, values))
+
+
+def read_rows(
+    chunks: AsyncIterable[bytes], file_format: ImportFormatEnum
+) -> AsyncIterator[Any]:
+    lines = iter_lines(chunks)
+    if file_format == ImportFormatEnum.CSV:
+        return read_csv(lines)
+    return read_ndjson(lines)
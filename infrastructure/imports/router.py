@@ -0,0 +1,41 @@
+from typing import Annotated
+
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from fastapi import APIRouter, Depends, UploadFile
+
+from application.imports.enums import ImportTargetEnum
+from application.imports.services import ImportService
+from domain.users.entities import User
+from infrastructure.auth.deps import get_user
+from infrastructure.deadlines import BULK_TIMEOUT, deadline
+
+from . import dtos, mappers
+from .readers import ImportFormatEnum, detect_format, iter_upload_chunks, read_rows
+
+router = APIRouter(route_class=DishkaRoute)
+
+
+@router.post(
+    "/{target}",
+    response_model=dtos.ImportReportModel,
+    dependencies=[Depends(deadline(BULK_TIMEOUT))],
+)
+async def import_file(
+    target: ImportTargetEnum,
+    file: UploadFile,
+    actor: Annotated[User, Depends(get_user)],
+    imports: FromDishka[ImportService],
+    file_format: ImportFormatEnum | None = None,
+):
+    """Эндпоинт для массового импорта из NDJSON или CSV файла.
+
+    Файл читается потоково и грузится пачками через COPY,
+    отклоненные строки возвращаются в отчете с номером и причиной.
+    """
+
+    rows = read_rows(
+        iter_upload_chunks(file), file_format or detect_format(file.filename)
+    )
+    return mappers.import_report__map_to_pydantic(
+        await imports.import_rows(target, rows, actor)
+    )
@@ -0,0 +1,82 @@
+from abc import ABCMeta, abstractmethod
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    MetaData,
+    Select,
+    Table,
+    false,
+    insert,
+    select,
+)
+
+from infrastructure.postgres import Base
+
+
+class ImportTarget(metaclass=ABCMeta):
+    """
+    Описание того, как строки файла попадают в конкретную таблицу:
+    чем валидировать, какие колонки грузить через COPY и как сливать staging
+    """
+
+    model: type[Base]
+    validation_model: type[BaseModel]
+    columns: tuple[str, ...]
+    conflict_exception: type[Exception] | None = None
+
+    @abstractmethod
+    def to_model(self, validated: BaseModel) -> Base:
+        """Превращает провалидированную строку в модель таблицы."""
+
+    def to_record(self, raw: Any) -> tuple:
+        """Валидирует сырую строку и превращает ее в кортеж значений для COPY."""
+
+        model = self.to_model(self.validation_model.model_validate(raw))
+        return tuple(self._get_value(model, key) for key in self.columns)
+
+    def _get_value(self, model: Base, key: str) -> Any:
+        column = self.model.__table__.columns[key]
+        value = getattr(model, key)
+        # python-side default'ы sqlalchemy при COPY сами не подставятся
+        if value is None and column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        if isinstance(value, Enum):
+            value = value.name
+        return value
+
+    def get_staging_table(self) -> Table:
+        return Table(
+            f"import_{self.model.__tablename__}",
+            MetaData(),
+            Column("row_number", BigInteger, nullable=False),
+            *(
+                Column(key, self.model.__table__.columns[key].type)
+                for key in self.columns
+            ),
+            prefixes=["TEMPORARY"],
+            postgresql_on_commit="DROP",
+        )
+
+    def _get_insert_select(self, source: Table) -> Select:
+        return select(*(source.columns[key] for key in self.columns)).order_by(
+            source.columns.row_number
+        )
+
+    def get_merge_query(self, staging: Table) -> Select:
+        """
+        Переносит строки из staging в основную таблицу одним запросом
+        и возвращает номера строк, которые пришлось отклонить
+        """
+
+        table = self.model.__table__
+        inserted = (
+            insert(table)
+            .from_select(self.columns, self._get_insert_select(staging))
+            .returning(table.columns.id)
+            .cte("inserted")
+        )
+        return select(staging.columns.row_number).where(false()).add_cte(inserted)
@@ -0,0 +1,102 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Iterable, TypeVar
+
+from fastapi import Response
+from pydantic import BaseModel, Field
+from pydantic_core import to_json
+
+from application.exceptions import InvalidCursorError
+from application.pagination import CountModeEnum, Cursor, Page, RankCursor, TotalCount
+
+Entity = TypeVar("Entity")
+Model = TypeVar("Model")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+MAX_PAGE_LIMIT = 100
+
+
+class PaginationModel(BaseModel):
+    """
+    Параметры keyset-пагинации списков. Читаются из query-строки,
+    поэтому без camelCase-алиасов
+    """
+
+    limit: int = Field(default=50, ge=1, le=MAX_PAGE_LIMIT)
+    cursor: str | None = None
+    # без параметра общее число строк не считается вовсе
+    count: CountModeEnum | None = None
+
+
+def encode_cursor(cursor: Cursor | RankCursor) -> str:
+    """Кодирует позицию в непрозрачную для клиента строку."""
+
+    if isinstance(cursor, RankCursor):
+        position = [cursor.rank, cursor.id]
+    else:
+        position = [cursor.created_at.isoformat(), cursor.id]
+    raw = json.dumps(position, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_position(value: str) -> list:
+    raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+    return json.loads(raw)
+
+
+def decode_cursor(value: str | None) -> Cursor | None:
+    if not value:
+        return None
+    try:
+        created_at, entity_id = _decode_position(value)
+        return Cursor(created_at=datetime.fromisoformat(created_at), id=int(entity_id))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorError()
+
+
+def decode_rank_cursor(value: str | None) -> RankCursor | None:
+    if not value:
+        return None
+    try:
+        rank, entity_id = _decode_position(value)
+        return RankCursor(rank=float(rank), id=int(entity_id))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorError()
+
+
+def paginate(
+    response: Response, page: Page[Entity], mapper: Callable[[Entity], Model]
+) -> Iterable[Model]:
+    """
+    Отдает элементы страницы телом ответа, а курсор следующей страницы
+    кладет в заголовок, чтобы тело списков осталось массивом
+    """
+
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page.next_cursor)
+    return map(mapper, page.items)
+
+
+def set_total_count(response: Response, total: TotalCount) -> None:
+    response.headers[TOTAL_COUNT_HEADER] = str(total.value)
+    response.headers[TOTAL_COUNT_ESTIMATED_HEADER] = str(total.is_estimated).lower()
+
+
+def paginate_rows(response: Response, page: Page[dict[str, Any]]) -> Response:
+    """
+    Сериализует строки проекции сразу в байты ответа, минуя
+    маперы и повторную валидацию по response_model
+    """
+
+    paginated = Response(
+        content=to_json(page.items),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+    if page.next_cursor is not None:
+        paginated.headers[NEXT_CURSOR_HEADER] = encode_cursor(page.next_cursor)
+    return paginated
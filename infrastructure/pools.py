@@ -0,0 +1,126 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .replicas import ReplicaSet
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    """
+    Настройки пула соединений и кешей подготовленных запросов.
+
+    В режиме pgbouncer (transaction pooling) соседние транзакции одного
+    соединения могут попасть на разные серверные бэкенды, поэтому
+    подготовленные запросы не кешируются, а их имена уникальны.
+    """
+
+    size: int = 32
+    max_overflow: int = 10
+    timeout: float = 30.0
+    recycle: int = -1
+    pre_ping: bool = False
+    statement_cache_size: int = 100
+    pgbouncer: bool = False
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Снимок счётчиков пула соединений."""
+
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    waiting: int
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_max: float
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Пул, считающий выдачи соединений и время их ожидания.
+
+    Время выдачи включает и ожидание свободного соединения, и открытие
+    нового, то есть всё, что запрос потерял до своего первого SQL.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._waiting = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def connect(self):
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._waiting -= 1
+            self._checkouts += 1
+            self._wait_time_total += elapsed
+            self._wait_time_max = max(self._wait_time_max, elapsed)
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            size=self.size(),
+            checked_out=self.checkedout(),
+            idle=self.checkedin(),
+            overflow=max(self.overflow(), 0),
+            waiting=self._waiting,
+            checkouts=self._checkouts,
+            timeouts=self._timeouts,
+            wait_time_total=self._wait_time_total,
+            wait_time_max=self._wait_time_max,
+        )
+
+
+def get_pool_stats(engine: AsyncEngine) -> PoolStats | None:
+    """Возвращает счётчики пула движка или None для неинструментированного пула."""
+
+    pool = engine.sync_engine.pool
+    return pool.stats() if isinstance(pool, InstrumentedPool) else None
+
+
+@dataclass
+class DatabasePools:
+    """Движки приложения: мастер, пул только для чтения и реплики."""
+
+    primary: AsyncEngine
+    read_only: AsyncEngine
+    replicas: ReplicaSet
+
+    def stats(self) -> dict[str, PoolStats]:
+        """Счётчики всех пулов по именам: primary, read_only и host:port реплик."""
+
+        engines = {"primary": self.primary, "read_only": self.read_only}
+        for replica in self.replicas.replicas:
+            url = replica.engine.url
+            engines[f"replica:{url.host}:{url.port}"] = replica.engine
+
+        return {
+            name: stats
+            for name, engine in engines.items()
+            if (stats := get_pool_stats(engine)) is not None
+        }
+
+
+__all__ = [
+    "DatabasePools",
+    "InstrumentedPool",
+    "PoolProfile",
+    "PoolStats",
+    "get_pool_stats",
+]
@@ -1,11 +1,28 @@
-from sqlalchemy import MetaData
+import math
+from uuid import uuid4
+
+from dishka.integrations.fastapi import FromDishka, inject
+from sqlalchemy import Connection, MetaData, event, text
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
     AsyncEngine,
+    AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState, Session
+
+from .config import Config
+from .deadlines import DeadlineExceededError, current_deadline
+from .pools import InstrumentedPool, PoolProfile
+from .replicas import ReplicaSet
+
+READ_ONLY_KEY = "read_only"
+SNAPSHOT_KEY = "snapshot"
+PRIMARY_KEY = "primary"
+REPLICA_KEY = "replica"
+# пометка соединения пула, на котором таймауты выставлены на сессию
+SESSION_TIMEOUTS_KEY = "session_timeouts"
 
 constraint_naming_conventions = {
     "ix": "ix_%(column_0_label)s",
@@ -28,13 +45,211 @@ class Base(AsyncAttrs, DeclarativeBase):
     metadata = MetaData(naming_convention=constraint_naming_conventions)
 
 
-def get_engine(url: str) -> AsyncEngine:
-    """Создает и возвращает асинхронный движок SQLAlchemy."""
+def get_engine(url: str, profile: PoolProfile, read_only: bool = False) -> AsyncEngine:
+    """
+    Создает и возвращает асинхронный движок SQLAlchemy.
+
+    Движок только для чтения работает без BEGIN/COMMIT: каждый запрос
+    выполняется в собственной неявной транзакции, а запрет записи сервер
+    включает сам через default_transaction_read_only. За pgbouncer параметры
+    стартового пакета не доходят до бэкенда, поэтому там движок только для
+    чтения открывает BEGIN READ ONLY-транзакции.
+    """
+
+    statement_cache_size = 0 if profile.pgbouncer else profile.statement_cache_size
+    connect_args = {
+        "statement_cache_size": statement_cache_size,
+        "prepared_statement_cache_size": statement_cache_size,
+    }
+    if profile.pgbouncer:
+        connect_args["prepared_statement_name_func"] = _unique_statement_name
+
+    options = {}
+    if read_only and profile.pgbouncer:
+        options["execution_options"] = {"postgresql_readonly": True}
+    elif read_only:
+        options["isolation_level"] = "AUTOCOMMIT"
+        connect_args["server_settings"] = {"default_transaction_read_only": "on"}
+
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedPool,
+        pool_size=profile.size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.timeout,
+        pool_recycle=profile.recycle,
+        pool_pre_ping=profile.pre_ping,
+        connect_args=connect_args,
+        **options,
+    )
+    event.listen(engine.sync_engine.pool, "reset", _reset_timeouts)
+    return engine
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+class RoutingSession(Session):
+    """
+    Сессия, выбирающая соединение по режиму запроса.
+
+    Читающая сессия, не закреплённая за мастером, выбирает реплику при первом
+    запросе и использует её до конца запроса, чтобы чтения не «прыгали» между
+    репликами с разным отставанием. Без доступных реплик она читает из мастера
+    через пул только для чтения. Сессия выгрузки читает из мастера в
+    SERIALIZABLE READ ONLY DEFERRABLE-транзакции. Остальные запросы идут в
+    мастер в обычной транзакции.
+    """
+
+    def __init__(
+        self,
+        replicas: ReplicaSet | None = None,
+        read_only_engine: AsyncEngine | None = None,
+        snapshot_engine: AsyncEngine | None = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self._replicas = replicas
+        self._read_only_engine = read_only_engine
+        self._snapshot_engine = snapshot_engine
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get(PRIMARY_KEY):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+
+        if self.info.get(SNAPSHOT_KEY) and self._snapshot_engine is not None:
+            return self._snapshot_engine.sync_engine
+
+        if self.info.get(READ_ONLY_KEY):
+            if REPLICA_KEY not in self.info:
+                self.info[REPLICA_KEY] = (
+                    self._replicas.choose() if self._replicas else None
+                )
+            if engine := self.info[REPLICA_KEY] or self._read_only_engine:
+                return engine.sync_engine
+
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+SET_TIMEOUTS_QUERY = text(
+    "SELECT set_config('statement_timeout', :statement_timeout, :is_local),"
+    " set_config('lock_timeout', :lock_timeout, :is_local)"
+)
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _apply_deadline(_: Session, __, connection: Connection):
+    """
+    Переносит остаток срока запроса в statement_timeout и lock_timeout.
+
+    В транзакции настройки локальны и сбрасываются на COMMIT/ROLLBACK.
+    Соединения пула только для чтения работают в autocommit, там настройки
+    ставятся на сессию и сбрасываются при возврате соединения в пул.
+    """
+
+    if (current := current_deadline()) is None:
+        return
+
+    remaining = current.remaining()
+    if remaining <= 0:
+        raise DeadlineExceededError()
+
+    is_local = not connection.connection.dbapi_connection.autocommit
+    connection.execute(
+        SET_TIMEOUTS_QUERY,
+        {
+            "statement_timeout": f"{math.ceil(remaining * 1000)}ms",
+            "lock_timeout": f"{math.ceil(min(remaining, current.lock_timeout) * 1000)}ms",
+            "is_local": is_local,
+        },
+    )
+    if not is_local:
+        connection.connection.info[SESSION_TIMEOUTS_KEY] = True
+
+
+def _reset_timeouts(dbapi_connection, connection_record, reset_state):
+    """
+    Возвращает таймауты сессии к значениям сервера, когда соединение
+    возвращается в пул, иначе их унаследуют следующие запросы без срока
+    и проверки здоровья реплик.
+    """
+
+    if not connection_record.info.pop(SESSION_TIMEOUTS_KEY, False):
+        return
+    if not reset_state.asyncio_safe:
+        # такое соединение пул закрывает, а не выдает повторно
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("RESET statement_timeout")
+        cursor.execute("RESET lock_timeout")
+    finally:
+        cursor.close()
+
 
-    return create_async_engine(url, pool_size=32)
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _check_deadline(_: ORMExecuteState):
+    """Не отправляет в базу запросы, ответ на которые клиенту уже не нужен."""
 
+    if (current := current_deadline()) is not None and current.remaining() <= 0:
+        raise DeadlineExceededError()
 
-def get_session_maker(engine: AsyncEngine) -> async_sessionmaker:
+
+def get_session_maker(
+    engine: AsyncEngine,
+    replicas: ReplicaSet | None = None,
+    read_only_engine: AsyncEngine | None = None,
+) -> async_sessionmaker:
     """Создает фабрику асинхронных сессий SQLAlchemy."""
 
-    return async_sessionmaker(bind=engine, expire_on_commit=False)
+    return async_sessionmaker(
+        bind=engine,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replicas=replicas,
+        read_only_engine=read_only_engine,
+        # общий с мастером пул: DEFERRABLE ждёт безопасный снимок и дальше
+        # читает без блокировок и риска ошибок сериализации
+        snapshot_engine=engine.execution_options(
+            isolation_level="SERIALIZABLE",
+            postgresql_readonly=True,
+            postgresql_deferrable=True,
+        ),
+    )
+
+
+def mark_read_only(session: AsyncSession):
+    """Разрешает сессии читать из реплики или пула только для чтения."""
+
+    session.info[READ_ONLY_KEY] = True
+
+
+def mark_snapshot(session: AsyncSession):
+    """Переводит сессию в читающую транзакцию с устойчивым снимком."""
+
+    session.info[SNAPSHOT_KEY] = True
+
+
+def pin_to_primary(session: AsyncSession):
+    """Закрепляет сессию за мастером до конца запроса."""
+
+    session.info[PRIMARY_KEY] = True
+
+
+@inject
+async def use_read_only(session: FromDishka[AsyncSession], config: FromDishka[Config]):
+    """Зависимость роутеров, обработчики которых только читают данные."""
+
+    if config.read_only_requests:
+        mark_read_only(session)
+
+
+@inject
+async def use_read_only_snapshot(
+    session: FromDishka[AsyncSession], config: FromDishka[Config]
+):
+    """Зависимость долгих выгрузок, читающих всю таблицу одним снимком."""
+
+    if config.read_only_requests:
+        mark_snapshot(session)
@@ -0,0 +1,79 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable
+
+from dishka import AsyncContainer
+
+from application.posts.dtos import ArchiveMonth
+from application.posts.gateways import ArchiveGateway
+from application.posts.repositories import PostsRepository
+
+from ..background_tasks import background_task_runner
+from ..config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class CachedArchiveGateway(ArchiveGateway):
+    """
+    Гистограмма постов по месяцам в памяти процесса. Считается по таблице
+    один раз, дальше ее сдвигают закоммиченные записи сервиса постов;
+    изменения других процессов, импорта и архивирования секций подхватывает
+    периодическая пересборка
+    """
+
+    def __init__(self):
+        self._counts: dict[tuple[int, int], int] | None = None
+        # растет на каждом коммите записи: пересчет, во время которого что-то
+        # закоммитили, мог этого не увидеть и не сохраняется
+        self._generation = 0
+
+    def read(self) -> list[ArchiveMonth] | None:
+        if self._counts is None:
+            return None
+        return [
+            ArchiveMonth(year=year, month=month, post_count=count)
+            for (year, month), count in sorted(self._counts.items(), reverse=True)
+            if count > 0
+        ]
+
+    async def rebuild(
+        self, months: Awaitable[list[ArchiveMonth]]
+    ) -> list[ArchiveMonth]:
+        generation = self._generation
+        months = await months
+        if generation == self._generation:
+            self._counts = {(item.year, item.month): item.post_count for item in months}
+        return months
+
+    def add(self, created_at: datetime, delta: int):
+        self._generation += 1
+        if self._counts is None:
+            return
+        created_at = created_at.astimezone(timezone.utc)
+        key = created_at.year, created_at.month
+        self._counts[key] = self._counts.get(key, 0) + delta
+
+    def invalidate(self):
+        self._generation += 1
+        self._counts = None
+
+
+@background_task_runner(timedelta(seconds=get_config().archive_rebuild_interval))
+async def rebuild_archive(container: AsyncContainer):
+    """Периодически пересчитывает гистограмму постов по месяцам."""
+
+    archive = await container.get(ArchiveGateway)
+    try:
+        async with container() as nested:
+            repository = await nested.get(PostsRepository)
+            await archive.rebuild(repository.count_months())
+    except Exception as exc:  # noqa
+        # до следующей попытки архив отвечает из прежней гистограммы
+        logger.warning("Failed to rebuild posts archive: %r", exc)
+
+
+__all__ = [
+    "CachedArchiveGateway",
+    "rebuild_archive",
+]
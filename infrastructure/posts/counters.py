@@ -0,0 +1,34 @@
+import logging
+from datetime import timedelta
+
+from dishka import AsyncContainer
+
+from application.posts.repositories import CategoriesRepository
+
+from ..background_tasks import background_task_runner
+from ..config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+@background_task_runner(timedelta(seconds=get_config().post_counts_repair_interval))
+async def repair_post_counts(container: AsyncContainer):
+    """
+    Периодически сверяет счетчики постов категорий с таблицей постов.
+
+    Счетчики поддерживаются в транзакциях записи постов, сверка ловит
+    то, что прошло мимо сервиса: ручные правки в базе и старые данные.
+    """
+
+    try:
+        async with container() as nested:
+            repository = await nested.get(CategoriesRepository)
+            if repaired := await repository.repair_post_counts():
+                logger.warning("Repaired post counts of categories %s", repaired)
+    except Exception as exc:  # noqa
+        logger.warning("Failed to repair post counts: %r", exc)
+
+
+__all__ = [
+    "repair_post_counts",
+]
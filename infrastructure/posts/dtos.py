@@ -1,4 +1,11 @@
+from pydantic import BaseModel, Field
+
+from infrastructure.fields import SparseFieldsModel
 from infrastructure.models import CamelModel
+from infrastructure.pagination import MAX_PAGE_LIMIT, PaginationModel
+
+from .models import TRENDING_DEPTH
+from .suggestions import MAX_PREFIX_LENGTH
 
 
 class CreateCategoryDto(CamelModel):
@@ -6,20 +13,25 @@ class CreateCategoryDto(CamelModel):
     description: str
 
 
-class ReadAllCategoriesDto(CamelModel):
-    page: int
-    page_size: int
-
-
 class UpdateCategoryDto(CamelModel):
     title: str
     description: str
 
 
+class PatchCategoryDto(CamelModel):
+    title: str | None = None
+    description: str | None = None
+
+
 class CategoryModel(CamelModel):
     id: int
     title: str
     description: str
+    post_count: int
+
+
+class ReadAllCategoriesDto(PaginationModel, SparseFieldsModel):
+    fields_model = CategoryModel
 
 
 class CreatePostDto(CamelModel):
@@ -28,25 +40,85 @@ class CreatePostDto(CamelModel):
     category_id: int
 
 
-class ReadAllPostsDto(CamelModel):
-    page: int
-    page_size: int
-
-
 class UpdatePostDto(CamelModel):
     body: str
     title: str
     category_id: int
 
 
+class PatchPostDto(CamelModel):
+    body: str | None = None
+    title: str | None = None
+    category_id: int | None = None
+
+
+class MovePostsDto(CamelModel):
+    target_category_id: int
+
+
 class PostModel(CamelModel):
     id: int
-    body: str
     title: str
+    excerpt: str
+    reading_time: int
+    # только по запросу через ?fields=body
+    body: str | None = None
+
+
+class ReadAllPostsDto(PaginationModel, SparseFieldsModel):
+    fields_model = PostModel
+
+
+class SearchPostsDto(BaseModel):
+    """Параметры поиска из query-строки, синтаксис запроса как у websearch_to_tsquery"""
+
+    q: str = Field(min_length=1, max_length=256)
+    limit: int = Field(default=20, ge=1, le=MAX_PAGE_LIMIT)
+    cursor: str | None = None
+
+
+class PostSearchHitModel(CamelModel):
+    id: int
+    title: str
+    reading_time: int
+    snippet: str
+    rank: float
+
+
+class SuggestPostsDto(BaseModel):
+    q: str = Field(min_length=1, max_length=MAX_PREFIX_LENGTH)
+    limit: int = Field(default=10, ge=1, le=20)
+
+
+class PostSuggestionModel(CamelModel):
+    id: int
+    title: str
+
+
+class ArchiveMonthModel(CamelModel):
+    year: int
+    month: int
+    post_count: int
+
+
+class ReadTrendingPostsDto(BaseModel):
+    # представление хранит не больше TRENDING_DEPTH постов на категорию
+    limit: int = Field(default=10, ge=1, le=TRENDING_DEPTH)
+
+
+class TrendingPostModel(CamelModel):
+    id: int
+    category_id: int
+    title: str
+    excerpt: str
+    reading_time: int
+    views: int
 
 
 class PostModelDetail(CamelModel):
     id: int
     body: str
     title: str
+    reading_time: int
+    views: int
     category: CategoryModel
@@ -0,0 +1,66 @@
+from sqlalchemy import Select, Table, exists, func, insert, select, update
+
+from application.posts.exceptions import CategoryNotFoundError
+from application.posts.services import with_excerpt
+
+from ..imports.targets import ImportTarget
+from . import dtos, mappers
+from .models import CategoryDatabaseModel, PostDatabaseModel
+
+
+class CategoriesImportTarget(ImportTarget):
+    model = CategoryDatabaseModel
+    validation_model = dtos.CreateCategoryDto
+    columns = ("title", "description")
+
+    def to_model(self, validated: dtos.CreateCategoryDto) -> CategoryDatabaseModel:
+        return mappers.category__create_mapper(
+            mappers.category__create_dto_mapper(validated)
+        )
+
+
+class PostsImportTarget(ImportTarget):
+    model = PostDatabaseModel
+    validation_model = dtos.CreatePostDto
+    columns = ("body", "title", "category_id", "excerpt", "reading_time")
+    conflict_exception = CategoryNotFoundError
+
+    def to_model(self, validated: dtos.CreatePostDto) -> PostDatabaseModel:
+        return mappers.post__create_mapper(
+            with_excerpt(mappers.post__create_dto_mapper(validated))
+        )
+
+    def get_merge_query(self, staging: Table) -> Select:
+        """
+        Посты с несуществующей категорией не вставляются и уходят в отчет.
+        Счетчики постов категорий сдвигаются в том же запросе
+        """
+
+        posts, categories = self.model.__table__, CategoryDatabaseModel.__table__
+        category_exists = categories.columns.id == staging.columns.category_id
+
+        inserted = (
+            insert(posts)
+            .from_select(
+                self.columns,
+                self._get_insert_select(staging).join(categories, category_exists),
+            )
+            .returning(posts.columns.category_id)
+            .cte("inserted")
+        )
+        added = (
+            select(inserted.c.category_id, func.count().label("post_count"))
+            .group_by(inserted.c.category_id)
+            .subquery("added")
+        )
+        counted = (
+            update(categories)
+            .where(categories.columns.id == added.c.category_id)
+            .values(post_count=categories.columns.post_count + added.c.post_count)
+            .cte("counted")
+        )
+        return (
+            select(staging.columns.row_number)
+            .where(~exists().where(category_exists))
+            .add_cte(inserted, counted)
+        )
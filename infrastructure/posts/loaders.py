@@ -0,0 +1,59 @@
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.posts.exceptions import CategoryNotFoundError
+from domain.posts.entities import Category, Post
+
+from . import mappers
+from .models import CategoryDatabaseModel
+
+
+class CategoryLoader:
+    """
+    Загрузчик категорий на время запроса.
+
+    Собирает идентификаторы категорий со всей выборки постов и догружает
+    недостающие одним запросом с IN; уже загруженные в этом запросе
+    категории берет из кеша, не обращаясь к базе.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._cache: dict[int, Category] = {}
+
+    async def load_many(self, category_ids: Iterable[int]) -> dict[int, Category]:
+        category_ids = set(category_ids)
+        if missing := category_ids - self._cache.keys():
+            models = await self._session.scalars(
+                select(CategoryDatabaseModel).where(
+                    CategoryDatabaseModel.id.in_(sorted(missing))
+                )
+            )
+            for model in models:
+                self._cache[model.id] = mappers.category__map_from_db(model)
+
+        return {
+            category_id: self._cache[category_id]
+            for category_id in category_ids
+            if category_id in self._cache
+        }
+
+    async def load(self, category_id: int) -> Category:
+        if category := (await self.load_many([category_id])).get(category_id):
+            return category
+        raise CategoryNotFoundError()
+
+    async def attach(self, posts: list[Post]) -> list[Post]:
+        """Заполняет category у постов одним запросом на всю пачку."""
+
+        categories = await self.load_many(post.category_id for post in posts)
+        for post in posts:
+            post.category = categories.get(post.category_id)
+        return posts
+
+
+__all__ = [
+    "CategoryLoader",
+]
@@ -1,9 +1,15 @@
 from adaptix import P
-from adaptix.conversion import allow_unlinked_optional, coercer, link_function
+from adaptix.conversion import (
+    allow_unlinked_optional,
+    link_constant,
+    link_function,
+)
 
 from application.posts import dtos
 from domain.posts.entities import Category, Post
+from infrastructure.fields import parse_fields
 from infrastructure.mappers import postgres_retort, pydantic_retort
+from infrastructure.pagination import decode_cursor, decode_rank_cursor
 
 from . import dtos as models
 from .models import CategoryDatabaseModel, PostDatabaseModel
@@ -26,12 +32,28 @@ category__create_mapper = pgsql_retort.get_converter(
         allow_unlinked_optional(P[CategoryDatabaseModel].id),
         allow_unlinked_optional(P[CategoryDatabaseModel].created_at),
         allow_unlinked_optional(P[CategoryDatabaseModel].updated_at),
+        allow_unlinked_optional(P[CategoryDatabaseModel].version),
+        allow_unlinked_optional(P[CategoryDatabaseModel].post_count),
     ],
 )
 category__map_to_pydantic = py_retort.get_converter(
     Category,
     models.CategoryModel,
 )
+category__map_read_all_dto = py_retort.get_converter(
+    models.ReadAllCategoriesDto,
+    dtos.ReadAllCategoriesDto,
+    recipe=[
+        link_function(
+            lambda dto: decode_cursor(dto.cursor),
+            P[dtos.ReadAllCategoriesDto].cursor,
+        ),
+        link_function(
+            lambda dto: parse_fields(dto.fields, models.CategoryModel),
+            P[dtos.ReadAllCategoriesDto].fields,
+        ),
+    ],
+)
 
 
 @py_retort.impl_converter(
@@ -47,35 +69,42 @@ def category__map_update_dto(
 ) -> dtos.UpdateCategoryDto: ...
 
 
+@py_retort.impl_converter(
+    recipe=[
+        link_function(
+            lambda dto, category_id, version: category_id,
+            P[dtos.PatchCategoryDto].id,
+        ),
+        link_function(
+            lambda dto, category_id, version: version,
+            P[dtos.PatchCategoryDto].version,
+        ),
+    ]
+)
+def category__map_patch_dto(
+    dto: models.PatchCategoryDto, category_id: int, version: int | None
+) -> dtos.PatchCategoryDto: ...
+
+
 post__map_from_db = pgsql_retort.get_converter(
     PostDatabaseModel,
     Post,
-    recipe=[
-        coercer(
-            CategoryDatabaseModel,
-            Category,
-            category__map_from_db,
-        ),
-    ],
+    recipe=[allow_unlinked_optional(P[Post].category)],
 )
+# search_vector вычисляет база
 post__map_to_db = pgsql_retort.get_converter(
     Post,
     PostDatabaseModel,
+    recipe=[allow_unlinked_optional(P[PostDatabaseModel].search_vector)],
+)
+post__create_dto_mapper = py_retort.get_converter(
+    models.CreatePostDto,
+    dtos.CreatePostDto,
     recipe=[
-        link_function(
-            lambda post: post.category_id,
-            P[PostDatabaseModel].category_id,
-        ),
-        coercer(
-            Category,
-            CategoryDatabaseModel,
-            category__map_to_db,
-        ),
+        allow_unlinked_optional(P[dtos.CreatePostDto].excerpt),
+        allow_unlinked_optional(P[dtos.CreatePostDto].reading_time),
     ],
 )
-post__create_dto_mapper = pgsql_retort.get_converter(
-    dtos.CreatePostDto, models.CreatePostDto
-)
 post__create_mapper = pgsql_retort.get_converter(
     dtos.CreatePostDto,
     PostDatabaseModel,
@@ -83,14 +112,60 @@ post__create_mapper = pgsql_retort.get_converter(
         allow_unlinked_optional(P[PostDatabaseModel].id),
         allow_unlinked_optional(P[PostDatabaseModel].created_at),
         allow_unlinked_optional(P[PostDatabaseModel].updated_at),
-        allow_unlinked_optional(P[PostDatabaseModel].category),
+        allow_unlinked_optional(P[PostDatabaseModel].version),
+        allow_unlinked_optional(P[PostDatabaseModel].views),
+        allow_unlinked_optional(P[PostDatabaseModel].search_vector),
+    ],
+)
+# в списках тело поста не отдается, вместо него excerpt
+post__map_to_pydantic = py_retort.get_converter(
+    Post, models.PostModel, recipe=[link_constant(P[models.PostModel].body, value=None)]
+)
+post__map_read_all_dto = py_retort.get_converter(
+    models.ReadAllPostsDto,
+    dtos.ReadAllPostsDto,
+    recipe=[
+        link_function(
+            lambda dto: decode_cursor(dto.cursor), P[dtos.ReadAllPostsDto].cursor
+        ),
+        link_function(
+            lambda dto: parse_fields(dto.fields, models.PostModel),
+            P[dtos.ReadAllPostsDto].fields,
+        ),
     ],
 )
-post__map_to_pydantic = py_retort.get_converter(Post, models.PostModel)
+post__map_search_dto = py_retort.get_converter(
+    models.SearchPostsDto,
+    dtos.SearchPostsDto,
+    recipe=[
+        link_function(lambda dto: dto.q, P[dtos.SearchPostsDto].query),
+        link_function(
+            lambda dto: decode_rank_cursor(dto.cursor), P[dtos.SearchPostsDto].cursor
+        ),
+    ],
+)
+post__map_search_hit = py_retort.get_converter(
+    dtos.PostSearchHit, models.PostSearchHitModel
+)
+post__map_suggestion = py_retort.get_converter(
+    dtos.TitleSuggestion, models.PostSuggestionModel
+)
+post__map_trending = py_retort.get_converter(
+    dtos.TrendingPost, models.TrendingPostModel
+)
+post__map_archive_month = py_retort.get_converter(
+    dtos.ArchiveMonth, models.ArchiveMonthModel
+)
+# категорию в Post для детальных ответов заполняет CategoryLoader
 post__map_to_pydantic_detail = py_retort.get_converter(
     Post,
     models.PostModelDetail,
-    recipe=[coercer(Category, models.CategoryModel, category__map_to_pydantic)],
+    recipe=[
+        link_function(
+            lambda post: category__map_to_pydantic(post.category),
+            P[models.PostModelDetail].category,
+        )
+    ],
 )
 
 
@@ -99,9 +174,43 @@ post__map_to_pydantic_detail = py_retort.get_converter(
         link_function(
             lambda dto, post_id: post_id,
             P[dtos.UpdatePostDto].id,
-        )
+        ),
+        allow_unlinked_optional(P[dtos.UpdatePostDto].excerpt),
+        allow_unlinked_optional(P[dtos.UpdatePostDto].reading_time),
     ]
 )
 def post__map_update_dto(
     dto: models.UpdatePostDto, post_id: int
 ) -> dtos.UpdatePostDto: ...
+
+
+@py_retort.impl_converter(
+    recipe=[
+        link_function(
+            lambda dto, post_id, version: post_id,
+            P[dtos.PatchPostDto].id,
+        ),
+        link_function(
+            lambda dto, post_id, version: version,
+            P[dtos.PatchPostDto].version,
+        ),
+        allow_unlinked_optional(P[dtos.PatchPostDto].excerpt),
+        allow_unlinked_optional(P[dtos.PatchPostDto].reading_time),
+    ]
+)
+def post__map_patch_dto(
+    dto: models.PatchPostDto, post_id: int, version: int | None
+) -> dtos.PatchPostDto: ...
+
+
+@py_retort.impl_converter(
+    recipe=[
+        link_function(
+            lambda dto, category_id: category_id,
+            P[dtos.MovePostsDto].category_id,
+        ),
+    ]
+)
+def post__map_move_dto(
+    dto: models.MovePostsDto, category_id: int
+) -> dtos.MovePostsDto: ...
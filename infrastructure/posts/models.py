@@ -1,10 +1,32 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from sqlalchemy import DateTime, ForeignKey, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Computed,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    PrimaryKeyConstraint,
+    Table,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
 
 from infrastructure.postgres import Base
 
+# конфигурация словаря полнотекстового поиска: посты пишутся по-русски
+SEARCH_CONFIG = "russian"
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', body), 'B')"
+)
+
 
 class CategoryDatabaseModel(Base):
     """
@@ -12,10 +34,16 @@ class CategoryDatabaseModel(Base):
     """
 
     __tablename__ = "categories"
+    __table_args__ = (Index("ix_categories_created_at_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column()
     description: Mapped[str] = mapped_column()
+    # растет на каждом UPDATE, отдается клиентам как ETag
+    version: Mapped[int] = mapped_column(server_default="1")
+    # денормализованное число постов: поддерживается в транзакциях записи
+    # постов, расхождения исправляет фоновая задача repair_post_counts
+    post_count: Mapped[int] = mapped_column(server_default="0")
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -31,10 +59,36 @@ class PostDatabaseModel(Base):
     """
 
     __tablename__ = "posts"
+    __table_args__ = (
+        # ключ партиционированной таблицы обязан включать ключ партиционирования
+        PrimaryKeyConstraint("id", "created_at"),
+        # ключ keyset-пагинации списков
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        # выборка постов категории сразу в порядке пагинации
+        Index("ix_posts_category_id_created_at_id", "category_id", "created_at", "id"),
+        # полнотекстовый поиск: GIN-индекс отдает только совпавшие строки
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin"),
+        # помесячные секции, их заводит и архивирует posts/partitions.py
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(autoincrement=True)
     body: Mapped[str] = mapped_column()
     title: Mapped[str] = mapped_column()
+    # считаются из body при записи, чтобы списки не читали тяжелое тело поста
+    excerpt: Mapped[str] = mapped_column(server_default="")
+    reading_time: Mapped[int] = mapped_column(server_default="0")
+    # копится в памяти процесса и сбрасывается пачками, см. posts/views.py
+    views: Mapped[int] = mapped_column(BigInteger, server_default="0")
+    # растет на каждом UPDATE, отдается клиентам как ETag
+    version: Mapped[int] = mapped_column(server_default="1")
+    # поддерживается самой базой, заголовок весит больше тела;
+    # deferred: select(PostDatabaseModel) не тянет вектор в сущности
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
+    )
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -43,5 +97,60 @@ class PostDatabaseModel(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    # категорию догружает CategoryLoader, запросы постов читают одну таблицу
     category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"))
-    category: Mapped[CategoryDatabaseModel] = relationship(lazy="joined", viewonly=True)
+
+    # уникальность id по всем секциям держит post_ids, сущности ищутся по нему
+    __mapper_args__ = {"primary_key": [id]}
+
+
+class PostIdDatabaseModel(Base):
+    """
+    Дата создания каждого поста по его id. Ключ секционированной таблицы
+    включает created_at и уникальность одного id не гарантирует, а запрос
+    по id без даты обходит все секции. Первичный ключ здесь держит id
+    уникальным глобально, а по найденной дате запросы постов отсекают
+    лишние секции. Строки пишет триггер на posts; посты отсоединенных в
+    архив секций остаются здесь, и их id не переиспользуются.
+    """
+
+    __tablename__ = "post_ids"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class PostDailyViewsDatabaseModel(Base):
+    """
+    Просмотры поста за сутки. Пишутся вместе с posts.views при сбросе
+    буфера просмотров и служат источником для trending_posts; строки
+    старше окна популярности удаляет фоновая задача обновления.
+    """
+
+    __tablename__ = "post_daily_views"
+
+    # без внешнего ключа: удаление поста не ждет чистки его статистики
+    post_id: Mapped[int] = mapped_column(primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    views: Mapped[int] = mapped_column(BigInteger, server_default="0")
+
+
+# окно популярности и число лучших постов каждой категории; совпадают
+# с определением материализованного представления в миграции b7d2e9f4a1c8
+TRENDING_WINDOW_DAYS = 7
+TRENDING_DEPTH = 50
+
+# материализованное представление лучших постов каждой категории по
+# просмотрам за окно. Описано отдельной MetaData: его создает миграция,
+# а alembic не должен принимать его за таблицу
+TRENDING_POSTS = Table(
+    "trending_posts",
+    MetaData(),
+    Column("post_id", Integer, primary_key=True),
+    Column("category_id", Integer),
+    Column("title", Text),
+    Column("excerpt", Text),
+    Column("reading_time", Integer),
+    Column("views", BigInteger),
+    Column("position", BigInteger),
+)
@@ -0,0 +1,160 @@
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+
+from dishka import AsyncContainer
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from application.posts.repositories import CategoriesRepository
+
+from ..background_tasks import background_task_runner
+from ..config import Config, get_config
+from .models import PostDatabaseModel
+
+logger = logging.getLogger(__name__)
+
+POSTS_TABLE = PostDatabaseModel.__tablename__
+# отсоединенные секции переезжают сюда и больше не видны приложению
+ARCHIVE_SCHEMA = "archive"
+
+PARTITION_NAME = re.compile(rf"^{POSTS_TABLE}_(\d{{4}})_(\d{{2}})$")
+
+PARTITIONS_QUERY = text(
+    """
+    SELECT child.relname, inherits.inhdetachpending
+    FROM pg_inherits AS inherits
+    JOIN pg_class AS child ON child.oid = inherits.inhrelid
+    WHERE inherits.inhparent = to_regclass(:table)
+    """
+).bindparams(table=POSTS_TABLE)
+
+
+def add_months(month: date, months: int) -> date:
+    month_index = month.year * 12 + month.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{POSTS_TABLE}_{month:%Y_%m}"
+
+
+class PostsPartitions:
+    """
+    Помесячные секции таблицы постов.
+
+    Секции заводятся на несколько месяцев вперед, чтобы вставка никогда
+    не упиралась в отсутствующий диапазон. Старые секции по желанию
+    отсоединяются в схему archive: их строки перестают участвовать в
+    запросах, очистке и индексах основной таблицы.
+    """
+
+    def __init__(self, engine: AsyncEngine, config: Config):
+        self._engine = engine
+        self._lock_timeout = config.postgres_lock_timeout
+
+    async def read_all(self) -> dict[date, bool]:
+        """Секции по месяцам: True у секции, чье отсоединение не завершилось."""
+
+        async with self._engine.connect() as connection:
+            result = await connection.execute(PARTITIONS_QUERY)
+        partitions = {}
+        for name, detach_pending in result:
+            if match := PARTITION_NAME.match(name):
+                year, month = map(int, match.groups())
+                partitions[date(year, month, 1)] = detach_pending
+        return partitions
+
+    async def create(self, month: date):
+        upper = add_months(month, 1)
+        async with self._engine.begin() as connection:
+            # создание секции берет эксклюзивную блокировку posts: лучше
+            # повторить попытку позже, чем выстроить за ней очередь запросов
+            await connection.execute(
+                text("SELECT set_config('lock_timeout', :timeout, true)"),
+                {"timeout": f"{int(self._lock_timeout * 1000)}ms"},
+            )
+            await connection.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(month)}"
+                    f" PARTITION OF {POSTS_TABLE}"
+                    f" FOR VALUES FROM ('{month} 00:00:00+00')"
+                    f" TO ('{upper} 00:00:00+00')"
+                )
+            )
+
+    async def create_upcoming(self, today: date, ahead: int) -> list[date]:
+        """Заводит недостающие секции с текущего месяца на ahead месяцев вперед."""
+
+        existing = await self.read_all()
+        current = today.replace(day=1)
+        created = []
+        for offset in range(ahead + 1):
+            if (month := add_months(current, offset)) not in existing:
+                await self.create(month)
+                created.append(month)
+        return created
+
+    async def archive(self, before: date) -> list[date]:
+        """Отсоединяет в схему archive секции месяцев раньше before."""
+
+        archived = []
+        for month, detach_pending in sorted((await self.read_all()).items()):
+            if month >= before:
+                continue
+            name = partition_name(month)
+            # DETACH ... CONCURRENTLY не работает внутри транзакции
+            async with self._engine.connect() as connection:
+                connection = await connection.execution_options(
+                    isolation_level="AUTOCOMMIT"
+                )
+                # прерванное отсоединение остается в базе, его нужно довести
+                mode = "FINALIZE" if detach_pending else "CONCURRENTLY"
+                await connection.execute(
+                    text(f"ALTER TABLE {POSTS_TABLE} DETACH PARTITION {name} {mode}")
+                )
+                await connection.execute(
+                    text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}")
+                )
+                await connection.execute(
+                    text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}")
+                )
+            archived.append(month)
+        return archived
+
+
+@background_task_runner(timedelta(seconds=get_config().posts_partitions_interval))
+async def maintain_posts_partitions(container: AsyncContainer):
+    """
+    Периодически заводит будущие секции постов и, если задан
+    posts_archive_after_months, отсоединяет в архив старые.
+    """
+
+    config = await container.get(Config)
+    partitions = PostsPartitions(await container.get(AsyncEngine), config)
+    try:
+        # границы секций заданы в UTC
+        today = datetime.now(timezone.utc).date()
+        if created := await partitions.create_upcoming(
+            today, config.posts_partitions_ahead
+        ):
+            logger.info("Created posts partitions for %s", created)
+        if config.posts_archive_after_months is None:
+            return
+        before = add_months(today.replace(day=1), -config.posts_archive_after_months)
+        if archived := await partitions.archive(before):
+            logger.info("Archived posts partitions for %s", archived)
+            # посты архива больше не считаются в категориях
+            async with container() as nested:
+                repository = await nested.get(CategoriesRepository)
+                await repository.repair_post_counts()
+    except Exception as exc:  # noqa
+        logger.warning("Failed to maintain posts partitions: %r", exc)
+
+
+__all__ = [
+    "PostsPartitions",
+    "add_months",
+    "maintain_posts_partitions",
+    "partition_name",
+]
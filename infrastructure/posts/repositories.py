@@ -1,21 +1,70 @@
-from sqlalchemy import Select, select
-from sqlalchemy.orm import selectinload
-from sqlalchemy.orm.interfaces import LoaderOption
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
 
+from sqlalchemy import (
+    BigInteger,
+    Delete,
+    Integer,
+    ScalarSelect,
+    Select,
+    Update,
+    column,
+    delete,
+    func,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.pagination import Page, RankCursor
 from application.posts import dtos
 from application.posts.exceptions import (
     CategoryAlreadyExistsError,
     CategoryNotFoundError,
+    CategoryVersionConflictError,
     PostAlreadyExistsError,
     PostNotFoundError,
+    PostVersionConflictError,
 )
 from application.posts.repositories import CategoriesRepository, PostsRepository
 from domain.posts import entities
 
+from ..config import Config
+from ..postgres import pin_to_primary
 from ..repositories.config import CRUDRepositoryConfig, ReadAllDto
 from ..repositories.repositories import CRUDDatabaseRepository
 from . import mappers
-from .models import CategoryDatabaseModel, PostDatabaseModel
+from .loaders import CategoryLoader
+from .models import (
+    SEARCH_CONFIG,
+    TRENDING_POSTS,
+    TRENDING_WINDOW_DAYS,
+    CategoryDatabaseModel,
+    PostDailyViewsDatabaseModel,
+    PostDatabaseModel,
+    PostIdDatabaseModel,
+)
+
+
+def escape_like(value: str) -> str:
+    """Экранирует спецсимволы LIKE, чтобы ввод искался буквально."""
+
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# словарь вписан в текст запроса константой, а не параметром
+SEARCH_REGCONFIG = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+# до трех фрагментов по 10-30 слов, совпадения оборачиваются в <mark>
+SEARCH_HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxFragments=3, MinWords=10, MaxWords=30"
+)
 
 
 class PostsDatabaseRepository(
@@ -42,25 +91,320 @@ class PostsDatabaseRepository(
                 model_mapper=mappers.post__map_to_db,
                 not_found_exception=PostNotFoundError,
                 already_exists_exception=PostAlreadyExistsError,
+                # просмотры пишет только сброс буфера просмотров
+                readonly_columns=("id", "created_at", "updated_at", "views"),
+                list_columns=("id", "title", "excerpt", "reading_time"),
+                version_column="version",
+                version_conflict_exception=PostVersionConflictError,
             )
 
-        def get_options(self) -> list[LoaderOption]:
-            return [selectinload(self.model.category)]
-
         def get_select_all_by_category_query(self, category_id: int) -> Select:
+            return select(self.model).where(self.model.category_id == category_id)
+
+        def get_suggest_query(self, prefix: str, limit: int) -> Select:
+            """
+            Заголовки со словом, начинающимся с prefix. Оба ILIKE
+            обслуживает триграммный GIN-индекс по title
+            """
+
+            pattern = escape_like(prefix)
+            at_start = self.model.title.ilike(f"{pattern}%", escape="\\")
             return (
-                select(self.model)
-                .order_by(self.model.id)
-                .where(self.model.category_id == category_id)
+                select(self.model.id, self.model.title)
+                .where(at_start | self.model.title.ilike(f"% {pattern}%", escape="\\"))
+                .order_by(at_start.desc(), func.length(self.model.title), self.model.id)
+                .limit(limit)
+            )
+
+        def get_category_id_query(self, post_id: int) -> Select:
+            return self._add_where_id(
+                select(self.model.category_id), post_id
+            ).with_for_update()
+
+        def get_created_at_query(self, post_id: int) -> ScalarSelect:
+            return (
+                select(PostIdDatabaseModel.created_at)
+                .where(PostIdDatabaseModel.id == post_id)
+                .scalar_subquery()
+            )
+
+        def _add_where_id(
+            self, statement: Select | Update | Delete, model_id: int
+        ) -> Select | Update | Delete:
+            # по одному id секцию не выбрать: дату создания поста берет
+            # подзапрос к post_ids, и лишние секции отсекаются при выполнении
+            return (
+                super()
+                ._add_where_id(statement, model_id)
+                .where(self.model.created_at == self.get_created_at_query(model_id))
+            )
+
+        def get_titles_query(self) -> Select:
+            return select(self.model.id, self.model.title)
+
+        def get_select_by_month_query(self, year: int, month: int) -> Select:
+            return select(self.model).where(*self._get_month_range(year, month))
+
+        def get_by_month_projection_query(
+            self, year: int, month: int, fields: tuple[str, ...] | None
+        ) -> Select:
+            return self.get_projection_query(self.get_projection_columns(fields)).where(
+                *self._get_month_range(year, month)
+            )
+
+        def get_count_months_query(self) -> Select:
+            """Число постов по месяцам UTC, от новых к старым"""
+
+            created_at = func.timezone("UTC", self.model.created_at)
+            year = func.extract("year", created_at).cast(Integer).label("year")
+            month = func.extract("month", created_at).cast(Integer).label("month")
+            return (
+                select(year, month, func.count().label("post_count"))
+                .group_by(year, month)
+                .order_by(year.desc(), month.desc())
+            )
+
+        def _get_month_range(self, year: int, month: int) -> tuple:
+            """
+            Полуинтервал месяца по UTC: по нему отсекаются секции таблицы,
+            а внутри секции диапазон читает индекс (created_at, id) сразу в
+            порядке пагинации
+            """
+
+            start = datetime(year, month, 1, tzinfo=timezone.utc)
+            end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+            return self.model.created_at >= start, self.model.created_at < end
+
+        def get_daily_views_query(self, deltas: dict[int, int]) -> Insert:
+            """Прибавляет приращения к просмотрам постов за сегодня."""
+
+            daily = PostDailyViewsDatabaseModel
+            changes = values(
+                column("post_id", Integer), column("views", BigInteger), name="changes"
+            ).data(sorted(deltas.items()))
+            statement = insert(daily).from_select(
+                ["post_id", "day", "views"],
+                select(changes.c.post_id, func.current_date(), changes.c.views),
+            )
+            return statement.on_conflict_do_update(
+                index_elements=[daily.post_id, daily.day],
+                set_={"views": daily.views + statement.excluded.views},
+            )
+
+        def get_prune_daily_views_query(self) -> Delete:
+            """Удаляет суточные просмотры, вышедшие из окна популярности."""
+
+            daily = PostDailyViewsDatabaseModel
+            return delete(daily).where(
+                daily.day <= func.current_date() - TRENDING_WINDOW_DAYS
+            )
+
+        def get_trending_query(self, limit: int, category_id: int | None) -> Select:
+            """Читает только trending_posts: глобальный топ или топ категории."""
+
+            trending = TRENDING_POSTS.c
+            query = select(
+                trending.post_id.label("id"),
+                trending.category_id,
+                trending.title,
+                trending.excerpt,
+                trending.reading_time,
+                trending.views,
+            )
+            if category_id is not None:
+                return (
+                    query.where(trending.category_id == category_id)
+                    .order_by(trending.position)
+                    .limit(limit)
+                )
+            return query.order_by(trending.views.desc(), trending.post_id.desc()).limit(
+                limit
+            )
+
+        def get_search_query(self, dto: dtos.SearchPostsDto) -> Select:
+            """
+            Совпадения ищутся по GIN-индексу и ранжируются, а ts_headline,
+            которому нужно тело поста, считается только для строк страницы
+            """
+
+            query = func.websearch_to_tsquery(SEARCH_REGCONFIG, dto.query)
+            rank = func.ts_rank_cd(self.model.search_vector, query)
+            hits = select(
+                self.model.id,
+                self.model.title,
+                self.model.reading_time,
+                rank.label("rank"),
+            ).where(self.model.search_vector.op("@@")(query))
+            if dto.cursor is not None:
+                hits = hits.where(
+                    tuple_(rank, self.model.id) < tuple_(dto.cursor.rank, dto.cursor.id)
+                )
+            hits = (
+                hits.order_by(rank.desc(), self.model.id.desc())
+                .limit(dto.limit + 1)
+                .subquery()
+            )
+
+            snippet = func.ts_headline(
+                SEARCH_REGCONFIG,
+                # теги разметки не должны попадать во фрагменты
+                func.regexp_replace(self.model.body, "<[^>]+>", " ", "g"),
+                query,
+                SEARCH_HEADLINE_OPTIONS,
+            )
+            return (
+                select(
+                    hits.c.id,
+                    hits.c.title,
+                    hits.c.reading_time,
+                    snippet.label("snippet"),
+                    hits.c.rank,
+                )
+                .join(self.model, self.model.id == hits.c.id)
+                .order_by(hits.c.rank.desc(), hits.c.id.desc())
             )
 
     _config = RepositoryConfig()
 
-    async def read_by_category(self, category_id: int) -> list[entities.Post]:
-        return await self._repository.get_entities_from_query(
+    def __init__(
+        self, session: AsyncSession, config: Config, categories: CategoryLoader
+    ):
+        super().__init__(session, config)
+        self._categories = categories
+
+    async def _attach_relations(
+        self, posts: list[entities.Post]
+    ) -> list[entities.Post]:
+        return await self._categories.attach(posts)
+
+    async def read_by_category(
+        self, category_id: int, dto: dtos.ReadAllPostsDto
+    ) -> Page[entities.Post]:
+        return await self._repository.get_page_from_query(
+            self._config.get_select_all_by_category_query(category_id), dto
+        )
+
+    async def read_by_category_projection(
+        self, category_id: int, dto: dtos.ReadAllPostsDto
+    ) -> Page[dict[str, Any]]:
+        return await self._repository.get_projection_page_from_query(
+            self._config.get_projection_query(
+                self._config.get_projection_columns(dto.fields)
+            ).where(self._config.model.category_id == category_id),
+            dto,
+        )
+
+    async def count_by_category(self, category_id: int) -> int:
+        return await self._repository.count(
             self._config.get_select_all_by_category_query(category_id)
         )
 
+    async def read_by_month_projection(
+        self, year: int, month: int, dto: dtos.ReadAllPostsDto
+    ) -> Page[dict[str, Any]]:
+        return await self._repository.get_projection_page_from_query(
+            self._config.get_by_month_projection_query(year, month, dto.fields), dto
+        )
+
+    async def count_by_month(self, year: int, month: int) -> int:
+        return await self._repository.count(
+            self._config.get_select_by_month_query(year, month)
+        )
+
+    async def count_months(self) -> list[dtos.ArchiveMonth]:
+        # результат запоминается в процессе: отстающая реплика закрепила бы
+        # в нем старые числа до следующей пересборки
+        pin_to_primary(self._repository.session)
+        result = await self._repository.session.execute(
+            self._config.get_count_months_query()
+        )
+        return [dtos.ArchiveMonth(**row._mapping) for row in result]
+
+    async def search(self, dto: dtos.SearchPostsDto) -> Page[dtos.PostSearchHit]:
+        result = await self._repository.session.execute(
+            self._config.get_search_query(dto)
+        )
+        rows = result.all()
+        hits = [dtos.PostSearchHit(**row._mapping) for row in rows[: dto.limit]]
+        if len(rows) <= dto.limit:
+            return Page(items=hits)
+        return Page(
+            items=hits, next_cursor=RankCursor(rank=hits[-1].rank, id=hits[-1].id)
+        )
+
+    async def suggest(self, prefix: str, limit: int) -> list[dtos.TitleSuggestion]:
+        result = await self._repository.session.execute(
+            self._config.get_suggest_query(prefix, limit)
+        )
+        return [dtos.TitleSuggestion(*row) for row in result]
+
+    async def stream_titles(self) -> AsyncIterator[dtos.TitleSuggestion]:
+        """Все заголовки постов серверным курсором, без тел и категорий."""
+
+        result = await self._repository.session.stream(
+            self._config.get_titles_query(),
+            execution_options={"yield_per": self._repository.fetch_size},
+        )
+        async for row in result:
+            yield dtos.TitleSuggestion(*row)
+
+    async def add_views(self, deltas: dict[int, int]):
+        await self._repository.session.execute(
+            self._config.get_increment_query("views", deltas)
+        )
+        await self._repository.session.execute(
+            self._config.get_daily_views_query(deltas)
+        )
+
+    async def read_trending(
+        self, limit: int, category_id: int | None = None
+    ) -> list[dtos.TrendingPost]:
+        result = await self._repository.session.execute(
+            self._config.get_trending_query(limit, category_id)
+        )
+        return [dtos.TrendingPost(**row._mapping) for row in result]
+
+    async def refresh_trending(self):
+        """
+        Пересчитывает trending_posts. CONCURRENTLY не блокирует чтение
+        представления, пока идет пересчет
+        """
+
+        await self._repository.session.execute(
+            self._config.get_prune_daily_views_query()
+        )
+        await self._repository.session.execute(
+            text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {TRENDING_POSTS.name}")
+        )
+
+    async def read_category_id(self, post_id: int) -> int:
+        """Категория поста; строка блокируется до конца транзакции."""
+
+        if (
+            category_id := await self._repository.session.scalar(
+                self._config.get_category_id_query(post_id)
+            )
+        ) is None:
+            raise self._config.not_found_exception()
+        return category_id
+
+    async def delete_by_category(self, category_id: int) -> list[int]:
+        return await self._repository.delete_where(
+            self._config.model.category_id == category_id
+        )
+
+    async def move_to_category(
+        self, category_id: int, target_category_id: int
+    ) -> list[int]:
+        try:
+            return await self._repository.update_where(
+                self._config.model.category_id == category_id,
+                {"category_id": target_category_id},
+            )
+        except IntegrityError:
+            # внешний ключ на categories: целевой категории нет
+            raise CategoryNotFoundError()
+
 
 class CategoriesDatabaseRepository(
     CRUDDatabaseRepository[
@@ -75,13 +419,88 @@ class CategoriesDatabaseRepository(
 ):
     """Репозиторий для работы с категориями в базе данных."""
 
-    _config = CRUDRepositoryConfig(
-        read_all_dto=dtos.ReadAllCategoriesDto,
-        model=CategoryDatabaseModel,
-        entity=entities.Category,
-        create_mapper=mappers.category__create_mapper,
-        entity_mapper=mappers.category__map_from_db,
-        model_mapper=mappers.category__map_to_db,
-        not_found_exception=CategoryNotFoundError,
-        already_exists_exception=CategoryAlreadyExistsError,
-    )
+    class RepositoryConfig(CRUDRepositoryConfig):
+        def __init__(self):
+            super().__init__(
+                read_all_dto=dtos.ReadAllCategoriesDto,
+                model=CategoryDatabaseModel,
+                entity=entities.Category,
+                create_mapper=mappers.category__create_mapper,
+                entity_mapper=mappers.category__map_from_db,
+                model_mapper=mappers.category__map_to_db,
+                not_found_exception=CategoryNotFoundError,
+                already_exists_exception=CategoryAlreadyExistsError,
+                # счетчик меняют только записи постов, не правки категории
+                readonly_columns=("id", "created_at", "updated_at", "post_count"),
+                list_columns=("id", "title", "description", "post_count"),
+                version_column="version",
+                version_conflict_exception=CategoryVersionConflictError,
+            )
+
+        def get_drifted_post_counts_query(self) -> Select:
+            """Категории, чьи счетчики разошлись с таблицей постов"""
+
+            posts = PostDatabaseModel
+            return (
+                select(self.model.id)
+                .outerjoin(posts, posts.category_id == self.model.id)
+                .group_by(self.model.id)
+                .having(func.count(posts.id) != self.model.post_count)
+                .order_by(self.model.id)
+            )
+
+        def get_lock_query(self, category_id: int) -> Select:
+            return (
+                select(self.model.id)
+                .where(self.model.id == category_id)
+                .with_for_update()
+            )
+
+        def get_repair_post_count_query(self, category_id: int) -> Update:
+            """Пересчитывает счетчик категории, если он все еще расходится"""
+
+            posts = PostDatabaseModel
+            actual = (
+                select(func.count())
+                .where(posts.category_id == category_id)
+                .scalar_subquery()
+            )
+            return (
+                update(self.model)
+                .where(self.model.id == category_id, self.model.post_count != actual)
+                .values(post_count=actual)
+                .returning(self.model.id)
+            )
+
+    _config = RepositoryConfig()
+
+    async def adjust_post_counts(self, deltas: dict[int, int]):
+        if deltas := {
+            category_id: delta for category_id, delta in deltas.items() if delta
+        }:
+            await self._repository.session.execute(
+                self._config.get_increment_query("post_count", deltas)
+            )
+
+    async def repair_post_counts(self) -> list[int]:
+        """
+        Исправляет расхождения счетчиков с таблицей постов. Расхождения
+        ищутся без блокировок, затем каждая разошедшаяся категория
+        блокируется по отдельности и пересчитывается уже под блокировкой:
+        запись поста, успевшая сдвинуть счетчик, к этому моменту
+        зафиксирована и видна пересчету, а следующие дождутся его
+        """
+
+        session = self._repository.session
+        drifted = list(
+            await session.scalars(self._config.get_drifted_post_counts_query())
+        )
+        repaired = []
+        for category_id in drifted:
+            await session.execute(self._config.get_lock_query(category_id))
+            # отдельный запрос после блокировки читает свежий снимок
+            if await session.scalar(
+                self._config.get_repair_post_count_query(category_id)
+            ):
+                repaired.append(category_id)
+        return repaired
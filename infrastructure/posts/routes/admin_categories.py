@@ -1,11 +1,12 @@
 from typing import Annotated
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
 
-from application.posts.services import CategoriesService
+from application.posts.services import CategoriesService, PostsService
 from domain.users.entities import User
 from infrastructure.auth.deps import get_user
+from infrastructure.etags import parse_if_match, set_etag
 from infrastructure.posts import dtos, mappers
 
 router = APIRouter(route_class=DishkaRoute)
@@ -22,18 +23,55 @@ async def create_category(
     )
 
 
+@router.post("/bulk", response_model=list[dtos.CategoryModel])
+async def create_categories(
+    batch: list[dtos.CreateCategoryDto],
+    actor: Annotated[User, Depends(get_user)],
+    categories: FromDishka[CategoriesService],
+):
+    return map(
+        mappers.category__map_to_pydantic,
+        await categories.create_many(
+            list(map(mappers.category__create_dto_mapper, batch)), actor
+        ),
+    )
+
+
 @router.put("/{category_id}", response_model=dtos.CategoryModel)
 async def update_category(
     category_id: int,
     dto: dtos.UpdateCategoryDto,
+    response: Response,
     actor: Annotated[User, Depends(get_user)],
     categories: FromDishka[CategoriesService],
 ):
-    return mappers.category__map_to_pydantic(
-        await categories.update(
-            mappers.category__map_update_dto(dto, category_id), actor
-        )
+    category = await categories.update(
+        mappers.category__map_update_dto(dto, category_id), actor
+    )
+    set_etag(response, category.version)
+    return mappers.category__map_to_pydantic(category)
+
+
+@router.patch("/{category_id}", response_model=dtos.CategoryModel)
+async def patch_category(
+    category_id: int,
+    dto: dtos.PatchCategoryDto,
+    response: Response,
+    actor: Annotated[User, Depends(get_user)],
+    categories: FromDishka[CategoriesService],
+    if_match: Annotated[str | None, Header()] = None,
+):
+    """
+    Частично обновляет категорию одним условным UPDATE. If-Match обязателен:
+    412, если категорию успели изменить после того, как клиент получил ее ETag.
+    """
+
+    category = await categories.patch(
+        mappers.category__map_patch_dto(dto, category_id, parse_if_match(if_match)),
+        actor,
     )
+    set_etag(response, category.version)
+    return mappers.category__map_to_pydantic(category)
 
 
 @router.delete("/{category_id}", response_model=dtos.CategoryModel)
@@ -45,3 +83,28 @@ async def delete_category(
     return mappers.category__map_to_pydantic(
         await categories.delete(category_id, actor)
     )
+
+
+@router.post("/{category_id}/posts/move", response_model=list[int])
+async def move_category_posts(
+    category_id: int,
+    dto: dtos.MovePostsDto,
+    actor: Annotated[User, Depends(get_user)],
+    posts: FromDishka[PostsService],
+):
+    """Переносит все посты категории в другую одним UPDATE, возвращает их id."""
+
+    return await posts.move_to_category(
+        mappers.post__map_move_dto(dto, category_id), actor
+    )
+
+
+@router.delete("/{category_id}/posts", response_model=list[int])
+async def delete_category_posts(
+    category_id: int,
+    actor: Annotated[User, Depends(get_user)],
+    posts: FromDishka[PostsService],
+):
+    """Удаляет все посты категории одним DELETE, возвращает их id."""
+
+    return await posts.delete_by_category(category_id, actor)
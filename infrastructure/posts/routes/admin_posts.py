@@ -1,12 +1,18 @@
 from typing import Annotated
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
+from fastapi.responses import StreamingResponse
 
 from application.posts.services import PostsService
 from domain.users.entities import User
 from infrastructure.auth.deps import get_user
+from infrastructure.config import Config
+from infrastructure.deadlines import BULK_TIMEOUT, deadline
+from infrastructure.etags import parse_if_match, set_etag
+from infrastructure.postgres import use_read_only_snapshot
 from infrastructure.posts import dtos, mappers
+from infrastructure.streaming import NDJSON_MEDIA_TYPE, ndjson_response
 
 router = APIRouter(route_class=DishkaRoute)
 
@@ -22,16 +28,73 @@ async def create_post(
     )
 
 
+@router.post("/bulk", response_model=list[dtos.PostModelDetail])
+async def create_posts(
+    batch: list[dtos.CreatePostDto],
+    actor: Annotated[User, Depends(get_user)],
+    posts: FromDishka[PostsService],
+):
+    return map(
+        mappers.post__map_to_pydantic_detail,
+        await posts.create_many(
+            list(map(mappers.post__create_dto_mapper, batch)), actor
+        ),
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+    dependencies=[Depends(use_read_only_snapshot), Depends(deadline(BULK_TIMEOUT))],
+)
+async def export_posts(
+    actor: Annotated[User, Depends(get_user)],
+    posts: FromDishka[PostsService],
+    config: FromDishka[Config],
+):
+    """Выгружает все посты в NDJSON, читая их из базы серверным курсором."""
+
+    return ndjson_response(
+        posts.export(actor),
+        mappers.post__map_to_pydantic_detail,
+        filename="posts.ndjson",
+        batch_size=config.stream_fetch_size,
+    )
+
+
 @router.put("/{post_id}", response_model=dtos.PostModelDetail)
 async def update_post(
     post_id: int,
     dto: dtos.UpdatePostDto,
+    response: Response,
     actor: Annotated[User, Depends(get_user)],
     posts: FromDishka[PostsService],
 ):
-    return mappers.post__map_to_pydantic_detail(
-        await posts.update(mappers.post__map_update_dto(dto, post_id), actor)
+    post = await posts.update(mappers.post__map_update_dto(dto, post_id), actor)
+    set_etag(response, post.version)
+    return mappers.post__map_to_pydantic_detail(post)
+
+
+@router.patch("/{post_id}", response_model=dtos.PostModelDetail)
+async def patch_post(
+    post_id: int,
+    dto: dtos.PatchPostDto,
+    response: Response,
+    actor: Annotated[User, Depends(get_user)],
+    posts: FromDishka[PostsService],
+    if_match: Annotated[str | None, Header()] = None,
+):
+    """
+    Частично обновляет пост одним условным UPDATE. If-Match обязателен:
+    412, если пост успели изменить после того, как клиент получил его ETag.
+    """
+
+    post = await posts.patch(
+        mappers.post__map_patch_dto(dto, post_id, parse_if_match(if_match)), actor
     )
+    set_etag(response, post.version)
+    return mappers.post__map_to_pydantic_detail(post)
 
 
 @router.delete("/{post_id}", response_model=dtos.PostModelDetail)
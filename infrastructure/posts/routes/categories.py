@@ -1,28 +1,88 @@
+from typing import Annotated
+
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter
+from fastapi import APIRouter, Query, Response
 
 from application.posts.services import CategoriesService, PostsService
+from infrastructure.config import Config
+from infrastructure.etags import set_etag
+from infrastructure.pagination import paginate, paginate_rows, set_total_count
 from infrastructure.posts import dtos, mappers
 
 router = APIRouter(route_class=DishkaRoute)
 
 
 @router.get("/", response_model=list[dtos.CategoryModel])
-async def read_all(categories: FromDishka[CategoriesService]):
-    return map(mappers.category__map_to_pydantic, await categories.read_all(None))
+async def read_all(
+    response: Response,
+    dto: Annotated[dtos.ReadAllCategoriesDto, Query()],
+    categories: FromDishka[CategoriesService],
+):
+    if dto.count is not None:
+        set_total_count(response, await categories.count_all(dto.count))
+    if dto.fields:
+        return paginate_rows(
+            response,
+            await categories.read_all_projection(
+                mappers.category__map_read_all_dto(dto)
+            ),
+        )
+    return paginate(
+        response,
+        await categories.read_all(mappers.category__map_read_all_dto(dto)),
+        mappers.category__map_to_pydantic,
+    )
 
 
 @router.get("/{category_id}", response_model=dtos.CategoryModel)
 async def read(
     category_id: int,
+    response: Response,
     categories: FromDishka[CategoriesService],
 ):
-    return mappers.category__map_to_pydantic(await categories.read(category_id))
+    category = await categories.read(category_id)
+    set_etag(response, category.version)
+    return mappers.category__map_to_pydantic(category)
+
+
+@router.get("/{category_id}/trending", response_model=list[dtos.TrendingPostModel])
+async def read_category_trending(
+    category_id: int,
+    dto: Annotated[dtos.ReadTrendingPostsDto, Query()],
+    posts: FromDishka[PostsService],
+):
+    """Самые просматриваемые посты категории за неделю."""
+
+    return map(
+        mappers.post__map_trending,
+        await posts.read_trending_by_category(category_id, dto.limit),
+    )
 
 
-@router.get("/{category_id}/posts", response_model=list[dtos.PostModel])
+@router.get(
+    "/{category_id}/posts",
+    response_model=list[dtos.PostModel],
+    response_model_exclude_none=True,
+)
 async def read_category_posts(
     category_id: int,
+    response: Response,
+    dto: Annotated[dtos.ReadAllPostsDto, Query()],
     posts: FromDishka[PostsService],
+    config: FromDishka[Config],
 ):
-    return map(mappers.post__map_to_pydantic, await posts.read_by_category(category_id))
+    if dto.count is not None:
+        # выборка отфильтрована, оценка по таблице тут неприменима
+        set_total_count(response, await posts.count_by_category(category_id))
+    if config.category_posts_list_projection or dto.fields:
+        return paginate_rows(
+            response,
+            await posts.read_by_category_projection(
+                category_id, mappers.post__map_read_all_dto(dto)
+            ),
+        )
+    return paginate(
+        response,
+        await posts.read_by_category(category_id, mappers.post__map_read_all_dto(dto)),
+        mappers.post__map_to_pydantic,
+    )
@@ -1,20 +1,127 @@
+from typing import Annotated
+
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter
+from fastapi import APIRouter, Path, Query, Response
 
 from application.posts.services import PostsService
+from infrastructure.config import Config
+from infrastructure.etags import set_etag
+from infrastructure.pagination import paginate, paginate_rows, set_total_count
 from infrastructure.posts import dtos, mappers
 
 router = APIRouter(route_class=DishkaRoute)
 
 
-@router.get("/", response_model=list[dtos.PostModel])
-async def read_all(posts: FromDishka[PostsService]):
-    return map(mappers.post__map_to_pydantic, await posts.read_all(None))
+@router.get(
+    "/",
+    response_model=list[dtos.PostModel],
+    response_model_exclude_none=True,
+)
+async def read_all(
+    response: Response,
+    dto: Annotated[dtos.ReadAllPostsDto, Query()],
+    posts: FromDishka[PostsService],
+    config: FromDishka[Config],
+):
+    if dto.count is not None:
+        set_total_count(response, await posts.count_all(dto.count))
+    if config.posts_list_projection or dto.fields:
+        return paginate_rows(
+            response,
+            await posts.read_all_projection(mappers.post__map_read_all_dto(dto)),
+        )
+    return paginate(
+        response,
+        await posts.read_all(mappers.post__map_read_all_dto(dto)),
+        mappers.post__map_to_pydantic,
+    )
+
+
+@router.get("/suggest", response_model=list[dtos.PostSuggestionModel])
+async def suggest(
+    dto: Annotated[dtos.SuggestPostsDto, Query()],
+    posts: FromDishka[PostsService],
+):
+    """
+    Подсказки при наборе: посты, в заголовке которых есть слово,
+    начинающееся с q. Отвечает из индекса в памяти, без запросов к базе.
+    """
+
+    return map(mappers.post__map_suggestion, await posts.suggest(dto.q, dto.limit))
+
+
+@router.get("/archive", response_model=list[dtos.ArchiveMonthModel])
+async def read_archive(posts: FromDishka[PostsService]):
+    """
+    Месяцы (по UTC), в которых есть посты, с их числом, от новых к старым.
+    Гистограмма хранится в памяти и поправляется записями постов.
+    """
+
+    return map(mappers.post__map_archive_month, await posts.read_archive())
+
+
+@router.get(
+    "/archive/{year}/{month}",
+    response_model=list[dtos.PostModel],
+    response_model_exclude_none=True,
+)
+async def read_archive_month(
+    year: Annotated[int, Path(ge=1, le=9998)],
+    month: Annotated[int, Path(ge=1, le=12)],
+    response: Response,
+    dto: Annotated[dtos.ReadAllPostsDto, Query()],
+    posts: FromDishka[PostsService],
+):
+    """Посты месяца в порядке создания, курсор в заголовке X-Next-Cursor."""
+
+    if dto.count is not None:
+        set_total_count(response, await posts.count_by_month(year, month))
+    return paginate_rows(
+        response,
+        await posts.read_by_month_projection(
+            year, month, mappers.post__map_read_all_dto(dto)
+        ),
+    )
+
+
+@router.get("/trending", response_model=list[dtos.TrendingPostModel])
+async def read_trending(
+    dto: Annotated[dtos.ReadTrendingPostsDto, Query()],
+    posts: FromDishka[PostsService],
+):
+    """
+    Самые просматриваемые посты за неделю. Читает только материализованное
+    представление, которое фоновая задача пересчитывает раз в несколько минут.
+    """
+
+    return map(mappers.post__map_trending, await posts.read_trending(dto.limit))
+
+
+@router.get("/search", response_model=list[dtos.PostSearchHitModel])
+async def search(
+    response: Response,
+    dto: Annotated[dtos.SearchPostsDto, Query()],
+    posts: FromDishka[PostsService],
+):
+    """
+    Полнотекстовый поиск по заголовкам и телам постов. Результаты
+    отсортированы по релевантности, курсор следующей страницы
+    приходит в заголовке X-Next-Cursor.
+    """
+
+    return paginate(
+        response,
+        await posts.search(mappers.post__map_search_dto(dto)),
+        mappers.post__map_search_hit,
+    )
 
 
 @router.get("/{post_id}", response_model=dtos.PostModelDetail)
 async def read(
     post_id: int,
+    response: Response,
     posts: FromDishka[PostsService],
 ):
-    return mappers.post__map_to_pydantic_detail(await posts.read(post_id))
+    post = await posts.read(post_id)
+    set_etag(response, post.version)
+    return mappers.post__map_to_pydantic_detail(post)
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from datetime import timedelta
+from typing import AsyncIterator
+
+from dishka import AsyncContainer
+
+from application.posts.dtos import TitleSuggestion
+from application.posts.gateways import SuggestionsGateway
+from application.posts.repositories import PostsRepository
+
+from ..background_tasks import background_task_runner
+from ..config import get_config
+
+logger = logging.getLogger(__name__)
+
+# длиннее ключи не хранятся: запрос подсказки ограничен этой длиной
+MAX_PREFIX_LENGTH = 32
+
+
+def normalize(value: str) -> str:
+    return value.casefold()
+
+
+def _keys(post_id: int, title: str) -> list[tuple[str, int]]:
+    """Ключи заголовка: его хвосты с начала каждого слова, обрезанные до лимита."""
+
+    words = normalize(title).split()
+    keys = []
+    for position, _ in enumerate(words):
+        tail = " ".join(words[position:])
+        keys.append((tail[:MAX_PREFIX_LENGTH], post_id))
+    return keys
+
+
+class PrefixIndex:
+    """
+    Отсортированный массив ключей (хвост заголовка, id). Все заголовки,
+    где есть слово с нужным началом, лежат в нем одним отрезком, поэтому
+    поиск - это бинарный поиск и чтение limit соседних элементов
+    """
+
+    def __init__(self, titles: dict[int, str]):
+        self._titles = titles
+        self._keys = sorted(
+            key for post_id, title in titles.items() for key in _keys(post_id, title)
+        )
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def search(self, prefix: str, limit: int) -> list[TitleSuggestion]:
+        prefix = " ".join(normalize(prefix).split())[:MAX_PREFIX_LENGTH]
+        found: dict[int, TitleSuggestion] = {}
+        position = bisect_left(self._keys, (prefix,))
+        while position < len(self._keys) and len(found) < limit:
+            key, post_id = self._keys[position]
+            if not key.startswith(prefix):
+                break
+            if post_id not in found:
+                found[post_id] = TitleSuggestion(post_id, self._titles[post_id])
+            position += 1
+        return list(found.values())
+
+    def add(self, post_id: int, title: str):
+        if self._titles.get(post_id) == title:
+            return
+        self.remove(post_id)
+        self._titles[post_id] = title
+        for key in _keys(post_id, title):
+            insort(self._keys, key)
+
+    def remove(self, post_id: int):
+        if (title := self._titles.pop(post_id, None)) is None:
+            return
+        for key in _keys(post_id, title):
+            position = bisect_left(self._keys, key)
+            if position < len(self._keys) and self._keys[position] == key:
+                del self._keys[position]
+
+
+class PrefixSuggestionsGateway(SuggestionsGateway):
+    """
+    Индекс заголовков в памяти процесса. Строится фоновой задачей и
+    обновляется сервисом постов после коммита каждой записи; изменения,
+    сделанные другими процессами и импортом, подхватывает периодическая
+    пересборка
+    """
+
+    def __init__(self):
+        self._index: PrefixIndex | None = None
+        # изменения, закоммиченные во время пересборки, проигрываются поверх
+        # нее: снимок пересборки мог их не увидеть
+        self._pending: list[tuple[int, str | None]] | None = None
+
+    def suggest(self, prefix: str, limit: int) -> list[TitleSuggestion] | None:
+        if self._index is None:
+            return None
+        return self._index.search(prefix, limit)
+
+    def add(self, post_id: int, title: str):
+        self._apply(post_id, title)
+
+    def remove(self, post_id: int):
+        self._apply(post_id, None)
+
+    def _apply(self, post_id: int, title: str | None):
+        if self._pending is not None:
+            self._pending.append((post_id, title))
+        if self._index is None:
+            return
+        if title is None:
+            self._index.remove(post_id)
+        else:
+            self._index.add(post_id, title)
+
+    async def rebuild(self, titles: AsyncIterator[TitleSuggestion]):
+        """Строит индекс заново по всем заголовкам и подменяет им текущий."""
+
+        self._pending = []
+        try:
+            collected = {suggestion.id: suggestion.title async for suggestion in titles}
+            # сортировка сотен тысяч ключей не должна стоять в цикле событий
+            index = await asyncio.to_thread(PrefixIndex, collected)
+            for post_id, title in self._pending:
+                if title is None:
+                    index.remove(post_id)
+                else:
+                    index.add(post_id, title)
+            self._index = index
+        finally:
+            self._pending = None
+
+
+@background_task_runner(timedelta(seconds=get_config().suggestions_rebuild_interval))
+async def rebuild_suggestions(container: AsyncContainer):
+    """Периодически пересобирает индекс подсказок по заголовкам постов."""
+
+    suggestions = await container.get(SuggestionsGateway)
+    try:
+        async with container() as nested:
+            repository = await nested.get(PostsRepository)
+            await suggestions.rebuild(repository.stream_titles())
+    except Exception as exc:  # noqa
+        # до следующей попытки подсказки отвечают из прежнего индекса или из базы
+        logger.warning("Failed to rebuild title suggestions: %r", exc)
+
+
+__all__ = [
+    "MAX_PREFIX_LENGTH",
+    "PrefixIndex",
+    "PrefixSuggestionsGateway",
+    "rebuild_suggestions",
+]
@@ -0,0 +1,34 @@
+import logging
+from datetime import timedelta
+
+from dishka import AsyncContainer
+
+from application.posts.repositories import PostsRepository
+
+from ..background_tasks import background_task_runner
+from ..config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+@background_task_runner(timedelta(seconds=get_config().trending_refresh_interval))
+async def refresh_trending_posts(container: AsyncContainer):
+    """
+    Периодически пересчитывает популярные посты по суточным просмотрам.
+
+    Маршруты популярного читают только готовое представление, поэтому
+    цена агрегата по просмотрам не зависит от числа запросов.
+    """
+
+    try:
+        async with container() as nested:
+            repository = await nested.get(PostsRepository)
+            await repository.refresh_trending()
+    except Exception as exc:  # noqa
+        # до следующей попытки отдается прежний расчет
+        logger.warning("Failed to refresh trending posts: %r", exc)
+
+
+__all__ = [
+    "refresh_trending_posts",
+]
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+
+from dishka import AsyncContainer
+
+from application.posts.gateways import ViewsGateway
+from application.posts.repositories import PostsRepository
+
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedViewsGateway(ViewsGateway):
+    """
+    Буфер просмотров в памяти процесса: id поста → число просмотров с
+    последней записи. Обработчики чтения только увеличивают счетчик в
+    словаре, а в базу приращения уходят одним UPDATE из фоновой задачи,
+    поэтому популярный пост не собирает очередь на блокировку своей строки.
+
+    Все обращения идут из одного цикла событий, так что подмена словаря
+    атомарна и делить буфер на шарды с блокировками незачем.
+    """
+
+    def __init__(self, config: Config):
+        self._size = config.views_buffer_size
+        self._deltas: dict[int, int] = {}
+        self._dropped = 0
+        # поднимается, когда буфер заполнен и его пора записать досрочно
+        self.full = asyncio.Event()
+
+    def record(self, post_id: int):
+        if post_id in self._deltas:
+            self._deltas[post_id] += 1
+            return
+        if len(self._deltas) >= self._size:
+            # просмотр нового поста теряется, пока буфер не записан
+            self._dropped += 1
+            return
+        self._deltas[post_id] = 1
+        if len(self._deltas) >= self._size:
+            self.full.set()
+
+    def take(self) -> dict[int, int]:
+        """Забирает накопленные приращения, оставляя буфер пустым."""
+
+        deltas, self._deltas = self._deltas, {}
+        self.full.clear()
+        if self._dropped:
+            logger.warning("Views buffer overflowed, dropped %s views", self._dropped)
+            self._dropped = 0
+        return deltas
+
+    def restore(self, deltas: dict[int, int]):
+        """Возвращает в буфер приращения, которые не удалось записать."""
+
+        for post_id, delta in deltas.items():
+            self._deltas[post_id] = self._deltas.get(post_id, 0) + delta
+        if len(self._deltas) >= self._size:
+            self.full.set()
+
+
+async def flush_views(container: AsyncContainer):
+    """Записывает накопленные просмотры в базу одним пакетным UPDATE."""
+
+    views = await container.get(ViewsGateway)
+    if not (deltas := views.take()):
+        return
+    try:
+        async with container() as nested:
+            repository = await nested.get(PostsRepository)
+            await repository.add_views(deltas)
+    except (Exception, asyncio.CancelledError):
+        # приращения дождутся следующей записи
+        views.restore(deltas)
+        raise
+
+
+async def flush_post_views(container: AsyncContainer):
+    """
+    Записывает просмотры раз в views_flush_interval секунд или раньше,
+    если буфер заполнился.
+    """
+
+    config = await container.get(Config)
+    views = await container.get(ViewsGateway)
+    while True:
+        try:
+            await asyncio.wait_for(views.full.wait(), config.views_flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await flush_views(container)
+        except Exception as exc:  # noqa
+            logger.warning("Failed to flush post views: %r", exc)
+            # не повторять неудачную запись в цикле, если буфер все еще полон
+            await asyncio.sleep(config.views_flush_interval)
+
+
+__all__ = [
+    "BufferedViewsGateway",
+    "flush_post_views",
+    "flush_views",
+]
@@ -1,6 +1,8 @@
 from dishka import Provider, Scope, from_context, provide
 
 from application.auth.tokens.config import TokenConfig
+from application.imports.config import ImportConfig
+from application.pagination import CountConfig
 
 from ..config import Config, get_config
 
@@ -12,3 +14,16 @@ class ConfigProvider(Provider):
     def get_token_config(self) -> TokenConfig:
         config = get_config()
         return TokenConfig(secret_key=config.secret_key)
+
+    @provide(scope=Scope.APP)
+    def get_import_config(self) -> ImportConfig:
+        config = get_config()
+        return ImportConfig(
+            chunk_size=config.import_chunk_size,
+            max_reported_errors=config.import_max_reported_errors,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_count_config(self) -> CountConfig:
+        config = get_config()
+        return CountConfig(exact_count_threshold=config.exact_count_threshold)
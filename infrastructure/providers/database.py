@@ -1,23 +1,66 @@
+from datetime import timedelta
 from typing import AsyncIterable
 
 from dishka import Provider, Scope, provide
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
 from ..config import Config
+from ..pools import DatabasePools, PoolProfile
 from ..postgres import get_engine, get_session_maker
+from ..replicas import ReplicaSet
 from ..transactions import TransactionsDatabaseGateway, TransactionsGateway
 
 
 class DatabaseProvider(Provider):
     @provide(scope=Scope.APP)
-    def get_engine(self, config: Config) -> AsyncEngine:
-        return get_engine(str(config.postgres_url))
+    def get_pool_profile(self, config: Config) -> PoolProfile:
+        return PoolProfile(
+            size=config.postgres_pool_size,
+            max_overflow=config.postgres_max_overflow,
+            timeout=config.postgres_pool_timeout,
+            recycle=config.postgres_pool_recycle,
+            pre_ping=config.postgres_pool_pre_ping,
+            statement_cache_size=config.postgres_statement_cache_size,
+            pgbouncer=config.postgres_pgbouncer,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_engine(self, config: Config, profile: PoolProfile) -> AsyncEngine:
+        return get_engine(str(config.postgres_url), profile)
+
+    @provide(scope=Scope.APP)
+    async def get_replicas(
+        self, config: Config, profile: PoolProfile
+    ) -> AsyncIterable[ReplicaSet]:
+        replicas = ReplicaSet(
+            [
+                get_engine(url, profile, read_only=True)
+                for url in config.postgres_replica_urls
+            ],
+            max_lag=timedelta(seconds=config.replica_max_lag),
+            check_timeout=timedelta(seconds=config.replica_check_interval),
+        )
+        await replicas.check()
+        yield replicas
+        await replicas.dispose()
+
+    @provide(scope=Scope.APP)
+    async def get_pools(
+        self,
+        config: Config,
+        profile: PoolProfile,
+        engine: AsyncEngine,
+        replicas: ReplicaSet,
+    ) -> AsyncIterable[DatabasePools]:
+        read_only = get_engine(str(config.postgres_url), profile, read_only=True)
+        yield DatabasePools(primary=engine, read_only=read_only, replicas=replicas)
+        await read_only.dispose()
 
     @provide(scope=Scope.APP)
     def get_session_maker(
-        self, engine: AsyncEngine
+        self, pools: DatabasePools
     ) -> async_sessionmaker[AsyncSession]:
-        return get_session_maker(engine)
+        return get_session_maker(pools.primary, pools.replicas, pools.read_only)
 
     @provide(scope=Scope.REQUEST)
     async def get_session(
@@ -1,8 +1,18 @@
 from dishka import Provider, Scope, provide
 
 from application.auth.tokens.gateways import SecurityGateway, TokensGateway
+from application.imports.gateways import ImportGateway
+from application.posts.gateways import (
+    ArchiveGateway,
+    SuggestionsGateway,
+    ViewsGateway,
+)
 from infrastructure.auth.bcrypt import BcryptSecurityGateway
 from infrastructure.auth.jwt import JwtTokensGateway
+from infrastructure.imports.gateways import CopyImportGateway
+from infrastructure.posts.archive import CachedArchiveGateway
+from infrastructure.posts.suggestions import PrefixSuggestionsGateway
+from infrastructure.posts.views import BufferedViewsGateway
 
 
 class GatewaysProvider(Provider):
@@ -12,3 +22,11 @@ class GatewaysProvider(Provider):
 
     tokens_gateway = provide(source=JwtTokensGateway, provides=TokensGateway)
     security_gateway = provide(source=BcryptSecurityGateway, provides=SecurityGateway)
+    import_gateway = provide(
+        source=CopyImportGateway, provides=ImportGateway, scope=Scope.REQUEST
+    )
+    suggestions_gateway = provide(
+        source=PrefixSuggestionsGateway, provides=SuggestionsGateway
+    )
+    views_gateway = provide(source=BufferedViewsGateway, provides=ViewsGateway)
+    archive_gateway = provide(source=CachedArchiveGateway, provides=ArchiveGateway)
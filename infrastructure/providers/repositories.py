@@ -2,6 +2,7 @@ from dishka import Provider, Scope, provide
 
 from application.posts.repositories import CategoriesRepository, PostsRepository
 from application.users.repositories import UsersRepository
+from infrastructure.posts.loaders import CategoryLoader
 from infrastructure.posts.repositories import (
     CategoriesDatabaseRepository,
     PostsDatabaseRepository,
@@ -19,6 +20,7 @@ class RepositoriesProvider(Provider):
     """
 
     scope = Scope.REQUEST
+    category_loader = provide(source=CategoryLoader)
     users_repository = provide(source=UsersDatabaseRepository, provides=UsersRepository)
     posts_repository = provide(source=PostsDatabaseRepository, provides=PostsRepository)
     categories_repository = provide(
@@ -1,6 +1,7 @@
 from dishka import Provider, Scope, provide
 
 from application.auth.services import AuthService
+from application.imports.services import ImportService
 from application.posts.services import CategoriesService, PostsService
 from application.users.services import UsersService
 
@@ -20,3 +21,4 @@ class ServiceProvider(Provider):
     users = provide(UsersService)
     posts = provide(PostsService)
     categories = provide(CategoriesService)
+    imports = provide(ImportService)
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+
+from dishka import AsyncContainer
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .background_tasks import background_task_runner
+from .config import get_config
+
+logger = logging.getLogger(__name__)
+
+# отставание считается нулевым, если реплика проиграла всё, что получила:
+# иначе на простаивающем мастере «лаг» растёт без всяких записей
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(
+            extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+@dataclass
+class Replica:
+    """Движок реплики и результат последней проверки её состояния."""
+
+    engine: AsyncEngine
+    healthy: bool = False
+    lag: float | None = None
+
+
+class ReplicaSet:
+    """
+    Набор реплик для чтения.
+
+    Отдаёт движок случайной здоровой реплики, отставание которой не превышает
+    порог. Пока ни одна реплика не прошла проверку, чтение идёт в мастер.
+    """
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        max_lag: timedelta,
+        check_timeout: timedelta,
+    ):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.max_lag = max_lag
+        self.check_timeout = check_timeout
+
+    def choose(self) -> AsyncEngine | None:
+        """Возвращает движок доступной реплики или None для чтения из мастера."""
+
+        available = [
+            replica.engine
+            for replica in self.replicas
+            if replica.healthy
+            and replica.lag is not None
+            and replica.lag <= self.max_lag.total_seconds()
+        ]
+        return random.choice(available) if available else None
+
+    async def check(self):
+        """Обновляет состояние и отставание всех реплик."""
+
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: Replica):
+        try:
+            async with asyncio.timeout(self.check_timeout.total_seconds()):
+                async with replica.engine.connect() as connection:
+                    lag = (await connection.execute(REPLICA_LAG_QUERY)).scalar_one()
+        except Exception as exc:  # noqa
+            if replica.healthy:
+                logger.warning("Replica %s is unavailable: %r", replica.engine.url, exc)
+            replica.healthy, replica.lag = False, None
+            return
+
+        replica.healthy, replica.lag = True, float(lag)
+        if replica.lag > self.max_lag.total_seconds():
+            logger.warning("Replica %s lags %.1fs", replica.engine.url, replica.lag)
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+@background_task_runner(timedelta(seconds=get_config().replica_check_interval))
+async def check_replicas(container: AsyncContainer):
+    """Периодически проверяет доступность и отставание реплик."""
+
+    replicas = await container.get(ReplicaSet)
+    await replicas.check()
+
+
+__all__ = [
+    "ReplicaSet",
+    "check_replicas",
+]
@@ -1,11 +1,35 @@
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Any, Callable, Generic, TypeVar, get_args, get_origin
 
-from sqlalchemy import Delete, Insert, Select, Update, insert, select
+from pydantic.alias_generators import to_camel
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Delete,
+    Insert,
+    Integer,
+    Select,
+    TextClause,
+    Update,
+    column,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.orm.interfaces import LoaderOption
 from sqlalchemy.sql.base import Executable
 
-from domain.exceptions import EntityAlreadyExistsError, EntityNotFoundError
+from application.pagination import Cursor
+from domain.exceptions import (
+    EntityAlreadyExistsError,
+    EntityNotFoundError,
+    EntityVersionConflictError,
+)
 
 Id = TypeVar("Id")
 CreateDto = TypeVar("CreateDto")
@@ -18,6 +42,9 @@ AlreadyExistsException = TypeVar(
     "AlreadyExistsException", bound=EntityAlreadyExistsError
 )
 
+# лимит bind-параметров в одном запросе у протокола postgres
+MAX_QUERY_PARAMS = 32767
+
 
 @dataclass
 class MapperConfig:
@@ -45,6 +72,14 @@ class CRUDRepositoryConfig(
     create_mapper: Callable[[CreateDto], ModelType]
     not_found_exception: type[NotFoundException] = NotFoundException
     already_exists_exception: type[AlreadyExistsException] = AlreadyExistsException
+    readonly_columns: tuple[str, ...] = ("id", "created_at", "updated_at")
+    # колонки списков по умолчанию, когда клиент не передал fields
+    list_columns: tuple[str, ...] = ()
+    # счетчик версий для оптимистичных блокировок: растет на каждом UPDATE
+    version_column: str | None = None
+    version_conflict_exception: type[EntityVersionConflictError] = (
+        EntityVersionConflictError
+    )
 
     def extract_id_from_entity(self, entity: Entity) -> Id:  # noqa: PEP-484
         return entity.id
@@ -58,6 +93,14 @@ class CRUDRepositoryConfig(
     def get_options(self) -> list[LoaderOption]:  # noqa: PEP-484
         return []
 
+    def get_stream_options(self) -> list[LoaderOption]:
+        """
+        Опции загрузки для потокового чтения: на каждую порцию строк
+        не должно уходить дополнительных запросов
+        """
+
+        return self.get_options()
+
     @staticmethod
     def _model_to_dict(model: ModelType) -> dict:
         return {
@@ -66,26 +109,169 @@ class CRUDRepositoryConfig(
             if getattr(model, column.key) is not None
         }
 
-    def get_select_all_query(self, dto: ReadAllDto) -> Select:
-        query = select(self.model).order_by(self.model.id)
-        if getattr(dto, "page") is int and getattr(dto, "page_size") is int:
-            query = query.offset(dto.page * dto.page_size).limit(dto.page_size)
-
-        return query
+    def get_select_by_id_query(self, model_id: Id) -> Select:
+        return self._add_where_id(select(self.model), model_id)
 
     def get_default_select_all_query(self, ids: list[Id]) -> Select:
         return select(self.model).where(self.model.id.in_(ids)).order_by(self.model.id)
 
-    def get_select_all_query(self, _: Any) -> Select:
-        return select(self.model).order_by(self.model.id)
+    def get_select_all_query(self) -> Select:
+        return select(self.model)
+
+    def get_keyset_columns(self) -> tuple:
+        return self.model.created_at, self.model.id
+
+    def extract_cursor_from_entity(self, entity: Entity) -> Cursor:
+        return Cursor(created_at=entity.created_at, id=entity.id)
+
+    def add_keyset_pagination(self, query: Select, dto: ReadAllDto) -> Select:
+        """
+        Keyset-пагинация: вместо OFFSET страница начинается строго после
+        курсора, поэтому стоимость запроса не зависит от номера страницы.
+        Берется limit + 1 строка, чтобы понять, есть ли следующая страница
+        """
+
+        columns = self.get_keyset_columns()
+        if dto.cursor is not None:
+            created_at = columns[0]
+            query = query.where(
+                tuple_(*columns) > tuple_(dto.cursor.created_at, dto.cursor.id),
+                # по сравнению кортежей планировщик не отсекает секции
+                # таблицы, по простому условию на created_at - отсекает
+                created_at >= dto.cursor.created_at,
+            )
+        return query.order_by(*columns).limit(dto.limit + 1)
+
+    def get_projection_columns(self, fields: tuple[str, ...] | None) -> list:
+        """Колонки модели под запрошенные поля, лишние из базы не читаются"""
+
+        return [getattr(self.model, name) for name in fields or self.list_columns]
+
+    def get_projection_query(self, columns: list) -> Select:
+        """
+        Core-select только нужных колонок, без ORM-сущностей. Колонки курсора
+        добавляются в конец: они нужны для пагинации, но не для ответа.
+        Labels колонок совпадают с алиасами полей ответа
+        """
+
+        return select(
+            *(column.label(to_camel(column.key)) for column in columns),
+            *self.get_keyset_columns(),
+        )
+
+    def get_count_query(self, query: Select) -> Select:
+        return select(func.count()).select_from(query.order_by(None).subquery())
+
+    def get_estimated_count_query(self) -> TextClause:
+        """
+        Оценка числа строк из статистики планировщика: читается из каталога
+        за константное время, но верна с точностью до последнего ANALYZE
+        """
+
+        # у секционированной таблицы своей статистики нет, она у секций
+        return text(
+            "SELECT sum(reltuples)::bigint FROM pg_class"
+            " WHERE relkind = 'r' AND reltuples >= 0 AND ("
+            " oid = to_regclass(:name) OR oid IN ("
+            " SELECT inhrelid FROM pg_inherits WHERE inhparent = to_regclass(:name)))"
+        ).bindparams(name=self.model.__table__.fullname)
+
+    def get_stream_query(self, dto: Any = None) -> Select:
+        return select(self.model).order_by(*self.get_keyset_columns())
+
+    def _filter_update_values(self, values: dict) -> dict:
+        return {
+            key: value
+            for key, value in values.items()
+            if key not in self.readonly_columns
+            and key != self.version_column
+            and value is not None
+        }
+
+    def get_update_values_from_model(self, model: ModelType) -> dict:
+        return self._filter_update_values(self._model_to_dict(model))
+
+    def get_update_values_from_dto(self, dto: Any) -> dict:
+        return self._filter_update_values(asdict(dto))
+
+    def get_insert_query(self, model: ModelType) -> Insert:
+        return insert(self.model).values(self._model_to_dict(model))
 
     def get_insert_many_query(self, models: list[ModelType]) -> Insert:
+        return insert(self.model).values(list(map(self._model_to_dict, models)))
+
+    def get_insert_chunk_size(self, chunk_size: int) -> int:
+        """Размер пачки для multi-row INSERT с учетом лимита параметров в запросе"""
+
+        return max(
+            1, min(chunk_size, MAX_QUERY_PARAMS // len(self.model.__table__.columns))
+        )
+
+    def _bump_version(self, values: dict) -> dict:
+        if self.version_column is None:
+            return values
+        version = getattr(self.model, self.version_column)
+        return {**values, self.version_column: version + 1}
+
+    def get_update_query(self, model_id: Id, values: dict) -> Update:
+        return self._add_where_id(
+            update(self.model).values(self._bump_version(values)), model_id
+        )
+
+    def get_conditional_update_query(
+        self, model_id: Id, version: int | None, values: dict
+    ) -> Update:
+        """UPDATE, который срабатывает, только если версия строки не изменилась"""
+
+        query = self.get_update_query(model_id, values)
+        if version is None:
+            return query
+        return query.where(getattr(self.model, self.version_column) == version)
+
+    def get_exists_query(self, model_id: Id) -> Select:
+        return self._add_where_id(select(self.model.id), model_id)
+
+    def get_delete_query(self, model_id: Id) -> Delete:
+        return self._add_where_id(delete(self.model), model_id)
+
+    def get_bulk_update_query(self, where: ColumnElement[bool], values: dict) -> Update:
+        """UPDATE по условию: одна команда на любое число строк, в ответ только id"""
+
         return (
-            insert(self.model)
-            .values(list(map(self._model_to_dict, models)))
-            .returning(self.model)
+            update(self.model)
+            .where(where)
+            .values(self._bump_version(values))
+            .returning(self.model.id)
         )
 
+    def get_increment_query(self, column_name: str, deltas: dict[Id, int]) -> Update:
+        """
+        Прибавляет к счетчику разных строк разные значения одним
+        UPDATE ... FROM VALUES. Строки идут по возрастанию id, чтобы
+        встречные пачки брали блокировки в одном порядке
+        """
+
+        changes = values(
+            column("id", Integer), column("delta", BigInteger), name="changes"
+        ).data(sorted(deltas.items()))
+        counter = getattr(self.model, column_name)
+        changed = {column_name: counter + changes.c.delta}
+        # счетчик - не правка строки: onupdate у updated_at не срабатывает
+        if "updated_at" in self.model.__table__.columns:
+            changed["updated_at"] = self.model.updated_at
+        return update(self.model).where(self.model.id == changes.c.id).values(changed)
+
+    def get_bulk_delete_query(self, where: ColumnElement[bool]) -> Delete:
+        return delete(self.model).where(where).returning(self.model.id)
+
+    def get_returning_query(self, statement: Insert | Update | Delete) -> Executable:
+        """
+        Оборачивает INSERT/UPDATE/DELETE в RETURNING, чтобы запись
+        и чтение результата укладывались в один запрос к базе
+        """
+
+        return statement.returning(self.model)
+
     def _add_where_id(
         self, statement: Select | Update | Delete, model_id: Id
     ) -> Select | Update | Delete:
@@ -1,10 +1,13 @@
 import traceback
-from typing import Any, Generic
+from typing import Any, AsyncIterator, Generic
 
-from sqlalchemy import Insert, Select, Update
+from sqlalchemy import ColumnElement, Delete, Insert, Select, Update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from application.pagination import Cursor, Page
+
+from ..config import Config
 from .config import (
     AlreadyExistsException,
     CreateDto,
@@ -20,27 +23,48 @@ from .config import (
 class PostgresRepository:
     config: CRUDRepositoryConfig
 
-    def __init__(self, session: AsyncSession, config: CRUDRepositoryConfig):
+    def __init__(
+        self,
+        session: AsyncSession,
+        config: CRUDRepositoryConfig,
+        chunk_size: int = 1000,
+        fetch_size: int = 1000,
+    ):
         self.session = session
         self.config = config
+        self.chunk_size = chunk_size
+        self.fetch_size = fetch_size
+
+    async def _execute_returning(
+        self, statement: Insert | Update | Delete
+    ) -> list[ModelType]:
+        result = await self.session.scalars(
+            self.config.get_returning_query(statement),
+            execution_options={"populate_existing": True},
+        )
+        return list(result.unique().all())
 
     async def _create_models(self, models: list[ModelType]) -> list[Entity]:
+        created = []
+        chunk_size = self.config.get_insert_chunk_size(self.chunk_size)
         try:
-            self.session.add_all(models)
-            await self.session.flush()
-            for m in models:
-                await self.session.refresh(m)
-            return [self.config.entity_mapper(m) for m in models]
+            for start in range(0, len(models), chunk_size):
+                created += await self._execute_returning(
+                    self.config.get_insert_many_query(
+                        models[start : start + chunk_size]
+                    )
+                )
         except IntegrityError:
             traceback.print_exc()
             raise self.config.already_exists_exception()
+        return [self.config.entity_mapper(m) for m in created]
 
     async def create(self, model: ModelType) -> Entity:
         try:
-            self.session.add(model)
-            await self.session.flush()
-            await self.session.refresh(model)
-            return self.config.entity_mapper(model)
+            [created] = await self._execute_returning(
+                self.config.get_insert_query(model)
+            )
+            return self.config.entity_mapper(created)
         except IntegrityError:
             traceback.print_exc()
             raise self.config.already_exists_exception()
@@ -56,18 +80,86 @@ class PostgresRepository:
         result = await self.session.scalars(self.config.add_options(query))
         return [self.config.entity_mapper(model) for model in result.unique().all()]
 
+    async def stream_entities(self, query: Select) -> AsyncIterator[Entity]:
+        """
+        Читает результат серверным курсором порциями по fetch_size строк,
+        не загружая всю выборку в память
+        """
+
+        result = await self.session.stream_scalars(
+            query.options(*self.config.get_stream_options()),
+            execution_options={"yield_per": self.fetch_size},
+        )
+        async for model in result:
+            yield self.config.entity_mapper(model)
+
+    async def get_page_from_query(self, query: Select, dto: Any) -> Page[Entity]:
+        entities = await self.get_entities_from_query(
+            self.config.add_keyset_pagination(query, dto)
+        )
+        if len(entities) <= dto.limit:
+            return Page(items=entities)
+
+        entities = entities[: dto.limit]
+        return Page(
+            items=entities,
+            next_cursor=self.config.extract_cursor_from_entity(entities[-1]),
+        )
+
+    async def get_projection_page_from_query(
+        self, query: Select, dto: Any
+    ) -> Page[dict[str, Any]]:
+        """
+        Страница строк без ORM и маперов: ключи словарей берутся из labels
+        колонок запроса, курсор - из служебных колонок в конце строки
+        """
+
+        result = await self.session.execute(
+            self.config.add_keyset_pagination(query, dto)
+        )
+        keys = list(result.keys())[: -len(self.config.get_keyset_columns())]
+        rows = result.all()
+        next_cursor = None
+        if len(rows) > dto.limit:
+            rows = rows[: dto.limit]
+            next_cursor = Cursor(*rows[-1][len(keys) :])
+
+        return Page(
+            items=[dict(zip(keys, row)) for row in rows], next_cursor=next_cursor
+        )
+
+    async def read_all_projection(self, dto: Any) -> Page[dict[str, Any]]:
+        return await self.get_projection_page_from_query(
+            self.config.get_projection_query(
+                self.config.get_projection_columns(dto.fields)
+            ),
+            dto,
+        )
+
+    async def count(self, query: Select) -> int:
+        return await self.session.scalar(self.config.get_count_query(query))
+
+    async def estimate_count(self) -> int | None:
+        estimated = await self.session.scalar(self.config.get_estimated_count_query())
+        # -1 (или отсутствие строки) значит, что ANALYZE по таблице еще не выполнялся
+        if estimated is None or estimated < 0:
+            return None
+        return estimated
+
     async def read(self, model_id: Id) -> Entity:
-        if model := await self.session.get(
-            self.config.model,
-            model_id,
-            options=self.config.get_options(),
-            populate_existing=True,
+        if model := await self.get_scalar_or_none(
+            self.config.get_select_by_id_query(model_id).execution_options(
+                populate_existing=True
+            )
         ):
             return self.config.entity_mapper(model)
         raise self.config.not_found_exception()
 
-    async def read_all(self, dto: Any = None) -> list[Entity]:
-        return await self.get_entities_from_query(self.config.get_select_all_query(dto))
+    async def read_all(self, dto: Any) -> Page[Entity]:
+        return await self.get_page_from_query(self.config.get_select_all_query(), dto)
+
+    def stream_all(self, dto: Any = None) -> AsyncIterator[Entity]:
+        return self.stream_entities(self.config.get_stream_query(dto))
 
     async def read_by_ids(self, model_ids: list[Id]) -> list[Entity]:
         return await self.get_entities_from_query(
@@ -89,21 +181,54 @@ class PostgresRepository:
         return await self._create_models(models)
 
     async def update(self, entity: Entity) -> Entity:
-        model = self.config.model_mapper(entity)
-        merged = await self.session.merge(model)
-        await self.session.flush()
-        await self.session.refresh(merged)
-        return self.config.entity_mapper(merged)
+        return await self.update_by_id(
+            self.config.extract_id_from_entity(entity),
+            self.config.get_update_values_from_model(self.config.model_mapper(entity)),
+        )
 
-    async def delete(self, entity: Entity) -> Entity:
-        model = await self.session.get(
-            self.config.model, self.config.extract_id_from_entity(entity)
+    async def update_by_id(self, model_id: Id, values: dict) -> Entity:
+        if updated := await self._execute_returning(
+            self.config.get_update_query(model_id, values)
+        ):
+            return self.config.entity_mapper(updated[0])
+        raise self.config.not_found_exception()
+
+    async def update_by_version(
+        self, model_id: Id, version: int | None, values: dict
+    ) -> Entity:
+        """
+        Условный UPDATE ... RETURNING: проверка версии и запись в одном запросе.
+        Лишний SELECT делается только после неудачи, чтобы отличить
+        конфликт версий от отсутствующей строки
+        """
+
+        if updated := await self._execute_returning(
+            self.config.get_conditional_update_query(model_id, version, values)
+        ):
+            return self.config.entity_mapper(updated[0])
+        if await self.session.scalar(self.config.get_exists_query(model_id)):
+            raise self.config.version_conflict_exception()
+        raise self.config.not_found_exception()
+
+    async def update_where(self, where: ColumnElement[bool], values: dict) -> list[Id]:
+        return list(
+            await self.session.scalars(self.config.get_bulk_update_query(where, values))
+        )
+
+    async def delete_where(self, where: ColumnElement[bool]) -> list[Id]:
+        return list(
+            await self.session.scalars(self.config.get_bulk_delete_query(where))
         )
-        if not model:
-            raise self.config.not_found_exception()
-        await self.session.delete(model)
-        await self.session.flush()
-        return entity
+
+    async def delete(self, entity: Entity) -> Entity:
+        return await self.delete_by_id(self.config.extract_id_from_entity(entity))
+
+    async def delete_by_id(self, model_id: Id) -> Entity:
+        if deleted := await self._execute_returning(
+            self.config.get_delete_query(model_id)
+        ):
+            return self.config.entity_mapper(deleted[0])
+        raise self.config.not_found_exception()
 
 
 class CRUDDatabaseRepository(
@@ -120,37 +245,118 @@ class CRUDDatabaseRepository(
 
     _config: CRUDRepositoryConfig
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, config: Config):
         """Инициализирует репозиторий пользователей."""
 
-        self._repository = PostgresRepository(session, self._config)
+        self._repository = PostgresRepository(
+            session,
+            self._config,
+            chunk_size=config.bulk_insert_chunk_size,
+            fetch_size=config.stream_fetch_size,
+        )
 
     # region queries
-    async def read_all(self, dto: ReadAllDto) -> list[Entity]:
-        """Возвращает список пользователей с пагинацией."""
+    async def read_all(self, dto: ReadAllDto) -> Page[Entity]:
+        """Возвращает страницу сущностей, начиная после курсора из dto."""
 
         return await self._repository.read_all(dto)
 
     async def read(self, entity_id: int) -> Entity:
         """Возвращает пользователя по идентификатору."""
 
-        return await self._repository.read(entity_id)
+        return await self._attach_one(await self._repository.read(entity_id))
+
+    async def read_all_projection(self, dto: ReadAllDto) -> Page[dict[str, Any]]:
+        """Страница строк только с запрошенными колонками, без ORM."""
+
+        return await self._repository.read_all_projection(dto)
+
+    async def count_all(self) -> int:
+        """Точный размер таблицы через count(*)."""
+
+        return await self._repository.count(self._config.get_select_all_query())
+
+    async def estimate_count_all(self) -> int | None:
+        """Оценка размера таблицы по статистике, None если ее еще нет."""
+
+        return await self._repository.estimate_count()
+
+    async def stream_all(self) -> AsyncIterator[Entity]:
+        """Потоково отдает все сущности, читая их серверным курсором."""
+
+        batch = []
+        async for entity in self._repository.stream_all():
+            batch.append(entity)
+            if len(batch) == self._repository.fetch_size:
+                for attached in await self._attach_relations(batch):
+                    yield attached
+                batch = []
+        for attached in await self._attach_relations(batch):
+            yield attached
+
+    async def _attach_relations(self, entities: list[Entity]) -> list[Entity]:
+        """
+        Профиль загрузки для детальных ответов, записей и выгрузок: догружает
+        связанные сущности одним запросом на пачку. Списки его не вызывают
+        и читают только свою таблицу.
+        """
+
+        return entities
+
+    async def _attach_one(self, entity: Entity) -> Entity:
+        [entity] = await self._attach_relations([entity])
+        return entity
 
     # endregion
     # region command
     async def create(self, dto: ReadAllDto) -> Entity:
         """Создает нового пользователя с паролем."""
 
-        return await self._repository.create(self._config.create_mapper(dto))
+        return await self._attach_one(
+            await self._repository.create(self._config.create_mapper(dto))
+        )
+
+    async def create_many(self, dtos: list[CreateDto]) -> list[Entity]:
+        """Создает сущности пачками multi-row INSERT ... RETURNING."""
+
+        return await self._attach_relations(
+            await self._repository.create_many_from_dto(dtos)
+        )
 
     async def update(self, entity: Entity) -> Entity:
         """Обновляет данные пользователя."""
 
-        return await self._repository.update(entity)
+        return await self._attach_one(await self._repository.update(entity))
+
+    async def update_from_dto(self, dto: Any) -> Entity:
+        """Обновляет сущность одним UPDATE ... RETURNING, без предварительного чтения."""
+
+        return await self._attach_one(
+            await self._repository.update_by_id(
+                self._config.extract_id_from_entity(dto),
+                self._config.get_update_values_from_dto(dto),
+            )
+        )
+
+    async def patch(self, dto: Any) -> Entity:
+        """Частично обновляет сущность, если ее версия совпадает с dto.version."""
+
+        return await self._attach_one(
+            await self._repository.update_by_version(
+                self._config.extract_id_from_entity(dto),
+                dto.version,
+                self._config.get_update_values_from_dto(dto),
+            )
+        )
 
     async def delete(self, entity: Entity) -> Entity:
         """Удаляет пользователя."""
 
-        return await self._repository.delete(entity)
+        return await self._attach_one(await self._repository.delete(entity))
+
+    async def delete_by_id(self, entity_id: int) -> Entity:
+        """Удаляет сущность одним DELETE ... RETURNING, без предварительного чтения."""
+
+        return await self._attach_one(await self._repository.delete_by_id(entity_id))
 
     # endregion
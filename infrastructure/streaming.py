@@ -0,0 +1,43 @@
+from typing import AsyncIterable, Callable, TypeVar
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+Entity = TypeVar("Entity")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def iter_ndjson(
+    entities: AsyncIterable[Entity],
+    mapper: Callable[[Entity], BaseModel],
+    batch_size: int = 1000,
+) -> AsyncIterable[bytes]:
+    """
+    Сериализует сущности в NDJSON по мере их чтения из базы.
+    Строки склеиваются пачками, чтобы не отправлять по чанку на каждую запись
+    """
+
+    lines: list[bytes] = []
+    async for entity in entities:
+        lines.append(mapper(entity).model_dump_json(by_alias=True).encode())
+        if len(lines) >= batch_size:
+            yield b"\n".join(lines) + b"\n"
+            lines.clear()
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+
+def ndjson_response(
+    entities: AsyncIterable[Entity],
+    mapper: Callable[[Entity], BaseModel],
+    filename: str,
+    batch_size: int = 1000,
+) -> StreamingResponse:
+    """Ответ, отдающий выгрузку построчно, без накопления в памяти."""
+
+    return StreamingResponse(
+        iter_ndjson(entities, mapper, batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,7 +1,16 @@
+from typing import Callable
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+from sqlalchemy.orm import Session
 
 from application.transactions import Transaction, TransactionsGateway
 
+from .postgres import RoutingSession, pin_to_primary
+
+# отложенные до коммита callback-и в session.info
+ON_COMMIT_KEY = "on_commit"
+
 
 class DatabaseTransaction(Transaction):
     """
@@ -28,42 +37,85 @@ class TransactionsDatabaseGateway(TransactionsGateway):
     """
     Шлюз для управления транзакциями в базе данных.
 
-    Поддерживает вложенные транзакции и автоматическое управление
-    жизненным циклом транзакций через контекстный менеджер.
-    """
+    Внешняя единица работы не тратит SAVEPOINT: она использует транзакцию
+    запроса, открытую провайдером сессии. При ошибке откатывается вся
+    транзакция запроса, при успехе изменения только сбрасываются в базу,
+    а фиксирует их провайдер в конце запроса. Повторный вход в тот же шлюз
+    присоединяется к текущей единице работы; точку сохранения создает
+    только явная вложенность через nested().
 
-    __transaction: AsyncSessionTransaction | None = None
+    Callback-и on_commit копятся в сессии и вызываются после коммита
+    транзакции запроса; отложенные внутри точки сохранения переходят туда
+    же, только если она не откатилась.
+    """
 
-    def __init__(
-        self,
-        session: AsyncSession,
-        transaction: AsyncSessionTransaction | None = None,
-    ):
+    def __init__(self, session: AsyncSession, savepoint: bool = False):
         self._session = session
-        self._transaction = transaction
+        self._savepoint = savepoint
+        self._depth = 0
+        self._savepoints: list[AsyncSessionTransaction] = []
+        self._savepoint_callbacks: list[list[Callable[[], None]]] = []
 
     async def __aenter__(self) -> Transaction:
-        self._transaction = self._session.begin_nested()
-        await self._transaction.__aenter__()
-        return DatabaseTransaction(self._transaction)
+        # запрос, открывший транзакцию, пишет — читать он должен из мастера
+        pin_to_primary(self._session)
+
+        if self._savepoint:
+            transaction = self._session.begin_nested()
+            await transaction.__aenter__()
+            self._savepoints.append(transaction)
+            self._savepoint_callbacks.append([])
+            return DatabaseTransaction(transaction)
+
+        self._depth += 1
+        transaction = self._session.get_transaction()
+        if transaction is None:
+            transaction = await self._session.begin()
+        return DatabaseTransaction(transaction)
 
     def nested(self) -> "TransactionsDatabaseGateway":
-        """Создает новый шлюз для вложенной транзакции."""
+        """Создает новый шлюз для вложенной транзакции с точкой сохранения."""
 
-        return TransactionsDatabaseGateway(self._session, self._session.begin_nested())
+        return TransactionsDatabaseGateway(self._session, savepoint=True)
+
+    def on_commit(self, callback: Callable[[], None]):
+        if self._savepoint_callbacks:
+            self._savepoint_callbacks[-1].append(callback)
+        else:
+            self._session.info.setdefault(ON_COMMIT_KEY, []).append(callback)
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Обрабатывает завершение транзакции при выходе из контекста."""
 
-        if self._transaction and self._transaction.is_active:
+        if self._savepoint:
+            transaction = self._savepoints.pop()
+            callbacks = self._savepoint_callbacks.pop()
+            await transaction.__aexit__(exc_type, exc_val, exc_tb)
             if exc_type is None:
-                await self._transaction.commit()
-            else:
-                await self._transaction.rollback()
-
-        if self._transaction:
-            await self._transaction.__aexit__(exc_type, exc_val, exc_tb)
-        if self._session.in_nested_transaction():
-            self._transaction = self._session.get_nested_transaction()
+                for callback in callbacks:
+                    self.on_commit(callback)
+            return
+
+        self._depth -= 1
+        if self._depth:
+            return
+
+        if exc_type is None:
+            await self._session.flush()
         else:
-            self._transaction = None
+            await self._session.rollback()
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _run_on_commit(session: Session):
+    """Вызывает отложенные callback-и, когда транзакция запроса зафиксирована."""
+
+    for callback in session.info.pop(ON_COMMIT_KEY, []):
+        callback()
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _drop_on_commit(session: Session):
+    """Забывает отложенные callback-и откатившейся транзакции."""
+
+    session.info.pop(ON_COMMIT_KEY, None)
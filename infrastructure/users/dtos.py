@@ -1,13 +1,25 @@
 from datetime import datetime
 
+from pydantic import EmailStr, Field
+
 from domain.users.enums import RoleEnum
 from infrastructure.models import CamelModel
+from infrastructure.pagination import PaginationModel
+
+
+class ReadAllUsersDto(PaginationModel):
+    pass
 
 
 class UpdateUserModelDto(CamelModel):
     role: RoleEnum
 
 
+class UpdateUsersRoleModelDto(CamelModel):
+    user_ids: list[int] = Field(min_length=1, max_length=1000)
+    role: RoleEnum
+
+
 class UserModel(CamelModel):
     """
     Модель пользователя для API.
@@ -19,3 +31,15 @@ class UserModel(CamelModel):
 
     created_at: datetime
     role: RoleEnum
+
+
+class ImportUserModelDto(CamelModel):
+    """
+    Строка импорта пользователя: пароль переносится уже захешированным
+    вместе с солью, чтобы не гонять bcrypt на каждую строку
+    """
+
+    email: EmailStr
+    salt: str
+    hashed_password: str
+    role: RoleEnum = RoleEnum.USER
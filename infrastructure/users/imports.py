@@ -0,0 +1,45 @@
+from sqlalchemy import Select, Table, select
+from sqlalchemy.dialects.postgresql import insert
+
+from application.users.exceptions import UserAlreadyExistsError
+
+from ..imports.targets import ImportTarget
+from . import dtos, mappers
+from .models import UserDatabaseModel
+
+
+class UsersImportTarget(ImportTarget):
+    model = UserDatabaseModel
+    validation_model = dtos.ImportUserModelDto
+    columns = ("email", "salt", "hashed_password", "role", "is_active")
+    conflict_exception = UserAlreadyExistsError
+
+    def to_model(self, validated: dtos.ImportUserModelDto) -> UserDatabaseModel:
+        return mappers.user__create_mapper(mappers.user__map_import_dto(validated))
+
+    def get_merge_query(self, staging: Table) -> Select:
+        """
+        Email уникален: из дублей внутри файла берется первая строка,
+        а занятые в базе email отклоняются через ON CONFLICT DO NOTHING
+        """
+
+        users = self.model.__table__
+        candidates = (
+            select(staging)
+            .distinct(staging.columns.email)
+            .order_by(staging.columns.email, staging.columns.row_number)
+            .cte("candidates")
+        )
+        inserted = (
+            insert(users)
+            .from_select(self.columns, self._get_insert_select(candidates))
+            .on_conflict_do_nothing(index_elements=[users.columns.email])
+            .returning(users.columns.email)
+            .cte("inserted")
+        )
+        accepted = select(candidates.columns.row_number).join(
+            inserted, inserted.columns.email == candidates.columns.email
+        )
+        return select(staging.columns.row_number).where(
+            staging.columns.row_number.not_in(accepted)
+        )
@@ -1,11 +1,18 @@
 from adaptix import P
 from adaptix.conversion import allow_unlinked_optional, link_function
 
-from application.users.dtos import CreateUserDto, UpdateUserDto
+from application.users.dtos import (
+    CreateUserDto,
+    ReadAllUsersDto,
+    UpdateUserDto,
+    UpdateUsersRoleDto,
+)
 from domain.users.entities import User
 from infrastructure.mappers import postgres_retort, pydantic_retort
+from infrastructure.pagination import decode_cursor
 
-from .dtos import UpdateUserModelDto, UserModel
+from . import dtos as models
+from .dtos import ImportUserModelDto, UpdateUserModelDto, UserModel
 from .models import UserDatabaseModel
 
 retort = postgres_retort.extend(recipe=[])
@@ -26,6 +33,27 @@ user__create_mapper = retort.get_converter(
 retort = pydantic_retort.extend(recipe=[])
 
 user__map_to_pydantic = retort.get_converter(User, UserModel)
+user__map_read_all_dto = retort.get_converter(
+    models.ReadAllUsersDto,
+    ReadAllUsersDto,
+    recipe=[
+        link_function(lambda dto: decode_cursor(dto.cursor), P[ReadAllUsersDto].cursor)
+    ],
+)
+user__map_import_dto = retort.get_converter(
+    ImportUserModelDto,
+    CreateUserDto,
+    recipe=[
+        link_function(
+            lambda user: user.email,
+            P[CreateUserDto].email,
+        ),
+    ],
+)
+
+user__map_update_role_dto = retort.get_converter(
+    models.UpdateUsersRoleModelDto, UpdateUsersRoleDto
+)
 
 
 @retort.impl_converter(
@@ -5,6 +5,7 @@ from application.users import dtos
 from application.users.exceptions import UserAlreadyExistsError, UserNotFoundError
 from application.users.repositories import UsersRepository
 from domain.users import entities
+from domain.users.enums import RoleEnum
 from infrastructure.config import Config
 
 from ..repositories.config import CRUDRepositoryConfig, MapperConfig
@@ -42,7 +43,7 @@ class UsersDatabaseRepository(
     """Репозиторий для работы с пользователями в базе данных."""
 
     _config = RepositoryConfig(
-        read_all_dto=dtos.CreateUserDto,
+        read_all_dto=dtos.ReadAllUsersDto,
         model=UserDatabaseModel,
         entity=entities.User,
         create_mapper=mappers.user__create_mapper,
@@ -55,7 +56,7 @@ class UsersDatabaseRepository(
     def __init__(self, session: AsyncSession, config: Config):
         """Инициализирует репозиторий пользователей."""
 
-        super().__init__(session)
+        super().__init__(session, config)
         self._admin_username = config.admin_username
 
     # region queries
@@ -79,3 +80,13 @@ class UsersDatabaseRepository(
         return await self.read_by_email(self._admin_username)
 
     # endregion
+
+    # region commands
+    async def update_role(self, user_ids: list[int], role: RoleEnum) -> list[int]:
+        """Меняет роль пользователям из списка одним UPDATE, возвращает их id."""
+
+        return await self._repository.update_where(
+            self._config.model.id.in_(user_ids), {"role": role}
+        )
+
+    # endregion
@@ -1,13 +1,18 @@
 from typing import Annotated
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 
-from application.users.dtos import ReadAllUsersDto
 from application.users.services import UsersService
 from domain.users.entities import User
 from infrastructure.auth.deps import get_user
+from infrastructure.config import Config
+from infrastructure.deadlines import BULK_TIMEOUT, deadline
 from infrastructure.models import ErrorModel
+from infrastructure.pagination import paginate, set_total_count
+from infrastructure.postgres import use_read_only_snapshot
+from infrastructure.streaming import NDJSON_MEDIA_TYPE, ndjson_response
 from infrastructure.users import dtos, mappers
 
 router = APIRouter(route_class=DishkaRoute)
@@ -15,23 +20,59 @@ router = APIRouter(route_class=DishkaRoute)
 
 @router.get("/", response_model=list[dtos.UserModel])
 async def read_all_users(
+    response: Response,
+    dto: Annotated[dtos.ReadAllUsersDto, Query()],
     users: FromDishka[UsersService],
     actor: Annotated[User, Depends(get_user)],
-    page: int = 0,
-    page_size: int = 50,
 ):
-    """Получает список пользователей с пагинацией.
+    """Получает список пользователей с keyset-пагинацией.
 
-    По умолчанию возвращает первые 50 пользователей.
+    По умолчанию возвращает первые 50 пользователей, курсор следующей
+    страницы приходит в заголовке X-Next-Cursor. С параметром count
+    в заголовке X-Total-Count отдается общее число пользователей.
     """
-    return map(
+    page = await users.read_all(mappers.user__map_read_all_dto(dto), actor=actor)
+    if dto.count is not None:
+        set_total_count(response, await users.count_all(dto.count, actor=actor))
+    return paginate(
+        response,
+        page,
         mappers.user__map_to_pydantic,
-        await users.read_all(
-            ReadAllUsersDto(page=page, page_size=page_size), actor=actor
-        ),
     )
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}},
+    dependencies=[Depends(use_read_only_snapshot), Depends(deadline(BULK_TIMEOUT))],
+)
+async def export_users(
+    users: FromDishka[UsersService],
+    actor: Annotated[User, Depends(get_user)],
+    config: FromDishka[Config],
+):
+    """Выгружает всех пользователей в NDJSON, читая их серверным курсором."""
+
+    return ndjson_response(
+        users.export(actor),
+        mappers.user__map_to_pydantic,
+        filename="users.ndjson",
+        batch_size=config.stream_fetch_size,
+    )
+
+
+@router.put("/role", response_model=list[int])
+async def update_users_role(
+    dto: dtos.UpdateUsersRoleModelDto,
+    users: FromDishka[UsersService],
+    actor: Annotated[User, Depends(get_user)],
+):
+    """Меняет роль списку пользователей одним запросом, возвращает id измененных."""
+
+    return await users.update_role(mappers.user__map_update_role_dto(dto), actor)
+
+
 @router.get(
     "/{user_id}",
     response_model=dtos.UserModel,
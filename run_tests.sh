@@ -5,6 +5,22 @@ echo $(poetry run pytest tests/test_admin.py::test_admin_posts_crud)
 echo $(poetry run pytest tests/test_admin.py::test_admin_users_crud_list_get_update)
 echo $(poetry run pytest tests/test_auth.py::test_register_login_refresh_me_flow)
 echo $(poetry run pytest tests/test_public.py::test_public_posts_and_categories)
+echo $(poetry run pytest tests/test_admin.py::test_admin_bulk_create)
+echo $(poetry run pytest tests/test_admin.py::test_admin_import_posts)
+echo $(poetry run pytest tests/test_admin.py::test_admin_export)
+echo $(poetry run pytest tests/test_admin.py::test_category_posts_pagination)
+echo $(poetry run pytest tests/test_public.py::test_pool_stats)
+echo $(poetry run pytest tests/test_public.py::test_request_deadlines)
+echo $(poetry run pytest tests/test_query_plans.py)
+echo $(poetry run pytest tests/test_admin.py::test_patch_optimistic_concurrency)
+echo $(poetry run pytest tests/test_admin.py::test_admin_bulk_operations)
+echo $(poetry run pytest tests/test_admin.py::test_posts_search)
+echo $(poetry run pytest tests/test_admin.py::test_posts_suggest)
+echo $(poetry run pytest tests/test_admin.py::test_category_post_counts)
+echo $(poetry run pytest tests/test_admin.py::test_post_views)
+echo $(poetry run pytest tests/test_admin.py::test_trending_posts)
+echo $(poetry run pytest tests/test_admin.py::test_posts_partitions)
+echo $(poetry run pytest tests/test_admin.py::test_posts_archive)
 
 echo "Finish"
 sleep 2
\ No newline at end of file
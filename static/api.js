@@ -25,7 +25,7 @@ function clearAuth() {
     updateAuthUI();
 }
 
-async function http(path, {method = 'GET', body, auth = true} = {}) {
+async function request(path, {method = 'GET', body, auth = true} = {}) {
     const headers = {'Content-Type': 'application/json'};
     if (auth && store.accessToken) {
         headers['Authorization'] = `Bearer ${store.accessToken}`;
@@ -40,7 +40,7 @@ async function http(path, {method = 'GET', body, auth = true} = {}) {
         try {
             const refreshed = await refreshToken();
             if (refreshed) {
-                return await http(path, {method, body, auth});
+                return await request(path, {method, body, auth});
             }
         } catch {
         }
@@ -49,11 +49,31 @@ async function http(path, {method = 'GET', body, auth = true} = {}) {
         const text = await res.text().catch(() => '');
         throw new Error(text || res.statusText);
     }
+    return res;
+}
+
+async function http(path, options = {}) {
+    const res = await request(path, options);
     const ct = res.headers.get('content-type') || '';
     if (ct.includes('application/json')) return res.json();
     return res.text();
 }
 
+// Списки отдаются страницами: идем по X-Next-Cursor, пока он не кончится
+async function httpAll(path, limit = 100) {
+    const items = [];
+    let cursor = null;
+    do {
+        const params = new URLSearchParams({limit});
+        if (cursor) params.set('cursor', cursor);
+        const separator = path.includes('?') ? '&' : '?';
+        const res = await request(`${path}${separator}${params}`);
+        items.push(...await res.json());
+        cursor = res.headers.get('X-Next-Cursor');
+    } while (cursor);
+    return items;
+}
+
 // Auth
 async function registerUser(email, password) {
     const data = await http('/api/v1/auth/register', {method: 'POST', body: {email, password}, auth: false});
@@ -83,8 +103,8 @@ async function getMe() {
 }
 
 // Users (admin)
-async function adminListUsers(page = 0, pageSize = 50) {
-    return http(`/api/v1/users/admin/?page=${page}&page_size=${pageSize}`);
+async function adminListUsers() {
+    return httpAll('/api/v1/users/admin/');
 }
 
 async function adminGetUser(id) {
@@ -100,12 +120,12 @@ async function adminDeleteUser(id) {
 }
 
 // Posts
-async function listPosts() {
-    return http('/api/v1/posts/');
+async function listPosts(fields = 'id,title') {
+    return http(`/api/v1/posts/?fields=${fields}`);
 }
 
-async function listPostsWithCategory(category_id) {
-    return http(`/api/v1/categories/${category_id}/posts`);
+async function listPostsWithCategory(category_id, fields = 'id,title') {
+    return http(`/api/v1/categories/${category_id}/posts?fields=${fields}`);
 }
 
 async function readPost(id) {
@@ -114,7 +134,7 @@ async function readPost(id) {
 
 // Admin posts
 async function adminListPosts() {
-    return http('/api/v1/posts/');
+    return httpAll('/api/v1/posts/');
 }
 
 async function adminCreatePost(payload) {
@@ -144,7 +164,7 @@ async function readCategory(id) {
 
 // Admin categories
 async function adminListCategories() {
-    return http('/api/v1/categories/');
+    return httpAll('/api/v1/categories/');
 }
 
 async function adminCreateCategory(payload) {
@@ -118,7 +118,7 @@ const views = {
             <tr>
               <td>${p.id}</td>
               <td>${escapeHtml(p.title)}</td>
-              <td>${escapeHtml(p.body.substring(0, 10) + (p.body.length > 10 ? '...' : ''))}</td>
+              <td>${escapeHtml(p.excerpt.substring(0, 40) + (p.excerpt.length > 40 ? '...' : ''))}</td>
               <td class="actions">
                 <a href="#/admin/posts/${p.id}">Править</a>
                 <button data-action="admin-delete-post" data-id="${p.id}" class="danger">Удалить</button>
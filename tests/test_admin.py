@@ -1,3 +1,4 @@
+import json
 import os
 
 import pytest
@@ -154,3 +155,990 @@ async def test_admin_posts_crud(client, admin_token):
         f"/api/v1/admin/posts/{pid}", headers={"Authorization": f"Bearer {admin_token}"}
     )
     assert response.status_code in (200, 204, 202)
+
+
+@pytest.mark.asyncio
+async def test_admin_bulk_create(client, admin_token):
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    payload = [
+        {"title": f"Bulk категория {i}", "description": "Массовая загрузка"}
+        for i in range(3)
+    ]
+    response = await client.post(
+        "/api/v1/admin/categories/bulk", headers=headers, json=payload
+    )
+    assert response.status_code in (200, 201)
+    cats = response.json()
+    assert [c["title"] for c in cats] == [c["title"] for c in payload]
+
+    cid = cats[0]["id"]
+    payload = [
+        {"title": f"Bulk пост {i}", "body": f"<p>{i}</p>", "category_id": cid}
+        for i in range(5)
+    ]
+    response = await client.post(
+        "/api/v1/admin/posts/bulk", headers=headers, json=payload
+    )
+    assert response.status_code in (200, 201)
+    posts = response.json()
+    assert len(posts) == len(payload)
+    assert all(p["category"]["id"] == cid for p in posts)
+
+    for post in posts:
+        response = await client.delete(
+            f"/api/v1/admin/posts/{post['id']}", headers=headers
+        )
+        assert response.status_code in (200, 204, 202)
+
+
+@pytest.mark.asyncio
+async def test_admin_import_posts(client, admin_token):
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = await client.post(
+        "/api/v1/admin/categories/",
+        headers=headers,
+        json={"title": "Импорт", "description": "Интеграционный тест"},
+    )
+    assert response.status_code in (200, 201)
+    cid = response.json()["id"]
+
+    lines = [
+        json.dumps({"title": "Импорт 1", "body": "<p>1</p>", "categoryId": cid}),
+        json.dumps({"title": "Импорт 2", "body": "<p>2</p>", "categoryId": -1}),
+        json.dumps({"title": "Импорт 3"}),
+    ]
+    response = await client.post(
+        "/api/v1/admin/import/POSTS",
+        headers=headers,
+        files={"file": ("posts.ndjson", "\n".join(lines).encode(), "text/plain")},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["totalRows"] == 3
+    assert report["importedRows"] == 1
+    assert [error["row"] for error in report["errors"]] == [2, 3]
+
+    response = await client.get(f"/api/v1/categories/{cid}/posts")
+    for post in response.json():
+        await client.delete(f"/api/v1/admin/posts/{post['id']}", headers=headers)
+    await client.delete(f"/api/v1/admin/categories/{cid}", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_admin_export(client, admin_token, config):
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = await client.get("/api/v1/users/admin/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    users = [json.loads(line) for line in response.text.splitlines()]
+    assert any(user["email"] == config.admin_username for user in users)
+
+    response = await client.get("/api/v1/admin/posts/export", headers=headers)
+    assert response.status_code == 200
+    for line in response.text.splitlines():
+        assert "category" in json.loads(line)
+
+    response = await client.get("/api/v1/admin/posts/export")
+    assert response.status_code in (401, 403)
+
+
+@pytest.mark.asyncio
+async def test_category_posts_pagination(client, admin_token):
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = await client.post(
+        "/api/v1/admin/categories/",
+        headers=headers,
+        json={"title": "Пагинация", "description": "Интеграционный тест"},
+    )
+    assert response.status_code in (200, 201)
+    cid = response.json()["id"]
+
+    response = await client.post(
+        "/api/v1/admin/posts/bulk",
+        headers=headers,
+        json=[
+            {"title": f"Пост {i}", "body": "<p>..</p>", "categoryId": cid}
+            for i in range(5)
+        ],
+    )
+    assert response.status_code == 200
+    created = [post["id"] for post in response.json()]
+
+    response = await client.get(f"/api/v1/categories/{cid}/posts")
+    for post in response.json():
+        assert "body" not in post
+        assert post["excerpt"] == ".."
+        assert post["readingTime"] == 1
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+        response = await client.get(f"/api/v1/categories/{cid}/posts", params=params)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen += [post["id"] for post in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == created
+
+    response = await client.get(
+        f"/api/v1/categories/{cid}/posts", params={"limit": 2, "count": "AUTO"}
+    )
+    assert response.headers["X-Total-Count"] == "5"
+    assert response.headers["X-Total-Count-Estimated"] == "false"
+
+    response = await client.get("/api/v1/posts/", params={"count": "EXACT"})
+    assert int(response.headers["X-Total-Count"]) >= 5
+    response = await client.get("/api/v1/posts/", params={"count": "ESTIMATED"})
+    assert int(response.headers["X-Total-Count"]) >= 0
+    assert "X-Total-Count" not in (await client.get("/api/v1/posts/")).headers
+
+    response = await client.get(
+        f"/api/v1/categories/{cid}/posts", params={"fields": "id,title"}
+    )
+    assert all(set(post) == {"id", "title"} for post in response.json())
+    response = await client.get("/api/v1/categories/", params={"count": "EXACT"})
+    assert int(response.headers["X-Total-Count"]) >= 1
+    response = await client.get("/api/v1/categories/", params={"fields": "title"})
+    assert all(set(category) == {"title"} for category in response.json())
+    response = await client.get("/api/v1/posts/", params={"fields": "title,secret"})
+    assert response.status_code == 422
+
+    response = await client.get("/api/v1/posts/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+    response = await client.get("/api/v1/posts/", params={"limit": 1000})
+    assert response.status_code == 422
+
+    for pid in created:
+        await client.delete(f"/api/v1/admin/posts/{pid}", headers=headers)
+    await client.delete(f"/api/v1/admin/categories/{cid}", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_patch_optimistic_concurrency(client, admin_token):
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.post(
+        "/api/v1/admin/categories/",
+        headers=headers,
+        json={"title": "Версии", "description": "If-Match"},
+    )
+    assert response.status_code == 200
+    cid = response.json()["id"]
+
+    response = await client.post(
+        "/api/v1/admin/posts/",
+        headers=headers,
+        json={"title": "Пост с версией", "body": "<p>Первая</p>", "category_id": cid},
+    )
+    assert response.status_code == 200
+    pid = response.json()["id"]
+
+    # ETag детальной карточки - версия строки
+    response = await client.get(f"/api/v1/posts/{pid}")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag == '"1"'
+
+    # без If-Match частичное обновление не выполняется
+    response = await client.patch(
+        f"/api/v1/admin/posts/{pid}", headers=headers, json={"title": "Без версии"}
+    )
+    assert response.status_code == 428
+
+    response = await client.patch(
+        f"/api/v1/admin/posts/{pid}",
+        headers={**headers, "If-Match": etag},
+        json={"title": "Новый заголовок"},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2"'
+    post = response.json()
+    assert post["title"] == "Новый заголовок"
+    # непереданные поля не меняются
+    assert post["body"] == "<p>Первая</p>"
+
+    # второй редактор со старым ETag получает конфликт, а не затирает правку
+    response = await client.patch(
+        f"/api/v1/admin/posts/{pid}",
+        headers={**headers, "If-Match": etag},
+        json={"title": "Устаревшая правка"},
+    )
+    assert response.status_code == 412
+    response = await client.get(f"/api/v1/posts/{pid}")
+    assert response.json()["title"] == "Новый заголовок"
+
+    # PUT тоже увеличивает версию
+    response = await client.put(
+        f"/api/v1/admin/posts/{pid}",
+        headers=headers,
+        json={"title": "PUT", "body": "<p>Вторая</p>", "category_id": cid},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"3"'
+
+    response = await client.patch(
+        f"/api/v1/admin/posts/{pid}",
+        headers={**headers, "If-Match": '"2"'},
+        json={"body": "<p>Третья</p>"},
+    )
+    assert response.status_code == 412
+
+    response = await client.patch(
+        f"/api/v1/admin/posts/{pid}",
+        headers={**headers, "If-Match": "*"},
+        json={"body": "<p>Третья</p>"},
+    )
+    assert response.status_code == 200
+    assert response.json()["body"] == "<p>Третья</p>"
+
+    response = await client.patch(
+        f"/api/v1/admin/categories/{cid}",
+        headers={**headers, "If-Match": 'W/"1"'},
+        json={"description": "Обновлено"},
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Версии"
+    assert response.headers["ETag"] == '"2"'
+
+    response = await client.patch(
+        f"/api/v1/admin/categories/{cid}",
+        headers={**headers, "If-Match": "1"},
+        json={"description": "Обновлено"},
+    )
+    assert response.status_code == 400
+
+    await client.delete(f"/api/v1/admin/posts/{pid}", headers=headers)
+    await client.delete(f"/api/v1/admin/categories/{cid}", headers=headers)
+
+    # отсутствующая строка - 404, а не конфликт версий
+    response = await client.patch(
+        f"/api/v1/admin/posts/{pid}",
+        headers={**headers, "If-Match": '"4"'},
+        json={"title": "Удален"},
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_admin_bulk_operations(client, admin_token):
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    response = await client.post(
+        "/api/v1/admin/categories/bulk",
+        headers=headers,
+        json=[
+            {"title": "Источник", "description": ""},
+            {"title": "Приемник", "description": ""},
+        ],
+    )
+    assert response.status_code == 200
+    source, target = (category["id"] for category in response.json())
+
+    response = await client.post(
+        "/api/v1/admin/posts/bulk",
+        headers=headers,
+        json=[
+            {"title": f"Пост {i}", "body": "<p>bulk</p>", "category_id": source}
+            for i in range(3)
+        ],
+    )
+    assert response.status_code == 200
+    post_ids = sorted(post["id"] for post in response.json())
+
+    # перенос всех постов категории одним UPDATE
+    response = await client.post(
+        f"/api/v1/admin/categories/{source}/posts/move",
+        headers=headers,
+        json={"targetCategoryId": target},
+    )
+    assert response.status_code == 200
+    assert sorted(response.json()) == post_ids
+
+    response = await client.get(f"/api/v1/posts/{post_ids[0]}")
+    assert response.json()["category"]["id"] == target
+    assert response.headers["ETag"] == '"2"'
+
+    response = await client.post(
+        f"/api/v1/admin/categories/{target}/posts/move",
+        headers=headers,
+        json={"targetCategoryId": 2**31 - 1},
+    )
+    assert response.status_code == 404
+
+    # удаление всех постов категории одним DELETE
+    response = await client.delete(
+        f"/api/v1/admin/categories/{target}/posts", headers=headers
+    )
+    assert response.status_code == 200
+    assert sorted(response.json()) == post_ids
+    response = await client.get(f"/api/v1/posts/{post_ids[0]}")
+    assert response.status_code == 404
+
+    response = await client.delete(
+        f"/api/v1/admin/categories/{source}/posts", headers=headers
+    )
+    assert response.json() == []
+
+    for category_id in (source, target):
+        await client.delete(f"/api/v1/admin/categories/{category_id}", headers=headers)
+
+    # смена роли списку пользователей
+    user_ids = []
+    for _ in range(2):
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={"email": f"bulk-{os.urandom(6).hex()}@example.com", "password": "P"},
+        )
+        response.raise_for_status()
+        user_ids.append(response.json()["user"]["id"])
+
+    response = await client.put(
+        "/api/v1/users/admin/role",
+        headers=headers,
+        json={"userIds": [*user_ids, 2**31 - 1], "role": "PUBLIC"},
+    )
+    assert response.status_code == 200
+    assert sorted(response.json()) == sorted(user_ids)
+
+    response = await client.get(f"/api/v1/users/admin/{user_ids[0]}", headers=headers)
+    assert response.json()["role"] == "PUBLIC"
+
+    for user_id in user_ids:
+        await client.delete(f"/api/v1/users/admin/{user_id}", headers=headers)
+
+    response = await client.put(
+        "/api/v1/users/admin/role",
+        headers=headers,
+        json={"userIds": [], "role": "USER"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_posts_search(client, admin_token):
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    # уникальное слово, чтобы не зависеть от остальных постов в базе
+    word = "".join(chr(ord("a") + byte % 26) for byte in os.urandom(12))
+
+    response = await client.post(
+        "/api/v1/admin/categories/",
+        headers=headers,
+        json={"title": "Поиск", "description": ""},
+    )
+    cid = response.json()["id"]
+    response = await client.post(
+        "/api/v1/admin/posts/bulk",
+        headers=headers,
+        json=[
+            {
+                "title": "Заметка без слова в заголовке",
+                "body": f"<p>Длинный текст, где {word} встречается в теле.</p>",
+                "category_id": cid,
+            },
+            {
+                "title": f"Про {word}",
+                "body": "<p>Тело поста без искомого слова.</p>",
+                "category_id": cid,
+            },
+            {
+                "title": "Совсем другой пост",
+                "body": "<p>Ничего общего.</p>",
+                "category_id": cid,
+            },
+        ],
+    )
+    assert response.status_code == 200
+    body_hit, title_hit, _ = (post["id"] for post in response.json())
+
+    response = await client.get("/api/v1/posts/search", params={"q": word})
+    assert response.status_code == 200
+    hits = response.json()
+    # совпадение в заголовке весит больше совпадения в теле
+    assert [hit["id"] for hit in hits] == [title_hit, body_hit]
+    assert f"<mark>{word}</mark>" in hits[1]["snippet"]
+    assert "<p>" not in hits[1]["snippet"]
+    assert "X-Next-Cursor" not in response.headers
+
+    # keyset-пагинация по релевантности
+    response = await client.get("/api/v1/posts/search", params={"q": word, "limit": 1})
+    assert [hit["id"] for hit in response.json()] == [title_hit]
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get(
+        "/api/v1/posts/search", params={"q": word, "limit": 1, "cursor": cursor}
+    )
+    assert [hit["id"] for hit in response.json()] == [body_hit]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = await client.get(
+        "/api/v1/posts/search", params={"q": f"{word} -заметка"}
+    )
+    assert [hit["id"] for hit in response.json()] == [title_hit]
+
+    response = await client.get(
+        "/api/v1/posts/search", params={"q": word, "cursor": "broken"}
+    )
+    assert response.status_code == 400
+    response = await client.get("/api/v1/posts/search", params={"q": ""})
+    assert response.status_code == 422
+
+    await client.delete(f"/api/v1/admin/categories/{cid}/posts", headers=headers)
+    await client.delete(f"/api/v1/admin/categories/{cid}", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_posts_suggest(client, admin_token):
+    from functools import partial
+
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from application.posts.gateways import SuggestionsGateway
+    from application.posts.repositories import PostsRepository
+    from application.transactions import TransactionsGateway
+    from infrastructure.server import container
+
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    word = "".join(chr(ord("a") + byte % 26) for byte in os.urandom(12))
+
+    response = await client.post(
+        "/api/v1/admin/categories/",
+        headers=headers,
+        json={"title": "Подсказки", "description": ""},
+    )
+    cid = response.json()["id"]
+    response = await client.post(
+        "/api/v1/admin/posts/bulk",
+        headers=headers,
+        json=[
+            {"title": f"{word} первый", "body": "<p>1</p>", "category_id": cid},
+            {"title": f"Второй {word}", "body": "<p>2</p>", "category_id": cid},
+        ],
+    )
+    first, second = (post["id"] for post in response.json())
+
+    # до построения индекса подсказки отвечает база
+    response = await client.get("/api/v1/posts/suggest", params={"q": word[:6]})
+    assert response.status_code == 200
+    assert [hit["id"] for hit in response.json()] == [first, second]
+    response = await client.get("/api/v1/posts/suggest", params={"q": "%"})
+    assert response.status_code == 200
+
+    suggestions = await container.get(SuggestionsGateway)
+    async with container() as nested:
+        repository = await nested.get(PostsRepository)
+        await suggestions.rebuild(repository.stream_titles())
+
+    response = await client.get("/api/v1/posts/suggest", params={"q": word[:6].upper()})
+    assert {hit["id"] for hit in response.json()} == {first, second}
+
+    # индекс не ходит в базу: переименование мимо сервиса ему не видно
+    async with container() as nested:
+        session = await nested.get(AsyncSession)
+        await session.execute(
+            text("UPDATE posts SET title = 'renamed' WHERE id = :id"), {"id": first}
+        )
+        await session.commit()
+    response = await client.get("/api/v1/posts/suggest", params={"q": word})
+    assert {hit["title"] for hit in response.json()} == {
+        f"{word} первый",
+        f"Второй {word}",
+    }
+
+    # записи через сервис обновляют индекс сразу
+    response = await client.patch(
+        f"/api/v1/admin/posts/{second}",
+        headers={**headers, "If-Match": "*"},
+        json={"title": f"Третий {word}x"},
+    )
+    assert response.status_code == 200
+    response = await client.get("/api/v1/posts/suggest", params={"q": f"{word}x"})
+    assert response.json() == [{"id": second, "title": f"Третий {word}x"}]
+    response = await client.get("/api/v1/posts/suggest", params={"q": "второй"})
+    assert second not in {hit["id"] for hit in response.json()}
+
+    await client.delete(f"/api/v1/admin/posts/{first}", headers=headers)
+    response = await client.get("/api/v1/posts/suggest", params={"q": word})
+    assert [hit["id"] for hit in response.json()] == [second]
+
+    # откатившаяся запись индекс не трогает
+    async with container() as nested:
+        transaction = await nested.get(TransactionsGateway)
+        async with transaction:
+            transaction.on_commit(partial(suggestions.remove, second))
+        await (await nested.get(AsyncSession)).rollback()
+    response = await client.get("/api/v1/posts/suggest", params={"q": word})
+    assert [hit["id"] for hit in response.json()] == [second]
+
+    await client.delete(f"/api/v1/admin/categories/{cid}/posts", headers=headers)
+    response = await client.get("/api/v1/posts/suggest", params={"q": word})
+    assert response.json() == []
+    await client.delete(f"/api/v1/admin/categories/{cid}", headers=headers)
+
+    response = await client.get("/api/v1/posts/suggest", params={"q": "x" * 33})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_category_post_counts(client, admin_token):
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from application.posts.repositories import CategoriesRepository
+    from infrastructure.server import container
+
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    async def post_count(category_id: int) -> int:
+        response = await client.get(f"/api/v1/categories/{category_id}")
+        return response.json()["postCount"]
+
+    response = await client.post(
+        "/api/v1/admin/categories/bulk",
+        headers=headers,
+        json=[
+            {"title": "Счетчик A", "description": ""},
+            {"title": "Счетчик B", "description": ""},
+        ],
+    )
+    first, second = (category["id"] for category in response.json())
+    assert response.json()[0]["postCount"] == 0
+
+    response = await client.post(
+        "/api/v1/admin/posts/",
+        headers=headers,
+        json={"title": "Один", "body": "<p>1</p>", "category_id": first},
+    )
+    post = response.json()
+    assert post["category"]["postCount"] == 1
+    response = await client.post(
+        "/api/v1/admin/posts/bulk",
+        headers=headers,
+        json=[
+            {"title": f"Пачка {i}", "body": "<p>2</p>", "category_id": category}
+            for i, category in enumerate((first, first, second))
+        ],
+    )
+    assert response.status_code == 200
+    assert (await post_count(first), await post_count(second)) == (3, 1)
+
+    # счетчик отдается и в списке, и в проекции; категория может быть
+    # не на первой странице, если база накопила категории прошлых прогонов
+    params = {"limit": 100}
+    listed = None
+    while listed is None:
+        response = await client.get("/api/v1/categories/", params=params)
+        listed = next(
+            (category for category in response.json() if category["id"] == first),
+            None,
+        )
+        params["cursor"] = response.headers.get("X-Next-Cursor")
+        assert listed is not None or params["cursor"]
+    assert {"id": first, "postCount": 3}.items() <= listed.items()
+
+    # перенос поста между категориями через PUT и PATCH
+    response = await client.put(
+        f"/api/v1/admin/posts/{post['id']}",
+        headers=headers,
+        json={"title": "Один", "body": "<p>1</p>", "category_id": second},
+    )
+    assert response.status_code == 200
+    assert (await post_count(first), await post_count(second)) == (2, 2)
+    response = await client.patch(
+        f"/api/v1/admin/posts/{post['id']}",
+        headers={**headers, "If-Match": "*"},
+        json={"categoryId": first},
+    )
+    assert response.status_code == 200
+    assert (await post_count(first), await post_count(second)) == (3, 1)
+    # правка без смены категории счетчики не трогает
+    response = await client.patch(
+        f"/api/v1/admin/posts/{post['id']}",
+        headers={**headers, "If-Match": "*"},
+        json={"title": "Один!", "categoryId": first},
+    )
+    assert (await post_count(first), await post_count(second)) == (3, 1)
+
+    await client.delete(f"/api/v1/admin/posts/{post['id']}", headers=headers)
+    assert await post_count(first) == 2
+
+    response = await client.post(
+        f"/api/v1/admin/categories/{first}/posts/move",
+        headers=headers,
+        json={"targetCategoryId": second},
+    )
+    assert (await post_count(first), await post_count(second)) == (0, 3)
+
+    lines = [
+        json.dumps({"title": "Импорт", "body": "<p>1</p>", "categoryId": first}),
+        json.dumps({"title": "Импорт", "body": "<p>2</p>", "categoryId": second}),
+        json.dumps({"title": "Импорт", "body": "<p>3</p>", "categoryId": second}),
+    ]
+    response = await client.post(
+        "/api/v1/admin/import/POSTS",
+        headers=headers,
+        files={"file": ("posts.ndjson", "\n".join(lines).encode(), "text/plain")},
+    )
+    assert response.json()["importedRows"] == 3
+    assert (await post_count(first), await post_count(second)) == (1, 5)
+
+    # расхождение, внесенное мимо сервиса, исправляет сверка
+    async with container() as nested:
+        session = await nested.get(AsyncSession)
+        await session.execute(
+            text("UPDATE categories SET post_count = 42 WHERE id = :id"), {"id": first}
+        )
+    async with container() as nested:
+        repository = await nested.get(CategoriesRepository)
+        assert first in await repository.repair_post_counts()
+    assert await post_count(first) == 1
+
+    response = await client.delete(
+        f"/api/v1/admin/categories/{second}/posts", headers=headers
+    )
+    assert len(response.json()) == 5
+    assert await post_count(second) == 0
+
+    await client.delete(f"/api/v1/admin/categories/{first}/posts", headers=headers)
+    for category_id in (first, second):
+        await client.delete(f"/api/v1/admin/categories/{category_id}", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_post_views(client, admin_token):
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from infrastructure.posts.models import PostDatabaseModel
+    from infrastructure.posts.views import flush_views
+    from infrastructure.server import container
+
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = await client.post(
+        "/api/v1/admin/categories/",
+        headers=headers,
+        json={"title": "Просмотры", "description": ""},
+    )
+    category_id = response.json()["id"]
+    response = await client.post(
+        "/api/v1/admin/posts/",
+        headers=headers,
+        json={"title": "Читаемый", "body": "<p>1</p>", "category_id": category_id},
+    )
+    post = response.json()
+    assert post["views"] == 0
+
+    async def updated_at():
+        async with container() as nested:
+            session = await nested.get(AsyncSession)
+            return await session.scalar(
+                select(PostDatabaseModel.updated_at).where(
+                    PostDatabaseModel.id == post["id"]
+                )
+            )
+
+    created_updated_at = await updated_at()
+
+    # просмотры копятся в памяти и до записи в базу не видны
+    for _ in range(3):
+        response = await client.get(f"/api/v1/posts/{post['id']}")
+        assert response.status_code == 200
+    assert response.json()["views"] == 0
+    etag = response.headers["ETag"]
+
+    await flush_views(container)
+    response = await client.get(f"/api/v1/posts/{post['id']}")
+    assert response.json()["views"] == 3
+    # счетчик не меняет ни версию, ни время правки
+    assert response.headers["ETag"] == etag
+    assert await updated_at() == created_updated_at
+
+    await flush_views(container)
+    response = await client.get(f"/api/v1/posts/{post['id']}")
+    assert response.json()["views"] == 4
+
+    await client.delete(f"/api/v1/admin/posts/{post['id']}", headers=headers)
+    # просмотры удаленного поста записываются без ошибок
+    await flush_views(container)
+    await client.delete(f"/api/v1/admin/categories/{category_id}", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_trending_posts(client, admin_token):
+    from application.posts.repositories import PostsRepository
+    from infrastructure.posts.views import flush_views
+    from infrastructure.server import container
+
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    async def refresh():
+        await flush_views(container)
+        async with container() as nested:
+            repository = await nested.get(PostsRepository)
+            await repository.refresh_trending()
+
+    response = await client.post(
+        "/api/v1/admin/categories/",
+        headers=headers,
+        json={"title": "Популярное", "description": ""},
+    )
+    category_id = response.json()["id"]
+    response = await client.post(
+        "/api/v1/admin/posts/bulk",
+        headers=headers,
+        json=[
+            {"title": f"Популярный {i}", "body": "<p>1</p>", "category_id": category_id}
+            for i in range(3)
+        ],
+    )
+    posts = [post["id"] for post in response.json()]
+
+    await refresh()
+    response = await client.get(f"/api/v1/categories/{category_id}/trending")
+    assert response.json() == []
+
+    # просмотры: второй пост 3, первый 2, третий 0
+    for post_id in (posts[1], posts[0], posts[1], posts[0], posts[1]):
+        await client.get(f"/api/v1/posts/{post_id}")
+    # до пересчета представление отдает прежний результат
+    response = await client.get(f"/api/v1/categories/{category_id}/trending")
+    assert response.json() == []
+
+    await refresh()
+    response = await client.get(f"/api/v1/categories/{category_id}/trending")
+    assert response.status_code == 200
+    assert [(post["id"], post["views"]) for post in response.json()] == [
+        (posts[1], 3),
+        (posts[0], 2),
+    ]
+    assert response.json()[0]["categoryId"] == category_id
+    response = await client.get(
+        f"/api/v1/categories/{category_id}/trending", params={"limit": 1}
+    )
+    assert [post["id"] for post in response.json()] == [posts[1]]
+
+    response = await client.get("/api/v1/posts/trending", params={"limit": 50})
+    assert response.status_code == 200
+    views = [post["views"] for post in response.json()]
+    assert views == sorted(views, reverse=True)
+    assert response.json()
+    response = await client.get("/api/v1/posts/trending", params={"limit": 51})
+    assert response.status_code == 422
+
+    await client.delete(
+        f"/api/v1/admin/categories/{category_id}/posts", headers=headers
+    )
+    await refresh()
+    response = await client.get(f"/api/v1/categories/{category_id}/trending")
+    assert response.json() == []
+    await client.delete(f"/api/v1/admin/categories/{category_id}", headers=headers)
+
+
+@pytest.mark.asyncio
+async def test_posts_partitions(client, admin_token):
+    from datetime import date, datetime, timezone
+
+    from sqlalchemy import text
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.exc import IntegrityError
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+    from application.pagination import Cursor
+    from application.posts.dtos import ReadAllPostsDto
+    from infrastructure.config import Config
+    from infrastructure.posts.partitions import PostsPartitions, add_months
+    from infrastructure.posts.repositories import PostsDatabaseRepository
+    from infrastructure.server import container
+
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    partitions = PostsPartitions(
+        await container.get(AsyncEngine), await container.get(Config)
+    )
+
+    today = datetime.now(timezone.utc).date()
+    await partitions.create_upcoming(today, 3)
+    existing = await partitions.read_all()
+    for offset in range(4):
+        assert add_months(today.replace(day=1), offset) in existing
+    assert await partitions.create_upcoming(today, 3) == []
+
+    # старая секция с одним постом
+    old_month = date(2000, 1, 1)
+    await partitions.create(old_month)
+    response = await client.post(
+        "/api/v1/admin/categories/",
+        headers=headers,
+        json={"title": "Архив", "description": ""},
+    )
+    category_id = response.json()["id"]
+    response = await client.post(
+        "/api/v1/admin/posts/",
+        headers=headers,
+        json={"title": "Старый", "body": "<p>1</p>", "category_id": category_id},
+    )
+    post_id = response.json()["id"]
+    async with container() as nested:
+        session = await nested.get(AsyncSession)
+        # перенос строки между секциями - обычный UPDATE ключа секционирования
+        await session.execute(
+            text(
+                "UPDATE posts SET created_at = '2000-01-15 00:00:00+00' WHERE id = :id"
+            ),
+            {"id": post_id},
+        )
+    response = await client.get(f"/api/v1/posts/{post_id}")
+    assert response.json()["title"] == "Старый"
+
+    # id уникален по всем секциям, а не только в паре с created_at
+    with pytest.raises(IntegrityError):
+        async with container() as nested:
+            session = await nested.get(AsyncSession)
+            await session.execute(
+                text(
+                    "INSERT INTO posts (id, title, body, category_id)"
+                    " VALUES (:id, 'Дубль', '', :category_id)"
+                ),
+                {"id": post_id, "category_id": category_id},
+            )
+
+    # страницы после курсора не читают секции раньше него
+    config = PostsDatabaseRepository.RepositoryConfig()
+    query = config.add_keyset_pagination(
+        config.get_select_all_query(),
+        ReadAllPostsDto(
+            limit=20,
+            cursor=Cursor(created_at=datetime(2026, 1, 1, tzinfo=timezone.utc), id=1),
+        ),
+    )
+    compiled = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    async with container() as nested:
+        session = await nested.get(AsyncSession)
+        plan = "\n".join(
+            (await session.execute(text(f"EXPLAIN {compiled}"))).scalars().all()
+        )
+    assert "posts_2000_01" not in plan
+    assert f"posts_{today:%Y_%m}" in plan
+
+    assert await partitions.archive(date(2000, 2, 1)) == [old_month]
+    assert old_month not in await partitions.read_all()
+    response = await client.get(f"/api/v1/posts/{post_id}")
+    assert response.status_code == 404
+    async with container() as nested:
+        session = await nested.get(AsyncSession)
+        assert (
+            await session.scalar(text("SELECT count(*) FROM archive.posts_2000_01"))
+            == 1
+        )
+        await session.execute(text("DROP TABLE archive.posts_2000_01"))
+        await session.execute(
+            text("UPDATE categories SET post_count = 0 WHERE id = :id"),
+            {"id": category_id},
+        )
+    response = await client.delete(
+        f"/api/v1/admin/categories/{category_id}", headers=headers
+    )
+    assert response.status_code in (200, 204)
+
+
+@pytest.mark.asyncio
+async def test_posts_archive(client, admin_token):
+    from datetime import datetime, timezone
+    from functools import partial
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from application.posts.gateways import ArchiveGateway
+    from application.transactions import TransactionsGateway
+    from infrastructure.server import container
+
+    require_admin(admin_token)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    now = datetime.now(timezone.utc)
+
+    async def current_month_count() -> int:
+        response = await client.get("/api/v1/posts/archive")
+        assert response.status_code == 200
+        months = response.json()
+        assert months == sorted(
+            months, key=lambda item: (item["year"], item["month"]), reverse=True
+        )
+        return next(
+            (
+                item["postCount"]
+                for item in months
+                if (item["year"], item["month"]) == (now.year, now.month)
+            ),
+            0,
+        )
+
+    before = await current_month_count()
+    response = await client.post(
+        "/api/v1/admin/categories/",
+        headers=headers,
+        json={"title": "Архив по месяцам", "description": ""},
+    )
+    category_id = response.json()["id"]
+    response = await client.post(
+        "/api/v1/admin/posts/bulk",
+        headers=headers,
+        json=[
+            {"title": f"Месяц {i}", "body": "<p>1</p>", "category_id": category_id}
+            for i in range(3)
+        ],
+    )
+    posts = [post["id"] for post in response.json()]
+    assert await current_month_count() == before + 3
+
+    # посты месяца постранично, в порядке создания
+    url = f"/api/v1/posts/archive/{now.year}/{now.month}"
+    response = await client.get(url, params={"limit": 2, "count": "EXACT"})
+    assert response.status_code == 200
+    assert response.headers["X-Total-Count"] == str(before + 3)
+    seen = [post["id"] for post in response.json()]
+    while cursor := response.headers.get("X-Next-Cursor"):
+        response = await client.get(url, params={"limit": 2, "cursor": cursor})
+        seen += [post["id"] for post in response.json()]
+    assert seen[-3:] == posts
+    assert len(seen) == before + 3
+
+    response = await client.get("/api/v1/posts/archive/2000/1")
+    assert response.json() == []
+    response = await client.get(f"/api/v1/posts/archive/{now.year}/13")
+    assert response.status_code == 422
+
+    await client.delete(f"/api/v1/admin/posts/{posts[0]}", headers=headers)
+    assert await current_month_count() == before + 2
+
+    # откатившаяся запись гистограмму не сдвигает
+    archive = await container.get(ArchiveGateway)
+    async with container() as nested:
+        transaction = await nested.get(TransactionsGateway)
+        async with transaction:
+            transaction.on_commit(partial(archive.add, now, 1))
+        await (await nested.get(AsyncSession)).rollback()
+    assert await current_month_count() == before + 2
+
+    # массовое удаление сбрасывает гистограмму, следующее чтение ее пересчитает
+    await client.delete(
+        f"/api/v1/admin/categories/{category_id}/posts", headers=headers
+    )
+    assert await current_month_count() == before
+    await client.delete(f"/api/v1/admin/categories/{category_id}", headers=headers)
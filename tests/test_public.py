@@ -19,3 +19,81 @@ async def test_public_posts_and_categories(client):
         pid = posts[0]["id"]
         response = await client.get(f"/api/v1/posts/{pid}")
         assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_pool_stats(client):
+    from infrastructure.pools import DatabasePools
+    from infrastructure.server import container
+
+    pools = await container.get(DatabasePools)
+    before = pools.stats()["read_only"].checkouts
+
+    for _ in range(3):
+        response = await client.get("/api/v1/posts/")
+        assert response.status_code == 200
+
+    stats = pools.stats()
+    assert {"primary", "read_only"} <= stats.keys()
+    assert stats["read_only"].checkouts >= before + 3
+    assert stats["read_only"].checked_out == 0
+    assert stats["read_only"].waiting == 0
+    assert stats["read_only"].wait_time_max >= 0
+
+
+@pytest.mark.asyncio
+async def test_request_deadlines(client, config):
+    import asyncpg
+
+    request_timeout, lock_timeout = config.request_timeout, config.postgres_lock_timeout
+    locker = await asyncpg.connect(
+        user=config.postgres_user,
+        password=config.postgres_password,
+        host=config.postgres_host,
+        port=config.postgres_port,
+        database=config.postgres_db,
+    )
+    try:
+        # срок истёк до первого запроса — в базу ничего не уходит
+        config.request_timeout = 0
+        response = await client.get("/api/v1/posts/")
+        assert response.status_code == 504
+
+        transaction = locker.transaction()
+        await transaction.start()
+        await locker.execute("LOCK TABLE posts IN ACCESS EXCLUSIVE MODE")
+
+        # блокировку не дождались — 503 с Retry-After
+        config.request_timeout, config.postgres_lock_timeout = 5, 0.2
+        response = await client.get("/api/v1/posts/")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+        # запрос отменён по statement_timeout раньше lock_timeout — 504
+        config.request_timeout, config.postgres_lock_timeout = 0.3, 5
+        response = await client.get("/api/v1/posts/")
+        assert response.status_code == 504
+
+        await transaction.rollback()
+    finally:
+        config.request_timeout, config.postgres_lock_timeout = (
+            request_timeout,
+            lock_timeout,
+        )
+        await locker.close()
+
+    # соединения пула вернулись к обычным таймаутам
+    for _ in range(5):
+        response = await client.get("/api/v1/posts/")
+        assert response.status_code == 200
+
+    # таймауты сессии не переживают возврат соединения в пул
+    from sqlalchemy import text
+
+    from infrastructure.pools import DatabasePools
+    from infrastructure.server import container
+
+    pools = await container.get(DatabasePools)
+    async with pools.read_only.connect() as connection:
+        assert await connection.scalar(text("SHOW statement_timeout")) == "0"
+        assert await connection.scalar(text("SHOW lock_timeout")) == "0"